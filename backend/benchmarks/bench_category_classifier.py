@@ -0,0 +1,72 @@
+"""
+Category classification benchmark over a full exchange listing: the previous
+per-category keyword scans vs. the compiled single-pass classifier.
+
+Uses the local symbol master snapshot when present (`manage.py refresh-symbols`),
+otherwise a synthetic listing of the same shape.
+
+Usage:
+    cd backend && uv run python benchmarks/bench_category_classifier.py [--rounds 5]
+"""
+import sys
+from pathlib import Path
+
+_root = Path(__file__).parent.parent
+for _p in [str(_root), str(_root / "src")]:
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+import time
+from typing import Callable
+
+import typer
+
+from benchmarks.bench_symbol_search import synthetic_listing
+from src.snowball.adapters.external.symbols import SymbolSnapshot
+from src.snowball.domain.services import DEFAULT_CATEGORY_KEYWORDS, CategoryClassifier
+
+
+def infer_category_legacy(name: str, code: str) -> str:
+    """Reference implementation: one `any(k in name)` scan per category."""
+    name_upper = name.upper()
+    for category, keywords in DEFAULT_CATEGORY_KEYWORDS:
+        if any(k in name_upper for k in keywords):
+            return category
+    return "주식"
+
+
+def measure(classify: Callable[[str, str], str], pairs: list[tuple[str, str]], rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for name, code in pairs:
+            classify(name, code)
+    return (time.perf_counter() - started) / rounds
+
+
+def main(rounds: int = typer.Option(5, "--rounds", "-n", min=1, help="전체 목록 반복 횟수")):
+    symbols = SymbolSnapshot().read()
+    source = "symbol snapshot"
+    if not symbols:
+        symbols, source = synthetic_listing(20000), "synthetic listing"
+    pairs = [(s.name, s.code) for s in symbols]
+    typer.echo(f"{len(pairs)} names from {source}")
+
+    compiled = CategoryClassifier(cache_size=len(pairs))
+    mismatches = sum(infer_category_legacy(n, c) != compiled.classify(n, c) for n, c in pairs)
+
+    def cold(name: str, code: str) -> str:
+        return compiled._classify(name, code)
+
+    compiled.cache_clear()
+    for name, code in pairs:
+        compiled.classify(name, code)
+
+    typer.echo(f"{'classifier':<20}{'ms/listing':>12}{'names/s':>14}")
+    for label, classify in [("legacy any()", infer_category_legacy), ("compiled", cold), ("compiled+memo", compiled.classify)]:
+        seconds = measure(classify, pairs, rounds)
+        typer.echo(f"{label:<20}{seconds * 1000:>12.2f}{len(pairs) / seconds:>14,.0f}")
+    typer.echo(f"mismatches vs legacy: {mismatches}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,68 @@
+"""
+Naver quote extraction benchmark: streaming lxml parser vs. the previous BeautifulSoup path.
+
+Usage:
+    cd backend && uv run python benchmarks/bench_naver_parser.py [--rounds 200]
+"""
+import sys
+from pathlib import Path
+
+_root = Path(__file__).parent.parent
+for _p in [str(_root), str(_root / "src")]:
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+import typer
+from bs4 import BeautifulSoup
+
+from src.snowball.adapters.external.naver import parse_naver_quote
+
+FIXTURES = _root / "tests" / "fixtures" / "naver"
+
+
+def parse_with_beautifulsoup(html: str) -> Optional[dict]:
+    """Reference implementation: full BeautifulSoup tree + CSS selectors."""
+    soup = BeautifulSoup(html, "lxml")
+    name_tag = soup.select_one(".wrap_company h2 a")
+    name = name_tag.text.strip() if name_tag else None
+    price_tag = soup.select_one(".no_today .blind")
+    price = float(price_tag.text.replace(",", "").strip() if price_tag else "0")
+    if name and price > 0:
+        return {"name": name, "price": price}
+    return None
+
+
+def measure(parse: Callable[[str], Optional[dict]], html: str, rounds: int) -> tuple[float, int]:
+    """Return (mean seconds per page, peak traced bytes for one parse)."""
+    parse(html)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        parse(html)
+    mean = (time.perf_counter() - started) / rounds
+
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return mean, peak
+
+
+def main(rounds: int = typer.Option(200, "--rounds", "-n", min=1, help="페이지당 반복 횟수")):
+    parsers = {"beautifulsoup": parse_with_beautifulsoup, "lxml-stream": parse_naver_quote}
+    typer.echo(f"{'fixture':<16}{'parser':<16}{'ms/page':>10}{'peak KiB':>12}  result")
+    for path in sorted(FIXTURES.glob("*.html")):
+        html = path.read_text(encoding="utf-8")
+        expected = parse_with_beautifulsoup(html)
+        for label, parse in parsers.items():
+            mean, peak = measure(parse, html, rounds)
+            result = parse(html)
+            marker = "" if result == expected else "  (MISMATCH)"
+            typer.echo(f"{path.stem:<16}{label:<16}{mean * 1000:>10.3f}{peak / 1024:>12.1f}  {result}{marker}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,83 @@
+"""
+Portfolio calculation benchmark: CalculatePortfolioUseCase once per account (as
+GET /accounts used to do) vs. BatchCalculatePortfolioUseCase over all accounts,
+on in-memory entities, without and with reading every asset row. Also checks that both paths return identical results.
+
+Usage:
+    cd backend && uv run python benchmarks/bench_portfolio_calc.py [--accounts 300] [--assets 10] [--repeat 5] [--mode optimized]
+"""
+import sys
+from pathlib import Path
+
+_root = Path(__file__).parent.parent
+for _p in [str(_root), str(_root / "src")]:
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+import random
+import time
+from uuid import uuid4
+
+import typer
+
+from src.snowball.domain.entities import Account, Asset, CalculationMode, UserId
+from src.snowball.use_cases.portfolio import BatchCalculatePortfolioUseCase, CalculatePortfolioUseCase
+
+
+def build_accounts(accounts: int, assets: int, seed: int = 42) -> list[Account]:
+    rng = random.Random(seed)
+    user_id = UserId(uuid4())
+    result = []
+    for i in range(accounts):
+        account = Account(id=i + 1, name=f"account {i}", user_id=user_id, cash=rng.uniform(0, 1e7))
+        account.assets = [
+            Asset(
+                id=i * assets + j + 1, account_id=account.id, name=f"asset {j}",
+                current_price=rng.uniform(1, 500000), quantity=float(rng.randint(0, 1000)),
+                avg_price=rng.uniform(1, 500000), target_weight=100.0 / assets,
+            )
+            for j in range(assets)
+        ]
+        result.append(account)
+    return result
+
+
+def per_account(accounts: list[Account], mode: CalculationMode) -> list:
+    use_case = CalculatePortfolioUseCase(mode)
+    return [use_case.execute(account) for account in accounts]
+
+
+def batch(accounts: list[Account], mode: CalculationMode) -> list:
+    return BatchCalculatePortfolioUseCase(mode).execute(accounts)
+
+
+def batch_rows(accounts: list[Account], mode: CalculationMode) -> list:
+    # 응답 매핑처럼 모든 자산 행을 읽는 경우 (행 객체 생성 비용 포함)
+    results = batch(accounts, mode)
+    for result in results:
+        list(result.assets)
+    return results
+
+
+def main(
+    accounts: int = typer.Option(300, "--accounts", "-n", min=1, help="계좌 수"),
+    assets: int = typer.Option(10, "--assets", "-a", min=1, help="계좌당 자산 수"),
+    repeat: int = typer.Option(5, "--repeat", "-r", min=1, help="반복 횟수 (최솟값 사용)"),
+    mode: CalculationMode = typer.Option(CalculationMode.PER_ASSET, "--mode", "-m", help="수량 계산 방식"),
+):
+    data = build_accounts(accounts, assets)
+    typer.echo(f"{accounts} accounts x {assets} assets, {mode.value} mode, best of {repeat}")
+    typer.echo(f"{'path':<16}{'seconds':>10}{'assets/s':>14}")
+    results = {}
+    for label, calculate in [("per-account", per_account), ("batch", batch), ("batch+rows", batch_rows)]:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            results[label] = calculate(data, mode)
+            best = min(best, time.perf_counter() - started)
+        typer.echo(f"{label:<16}{best:>10.4f}{accounts * assets / best:>14,.0f}")
+    typer.echo(f"identical results: {results['per-account'] == results['batch'] == results['batch+rows']}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
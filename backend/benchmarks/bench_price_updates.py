@@ -0,0 +1,88 @@
+"""
+Price write-path benchmark: per-asset save (get + add + commit + refresh) vs.
+the bulk set-based AssetRepository.update_prices, on a file-backed SQLite database.
+
+Usage:
+    cd backend && uv run python benchmarks/bench_price_updates.py [--holdings 5000] [--codes 500]
+"""
+import sys
+from pathlib import Path
+
+_root = Path(__file__).parent.parent
+for _p in [str(_root), str(_root / "src")]:
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+import tempfile
+import time
+from uuid import uuid4
+
+import typer
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+from src.snowball.adapters.db.models import AccountModel, AssetModel, UserModel
+from src.snowball.adapters.db.repositories import SqlAlchemyAssetRepository
+
+
+def seed(engine, holdings: int, codes: int) -> None:
+    with Session(engine) as session:
+        user = UserModel(id=uuid4(), email="bench@example.com", password_hash="h")
+        account = AccountModel(name="bench", user_id=user.id)
+        session.add_all([user, account])
+        session.flush()
+        session.add_all(
+            AssetModel(account_id=account.id, name=f"asset {i}", code=f"{i % codes:06d}", current_price=1.0)
+            for i in range(holdings)
+        )
+        session.commit()
+
+
+def count_statements(engine) -> list[int]:
+    counter = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*args):
+        counter[0] += 1
+
+    return counter
+
+
+def per_asset_save(session: Session, prices: dict[str, float]) -> int:
+    repo = SqlAlchemyAssetRepository(session)
+    updated = 0
+    for asset in repo.list_all_with_code():
+        if asset.code in prices:
+            asset.current_price = prices[asset.code]
+            repo.save(asset)
+            updated += 1
+    return updated
+
+
+def bulk_update(session: Session, prices: dict[str, float]) -> int:
+    return SqlAlchemyAssetRepository(session).update_prices(prices)
+
+
+def main(
+    holdings: int = typer.Option(5000, "--holdings", "-n", min=1, help="자산(보유 종목) 행 수"),
+    codes: int = typer.Option(500, "--codes", "-c", min=1, help="서로 다른 종목 코드 수"),
+):
+    typer.echo(f"{holdings} holdings over {codes} codes (SQLite file)")
+    typer.echo(f"{'path':<16}{'seconds':>10}{'rows':>8}{'statements':>12}")
+    for label, write in [("per-asset save", per_asset_save), ("bulk update", bulk_update)]:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{tmp}/bench.db")
+            SQLModel.metadata.create_all(engine)
+            seed(engine, holdings, codes)
+            prices = {f"{i:06d}": 1000.0 + i for i in range(codes)}
+            statements = count_statements(engine)
+            with Session(engine) as session:
+                started = time.perf_counter()
+                rows = write(session, prices)
+                seconds = time.perf_counter() - started
+            engine.dispose()
+        typer.echo(f"{label:<16}{seconds:>10.3f}{rows:>8}{statements[0]:>12}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
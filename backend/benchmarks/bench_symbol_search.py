@@ -0,0 +1,57 @@
+"""
+Symbol master benchmark: index build time and typeahead latency over a synthetic full listing.
+
+Usage:
+    cd backend && uv run python benchmarks/bench_symbol_search.py [--symbols 20000]
+"""
+import sys
+from pathlib import Path
+
+_root = Path(__file__).parent.parent
+for _p in [str(_root), str(_root / "src")]:
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+import random
+import time
+
+import typer
+
+from src.snowball.adapters.external.symbols import SymbolIndex
+from src.snowball.domain.entities import Symbol
+
+BRANDS = ["KODEX", "TIGER", "ACE", "SOL", "RISE", "PLUS", "삼성", "현대", "한화", "LG", "SK", "Apple", "American"]
+WORDS = ["200", "미국채", "10년", "선물", "나스닥100", "S&P500", "전자", "바이오", "반도체", "Inc", "Group", "Holdings"]
+QUERIES = ["k", "kodex", "kodex 2", "삼성", "미국채", "00593", "a", "apple in", "zzz"]
+
+
+def synthetic_listing(n: int, seed: int = 7) -> list[Symbol]:
+    rng = random.Random(seed)
+    symbols = []
+    for i in range(n):
+        code = f"{i:06d}" if i % 2 else "".join(rng.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=rng.randint(1, 5)))
+        name = " ".join([rng.choice(BRANDS), *rng.sample(WORDS, rng.randint(1, 3))])
+        symbols.append(Symbol(code=code, name=name, market="KRX" if i % 2 else "NASDAQ"))
+    return symbols
+
+
+def main(
+    size: int = typer.Option(20000, "--symbols", "-s", min=1, help="상장 종목 수"),
+    rounds: int = typer.Option(2000, "--rounds", "-n", min=1, help="질의당 반복 횟수"),
+):
+    symbols = synthetic_listing(size)
+    started = time.perf_counter()
+    index = SymbolIndex(symbols)
+    typer.echo(f"index build: {len(symbols)} symbols in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    typer.echo(f"{'query':<12}{'µs/search':>12}{'hits':>6}")
+    for query in QUERIES:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            hits = index.search(query, 10)
+        mean = (time.perf_counter() - started) / rounds
+        typer.echo(f"{query!r:<12}{mean * 1e6:>12.1f}{len(hits):>6}")
+
+
+if __name__ == "__main__":
+    typer.run(main)
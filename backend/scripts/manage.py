@@ -7,17 +7,24 @@ for _p in [str(_root), str(_root / "src")]:
     if _p not in sys.path:
         sys.path.insert(0, _p)
 
-from datetime import datetime
+import signal
+from datetime import datetime, timedelta
+from typing import Optional
 
 import typer
-from sqlmodel import Session, select
+from sqlmodel import Session, SQLModel, select
 
 from src.snowball.adapters.db.models import UserModel
 from src.snowball.adapters.db.repositories import SqlAlchemyAuthRepository, SqlAlchemyAssetRepository
-from src.snowball.adapters.external.market_data import RealMarketDataProvider
+from src.snowball.adapters.external.market_data import DEFAULT_BATCH_TIMEOUT, DEFAULT_BATCH_WORKERS, RealMarketDataProvider
+from src.snowball.adapters.external.symbols import LocalSymbolMaster
+from src.snowball.domain.market_hours import market_of
 from src.snowball.infrastructure.db import engine
+from src.snowball.infrastructure.refresh_daemon import (
+    DEFAULT_JITTER, DEFAULT_OPEN_INTERVAL, PriceRefreshDaemon, RefreshSchedule
+)
 from src.snowball.infrastructure.security import PasswordHasher
-from src.snowball.use_cases.assets import UpdateAssetPricesUseCase
+from src.snowball.use_cases.assets import DEFAULT_SCAN_CHUNK_SIZE, UpdateAssetPricesUseCase
 
 app = typer.Typer(help="Snowball 관리 CLI")
 
@@ -56,14 +63,86 @@ def reset_password(
 
 
 @app.command()
-def update_prices():
+def update_prices(
+    concurrency: int = typer.Option(DEFAULT_BATCH_WORKERS, "--concurrency", "-c", min=1, help="시세 출처별 동시 조회 수"),
+    timeout: float = typer.Option(DEFAULT_BATCH_TIMEOUT, "--timeout", min=1, help="배치 시세 조회 제한 시간(초), 초과 종목은 실패 처리"),
+    chunk_size: int = typer.Option(DEFAULT_SCAN_CHUNK_SIZE, "--chunk-size", min=1, help="자산 테이블 스트리밍 단위(행)"),
+    stale_after: Optional[float] = typer.Option(
+        None, "--stale-after", min=0, help="증분 모드: 마지막 갱신 후 N분이 지난 종목만 조회 (평가금액 큰 순)"
+    ),
+    max_codes: Optional[int] = typer.Option(None, "--max-codes", min=1, help="증분 모드: 1회 실행당 최대 조회 종목 수"),
+):
     """모든 사용자 자산의 현재가를 시장 데이터로 갱신 (배치 전용)"""
+    if max_codes is not None and stale_after is None:
+        typer.echo("❌ --max-codes는 --stale-after(증분 모드)와 함께 사용해야 합니다.", err=True)
+        raise typer.Exit(1)
+    # quote 테이블(종목별 갱신 시각)은 웹 서버 기동 전에도 필요
+    SQLModel.metadata.create_all(engine)
     with Session(engine) as session:
         asset_repo = SqlAlchemyAssetRepository(session)
-        market_data = RealMarketDataProvider()
-        use_case = UpdateAssetPricesUseCase(asset_repo, market_data)
-        count = use_case.execute()
-        typer.echo(f"✅ {count}개 자산 현재가 갱신 완료")
+        market_data = RealMarketDataProvider(max_workers=concurrency, batch_timeout=timeout)
+        use_case = UpdateAssetPricesUseCase(asset_repo, market_data, chunk_size=chunk_size)
+        try:
+            max_age = timedelta(minutes=stale_after) if stale_after is not None else None
+            result = use_case.execute(max_age=max_age, max_codes=max_codes)
+        finally:
+            market_data.close()
+        typer.echo(f"✅ {result.updated_count}개 자산 현재가 갱신 완료")
+        typer.echo(
+            f"   종목 {result.code_count}개 조회 (실패 {len(result.failed_codes)}개) · "
+            f"시세 조회 {result.fetch_seconds:.2f}s / 전체 {result.total_seconds:.2f}s"
+        )
+        if result.failed_codes:
+            typer.echo(f"   실패 종목: {', '.join(result.failed_codes)}")
+
+
+@app.command()
+def refresh_daemon(
+    interval: float = typer.Option(DEFAULT_OPEN_INTERVAL, "--interval", "-i", min=5, help="장중 갱신 주기(초)"),
+    concurrency: int = typer.Option(DEFAULT_BATCH_WORKERS, "--concurrency", "-c", min=1, help="시세 출처별 동시 조회 수"),
+    timeout: float = typer.Option(DEFAULT_BATCH_TIMEOUT, "--timeout", min=1, help="틱당 시세 조회 제한 시간(초)"),
+    max_codes: Optional[int] = typer.Option(None, "--max-codes", min=1, help="틱당 최대 조회 종목 수 (평가금액 큰 순)"),
+    jitter: float = typer.Option(DEFAULT_JITTER, "--jitter", min=0, max=0.5, help="주기 분산 비율 (복제본 간 동시 호출 방지)"),
+):
+    """장 운영시간(KRX/미국)에 맞춰 현재가를 계속 갱신하는 상주 프로세스"""
+    SQLModel.metadata.create_all(engine)
+    # 프로세스가 떠 있는 동안 커넥션 풀/로컬 히스토리를 계속 재사용
+    market_data = RealMarketDataProvider(max_workers=concurrency, batch_timeout=timeout)
+    # 직전 틱에서 갱신된 종목도 다음 틱에는 다시 조회되도록 주기의 절반을 기준으로 판단
+    max_age = timedelta(seconds=interval / 2)
+
+    def tick(markets: list[str]):
+        open_markets = set(markets)
+        with Session(engine) as session:
+            use_case = UpdateAssetPricesUseCase(SqlAlchemyAssetRepository(session), market_data)
+            return use_case.execute(
+                max_age=max_age, max_codes=max_codes, code_filter=lambda code: market_of(code) in open_markets
+            )
+
+    daemon = PriceRefreshDaemon(tick, RefreshSchedule(open_interval=interval, jitter=jitter), log=typer.echo)
+    # 종료 신호: 진행 중인 틱은 마치고, 대기 중이면 즉시 빠져나옴
+    previous = {sig: signal.signal(sig, lambda *_: daemon.stop()) for sig in (signal.SIGINT, signal.SIGTERM)}
+
+    typer.echo(f"🔄 현재가 갱신 데몬 시작 (장중 {interval:.0f}s 주기, 종료: Ctrl+C / SIGTERM)")
+    try:
+        daemon.run()
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+        market_data.close()
+
+
+@app.command()
+def refresh_symbols(
+    force: bool = typer.Option(False, "--force", "-f", help="스냅샷이 최신이어도 다시 내려받기"),
+):
+    """종목 마스터(KRX/미국 상장목록) 스냅샷 갱신 (배치 전용)"""
+    symbols = LocalSymbolMaster()
+    if not force and not symbols.is_stale():
+        typer.echo(f"종목 마스터가 최신입니다 ({symbols.reload()}개)")
+        return
+    count = symbols.refresh()
+    typer.echo(f"✅ 종목 마스터 {count}개 갱신 완료: {symbols.snapshot.path}")
 
 
 if __name__ == "__main__":
@@ -21,10 +21,13 @@ class AssetUpdate(BaseModel):
     current_price: Optional[float] = None
     avg_price: Optional[float] = None
     quantity: Optional[float] = None
+    # 클라이언트가 읽었던 버전: 그 사이 다른 곳에서 수정됐으면 409
+    version: Optional[int] = None
 
 class AssetResponse(AssetBase):
     id: int
     account_id: int
+    version: int = 1
 
 class AccountCreate(BaseModel):
     name: str = "내 포트폴리오"
@@ -33,11 +36,13 @@ class AccountCreate(BaseModel):
 class AccountUpdate(BaseModel):
     name: Optional[str] = None
     cash: Optional[float] = None
+    version: Optional[int] = None
 
 class AccountResponse(BaseModel):
     id: int
     name: str
     cash: float
+    version: int = 1
     assets: List[AssetResponse] = []
 
 class AssetCalculatedResponse(AssetResponse):
@@ -63,6 +68,14 @@ class ExecuteActionRequest(BaseModel):
     action_quantity: int
     price: float
 
+class ExecuteBatchRequest(BaseModel):
+    legs: List[ExecuteActionRequest] = Field(min_length=1, max_length=500)
+
+class SymbolResponse(BaseModel):
+    code: str
+    name: str
+    market: str
+
 class UserRegister(BaseModel):
     email: str
     password: str
@@ -1,25 +1,32 @@
-from typing import List, Annotated
+from typing import List, Annotated, Optional
 from http import HTTPStatus
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session
 from uuid import UUID
 
 from ...infrastructure.db import get_session
-from ..db.repositories import SqlAlchemyAccountRepository, SqlAlchemyAssetRepository, SqlAlchemyAuthRepository
-from ..external.market_data import RealMarketDataProvider
-from ...use_cases.portfolio import CalculatePortfolioUseCase
-from ...use_cases.trade import ExecuteTradeUseCase
-from ...use_cases.assets import FetchAssetInfoUseCase
+from ..db.repositories import (
+    SqlAlchemyAccountRepository, SqlAlchemyAssetRepository, SqlAlchemyAuthRepository, SqlAlchemyUnitOfWork
+)
+from ...use_cases.portfolio import BatchCalculatePortfolioUseCase
+from ...use_cases.trade import ExecuteTradeBatchUseCase, ExecuteTradeUseCase
+from ...use_cases.rebalance import RebalanceAccountUseCase
+from ...use_cases.assets import AsyncFetchAssetInfoUseCase, SearchSymbolsUseCase
 from ...use_cases.auth import RegisterUserUseCase, LoginUseCase
 from ...use_cases.sync import SyncPortfolioUseCase
-from ...infrastructure.security import PasswordHasher, JWTService
-from ...domain.entities import Account, Asset, User, UserId
-from ...domain.exceptions import EntityNotFoundException, InsufficientFundsException, InvalidActionException
+from ...infrastructure.security import PasswordHasher, JWTService, admin_emails
+from ...infrastructure.market_data import MarketDataServices
+from ...domain.entities import Account, Asset, CalculationMode, TradeLeg, User, UserId
+from ...domain.ports import AsyncMarketDataProvider, MarketDataProvider, SymbolMaster
+from ...domain.exceptions import (
+    ConcurrencyConflictException, EntityNotFoundException, InsufficientFundsException, InvalidActionException,
+    InvalidAssetCodeException, PermissionDeniedException, VersionConflictException
+)
 from .dtos import (
     AccountCreate, AccountUpdate, AccountCalculatedResponse,
     AssetCreate, AssetUpdate, AssetResponse, AssetCalculatedResponse,
-    ExecuteActionRequest,
+    ExecuteActionRequest, ExecuteBatchRequest, SymbolResponse,
     AccountResponse, UserRegister, UserLogin, TokenResponse, UserResponse,
     RefreshTokenRequest
 )
@@ -28,17 +35,43 @@ router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 # --- Dependencies ---
-def get_account_repo(session: Session = Depends(get_session)):
-    return SqlAlchemyAccountRepository(session)
+def get_unit_of_work(session: Session = Depends(get_session)):
+    # 요청 하나 = 작업 단위 하나: 라우트가 끝나면 한 번에 커밋, 예외면 롤백
+    with SqlAlchemyUnitOfWork(session) as uow:
+        yield uow
+
+# scope="function": 응답을 보내기 전에 커밋해 커밋 실패가 클라이언트에 전달되도록
+def get_account_repo(uow: SqlAlchemyUnitOfWork = Depends(get_unit_of_work, scope="function")):
+    return uow.accounts
 
-def get_asset_repo(session: Session = Depends(get_session)):
-    return SqlAlchemyAssetRepository(session)
+def get_asset_repo(uow: SqlAlchemyUnitOfWork = Depends(get_unit_of_work, scope="function")):
+    return uow.assets
 
 def get_auth_repo(session: Session = Depends(get_session)):
     return SqlAlchemyAuthRepository(session)
 
-def get_market_data():
-    return RealMarketDataProvider()
+def get_market_data_services(request: Request) -> MarketDataServices:
+    return request.app.state.market_data
+
+def get_market_data(
+    services: Annotated[MarketDataServices, Depends(get_market_data_services)]
+) -> MarketDataProvider:
+    return services.provider
+
+def get_fresh_market_data(
+    services: Annotated[MarketDataServices, Depends(get_market_data_services)]
+) -> MarketDataProvider:
+    return services.fresh
+
+def get_async_market_data(
+    services: Annotated[MarketDataServices, Depends(get_market_data_services)]
+) -> AsyncMarketDataProvider:
+    return services.async_provider
+
+def get_symbol_master(
+    services: Annotated[MarketDataServices, Depends(get_market_data_services)]
+) -> SymbolMaster:
+    return services.symbols
 
 def get_password_hasher():
     return PasswordHasher()
@@ -63,6 +96,17 @@ def get_current_user(
         raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail="User not found")
     return user
 
+def get_admin_emails() -> frozenset[str]:
+    return admin_emails()
+
+def get_admin_user(
+    current_user: Annotated[User, Depends(get_current_user)],
+    admins: Annotated[frozenset[str], Depends(get_admin_emails)]
+) -> User:
+    if current_user.email.lower() not in admins:
+        raise HTTPException(status_code=HTTPStatus.FORBIDDEN, detail="Admin only")
+    return current_user
+
 # --- Routes ---
 
 @router.post("/auth/register", response_model=UserResponse, status_code=HTTPStatus.CREATED)
@@ -141,6 +185,7 @@ def map_calculation_result(result) -> AccountCalculatedResponse:
             current_price=asset_ent.current_price,
             avg_price=asset_ent.avg_price,
             quantity=asset_ent.quantity,
+            version=asset_ent.version,
             current_value=item.current_value,
             invested_amount=item.invested_amount,
             pl_amount=item.pl_amount,
@@ -156,6 +201,7 @@ def map_calculation_result(result) -> AccountCalculatedResponse:
         id=acc.id,
         name=acc.name,
         cash=acc.cash,
+        version=acc.version,
         assets=assets_response,
         total_asset_value=result.total_asset_value,
         total_invested_value=result.total_invested_value,
@@ -163,14 +209,33 @@ def map_calculation_result(result) -> AccountCalculatedResponse:
         total_pl_rate=result.total_pl_rate
     )
 
+def get_owned_account(account_repo: SqlAlchemyAccountRepository, account_id: int, user: User) -> Account:
+    # 소유권 확인용: 자산 목록은 로드하지 않는다
+    try:
+        return account_repo.get_account_for_user(account_id, user.id, with_assets=False)
+    except EntityNotFoundException:
+        raise HTTPException(HTTPStatus.NOT_FOUND, "Account not found")
+    except PermissionDeniedException:
+        raise HTTPException(HTTPStatus.FORBIDDEN, "Forbidden")
+
+def get_owned_asset(asset_repo: SqlAlchemyAssetRepository, asset_id: int, user: User) -> Asset:
+    try:
+        return asset_repo.get_asset_for_user(asset_id, user.id)
+    except EntityNotFoundException:
+        raise HTTPException(HTTPStatus.NOT_FOUND, "Asset not found")
+    except PermissionDeniedException:
+        raise HTTPException(HTTPStatus.FORBIDDEN, "Forbidden")
+
 @router.get("/accounts", response_model=List[AccountCalculatedResponse])
 def list_accounts(
     account_repo: Annotated[SqlAlchemyAccountRepository, Depends(get_account_repo)],
-    current_user: Annotated[User, Depends(get_current_user)]
+    current_user: Annotated[User, Depends(get_current_user)],
+    mode: CalculationMode = CalculationMode.PER_ASSET,
+    min_trade_value: Annotated[float, Query(ge=0)] = 0.0
 ):
     accounts = account_repo.list_by_user_with_assets(current_user.id)
-    use_case = CalculatePortfolioUseCase()
-    return [map_calculation_result(use_case.execute(acc)) for acc in accounts]
+    use_case = BatchCalculatePortfolioUseCase(mode, min_trade_value)
+    return [map_calculation_result(result) for result in use_case.execute(accounts)]
 
 @router.post("/accounts", response_model=AccountResponse)
 def create_account(
@@ -189,21 +254,20 @@ def update_account(
     account_repo: Annotated[SqlAlchemyAccountRepository, Depends(get_account_repo)],
     current_user: Annotated[User, Depends(get_current_user)]
 ):
-    existing = account_repo.get(account_id)
-    if not existing:
-        raise HTTPException(HTTPStatus.NOT_FOUND, "Account not found")
-    
-    if existing.user_id != current_user.id:
-        raise HTTPException(HTTPStatus.FORBIDDEN, "Forbidden")
+    existing = get_owned_account(account_repo, account_id, current_user)
 
     # Update fields
     if update.name is not None:
         existing.name = update.name
     if update.cash is not None:
         existing.cash = update.cash
-        
-    saved = account_repo.save(existing)
-    return saved
+    if update.version is not None:
+        existing.version = update.version
+
+    try:
+        return account_repo.save(existing)
+    except VersionConflictException as e:
+        raise HTTPException(HTTPStatus.CONFLICT, str(e))
 
 @router.delete("/accounts/{account_id}")
 def delete_account(
@@ -211,12 +275,7 @@ def delete_account(
     account_repo: Annotated[SqlAlchemyAccountRepository, Depends(get_account_repo)],
     current_user: Annotated[User, Depends(get_current_user)]
 ):
-    existing = account_repo.get(account_id)
-    if not existing:
-        raise HTTPException(HTTPStatus.NOT_FOUND, "Account not found")
-
-    if existing.user_id != current_user.id:
-        raise HTTPException(HTTPStatus.FORBIDDEN, "Forbidden")
+    get_owned_account(account_repo, account_id, current_user)
 
     account_repo.delete(account_id)
     return {"ok": True}
@@ -228,11 +287,7 @@ def create_asset(
     account_repo: Annotated[SqlAlchemyAccountRepository, Depends(get_account_repo)],
     current_user: Annotated[User, Depends(get_current_user)]
 ):
-    account = account_repo.get(asset.account_id)
-    if not account:
-        raise HTTPException(HTTPStatus.NOT_FOUND, "Account not found")
-    if account.user_id != current_user.id:
-        raise HTTPException(HTTPStatus.FORBIDDEN, "Forbidden")
+    get_owned_account(account_repo, asset.account_id, current_user)
 
     entity = Asset(
         account_id=asset.account_id,
@@ -252,18 +307,9 @@ def update_asset(
     asset_id: int,
     update: AssetUpdate,
     asset_repo: Annotated[SqlAlchemyAssetRepository, Depends(get_asset_repo)],
-    account_repo: Annotated[SqlAlchemyAccountRepository, Depends(get_account_repo)],
     current_user: Annotated[User, Depends(get_current_user)]
 ):
-    existing = asset_repo.get(asset_id)
-    if not existing:
-        raise HTTPException(HTTPStatus.NOT_FOUND, "Asset not found")
-    
-    account = account_repo.get(existing.account_id)
-    if not account:
-        raise HTTPException(HTTPStatus.NOT_FOUND, "Account not found")
-    if account.user_id != current_user.id:
-        raise HTTPException(HTTPStatus.FORBIDDEN, "Forbidden")
+    existing = get_owned_asset(asset_repo, asset_id, current_user)
 
     if update.name is not None: existing.name = update.name
     if update.code is not None: existing.code = update.code
@@ -272,26 +318,20 @@ def update_asset(
     if update.current_price is not None: existing.current_price = update.current_price
     if update.avg_price is not None: existing.avg_price = update.avg_price
     if update.quantity is not None: existing.quantity = update.quantity
-    
-    saved = asset_repo.save(existing)
-    return saved
+    if update.version is not None: existing.version = update.version
+
+    try:
+        return asset_repo.save(existing)
+    except VersionConflictException as e:
+        raise HTTPException(HTTPStatus.CONFLICT, str(e))
 
 @router.delete("/assets/{asset_id}")
 def delete_asset(
     asset_id: int,
     asset_repo: Annotated[SqlAlchemyAssetRepository, Depends(get_asset_repo)],
-    account_repo: Annotated[SqlAlchemyAccountRepository, Depends(get_account_repo)],
     current_user: Annotated[User, Depends(get_current_user)]
 ):
-    existing = asset_repo.get(asset_id)
-    if not existing:
-        raise HTTPException(HTTPStatus.NOT_FOUND, "Asset not found")
-
-    account = account_repo.get(existing.account_id)
-    if not account:
-        raise HTTPException(HTTPStatus.NOT_FOUND, "Account not found")
-    if account.user_id != current_user.id:
-        raise HTTPException(HTTPStatus.FORBIDDEN, "Forbidden")
+    get_owned_asset(asset_repo, asset_id, current_user)
 
     asset_repo.delete(asset_id)
     return {"ok": True}
@@ -299,37 +339,105 @@ def delete_asset(
 @router.post("/assets/execute", response_model=AccountCalculatedResponse)
 def execute_trade(
     req: ExecuteActionRequest,
-    asset_repo: Annotated[SqlAlchemyAssetRepository, Depends(get_asset_repo)],
-    account_repo: Annotated[SqlAlchemyAccountRepository, Depends(get_account_repo)],
+    uow: Annotated[SqlAlchemyUnitOfWork, Depends(get_unit_of_work, scope="function")],
     current_user: Annotated[User, Depends(get_current_user)]
 ):
-    asset = asset_repo.get(req.asset_id)
-    if not asset:
-        raise HTTPException(HTTPStatus.NOT_FOUND, "Asset not found")
-
-    account = account_repo.get(asset.account_id)
-    if not account:
-        raise HTTPException(HTTPStatus.NOT_FOUND, "Account not found")
-    if account.user_id != current_user.id:
+    use_case = ExecuteTradeUseCase(uow)
+    try:
+        result = use_case.execute(req.asset_id, req.action_quantity, req.price, current_user.id)
+        return map_calculation_result(result)
+    except EntityNotFoundException as e:
+        raise HTTPException(HTTPStatus.NOT_FOUND, str(e))
+    except PermissionDeniedException:
         raise HTTPException(HTTPStatus.FORBIDDEN, "Forbidden")
+    except (InsufficientFundsException, InvalidActionException) as e:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, str(e))
+    except ConcurrencyConflictException as e:
+        raise HTTPException(HTTPStatus.CONFLICT, str(e))
 
-    use_case = ExecuteTradeUseCase(asset_repo, account_repo)
+
+@router.post("/accounts/{account_id}/execute", response_model=AccountCalculatedResponse)
+def execute_trade_batch(
+    account_id: int,
+    req: ExecuteBatchRequest,
+    uow: Annotated[SqlAlchemyUnitOfWork, Depends(get_unit_of_work, scope="function")],
+    current_user: Annotated[User, Depends(get_current_user)]
+):
+    legs = [TradeLeg(asset_id=leg.asset_id, action_quantity=leg.action_quantity, price=leg.price) for leg in req.legs]
+    use_case = ExecuteTradeBatchUseCase(uow)
     try:
-        result = use_case.execute(req.asset_id, req.action_quantity, req.price)
+        result = use_case.execute(account_id, legs, current_user.id)
         return map_calculation_result(result)
     except EntityNotFoundException as e:
         raise HTTPException(HTTPStatus.NOT_FOUND, str(e))
+    except PermissionDeniedException:
+        raise HTTPException(HTTPStatus.FORBIDDEN, "Forbidden")
     except (InsufficientFundsException, InvalidActionException) as e:
         raise HTTPException(HTTPStatus.BAD_REQUEST, str(e))
+    except ConcurrencyConflictException as e:
+        raise HTTPException(HTTPStatus.CONFLICT, str(e))
 
+@router.post("/accounts/{account_id}/rebalance", response_model=AccountCalculatedResponse)
+def rebalance_account(
+    account_id: int,
+    uow: Annotated[SqlAlchemyUnitOfWork, Depends(get_unit_of_work, scope="function")],
+    market_data: Annotated[MarketDataProvider, Depends(get_fresh_market_data)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    dry_run: bool = False,
+    mode: CalculationMode = CalculationMode.PER_ASSET,
+    min_trade_value: Annotated[float, Query(ge=0)] = 0.0
+):
+    """Rebalance to target weights at fresh prices; `dry_run=true` only returns the plan."""
+    use_case = RebalanceAccountUseCase(uow, market_data, mode=mode, min_trade_value=min_trade_value)
+    try:
+        result = use_case.execute(account_id, current_user.id, dry_run=dry_run)
+        return map_calculation_result(result)
+    except EntityNotFoundException as e:
+        raise HTTPException(HTTPStatus.NOT_FOUND, str(e))
+    except PermissionDeniedException:
+        raise HTTPException(HTTPStatus.FORBIDDEN, "Forbidden")
+    except (InsufficientFundsException, InvalidActionException) as e:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, str(e))
+    except ConcurrencyConflictException as e:
+        raise HTTPException(HTTPStatus.CONFLICT, str(e))
 
 @router.get("/finance/lookup")
-def lookup_asset(
+async def lookup_asset(
     code: str,
-    market_data: Annotated[RealMarketDataProvider, Depends(get_market_data)]
+    market_data: Annotated[AsyncMarketDataProvider, Depends(get_async_market_data)]
 ):
-    use_case = FetchAssetInfoUseCase(market_data)
-    info = use_case.execute(code)
+    use_case = AsyncFetchAssetInfoUseCase(market_data)
+    try:
+        info = await use_case.execute(code)
+    except InvalidAssetCodeException as e:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, str(e))
     if not info:
         raise HTTPException(HTTPStatus.NOT_FOUND, "Asset info not found")
     return info
+
+@router.get("/finance/search", response_model=List[SymbolResponse])
+async def search_symbols(
+    q: str,
+    symbols: Annotated[SymbolMaster, Depends(get_symbol_master)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 10
+):
+    # 메모리 인덱스 조회만 한다 (스냅샷 재적재는 LocalSymbolMaster가 백그라운드에서 수행)
+    return SearchSymbolsUseCase(symbols).execute(q, limit)
+
+@router.get("/finance/metrics")
+def market_data_metrics(
+    services: Annotated[MarketDataServices, Depends(get_market_data_services)],
+    admin: Annotated[User, Depends(get_admin_user)]
+):
+    # 캐시 적중률, 차단기 상태 등 운영 지표이므로 운영자만 조회
+    return services.metrics()
+
+@router.delete("/finance/cache")
+def invalidate_quote_cache(
+    services: Annotated[MarketDataServices, Depends(get_market_data_services)],
+    admin: Annotated[User, Depends(get_admin_user)],
+    code: Optional[str] = None
+):
+    # 프로세스 전역 캐시이므로 운영자(SNOWBALL_ADMIN_EMAILS)만 비울 수 있다
+    removed = services.cache.invalidate(code)
+    return {"ok": True, "removed": removed}
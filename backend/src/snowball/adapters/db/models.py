@@ -1,6 +1,7 @@
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import UUID, uuid4
+from sqlalchemy import DateTime
 from sqlmodel import Field, SQLModel, Relationship
 
 class UserModel(SQLModel, table=True):
@@ -19,6 +20,8 @@ class AccountModel(SQLModel, table=True):
     name: str
     cash: float = 0.0
     user_id: UUID = Field(foreign_key="user.id", index=True)
+    # 낙관적 동시성 제어: 모든 갱신이 1씩 올리고, 저장은 읽은 버전과 같을 때만 적용
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
     
     user: Optional[UserModel] = Relationship(back_populates="accounts")
     assets: List["AssetModel"] = Relationship(back_populates="account", sa_relationship_kwargs={"cascade": "all, delete"})
@@ -28,11 +31,29 @@ class AssetModel(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     account_id: Optional[int] = Field(default=None, foreign_key="account.id")
     name: str
-    code: Optional[str] = None
+    code: Optional[str] = Field(default=None, index=True)
     category: str = "주식"
     target_weight: float = 0.0
     current_price: float = 0.0
     avg_price: float = 0.0
     quantity: float = 0.0
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
     
     account: Optional[AccountModel] = Relationship(back_populates="assets")
+
+class QuoteModel(SQLModel, table=True):
+    """Last refreshed price per code; price_updated_at drives incremental refreshes."""
+    __tablename__ = "quote"
+    code: str = Field(primary_key=True)
+    price: float
+    price_updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), sa_type=DateTime(timezone=True), index=True
+    )
+
+class QuoteAttemptModel(SQLModel, table=True):
+    """Last refresh attempt per code, successful or not; rotates failing codes to the back."""
+    __tablename__ = "quote_attempt"
+    code: str = Field(primary_key=True)
+    attempted_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), sa_type=DateTime(timezone=True), index=True
+    )
@@ -1,10 +1,23 @@
-from typing import List, Optional
+from contextlib import contextmanager
+from dataclasses import fields
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 from uuid import UUID
 from sqlmodel import Session, select
-from sqlalchemy.orm import selectinload
-from ...domain.ports import AccountRepository, AssetRepository, AuthRepository
+from sqlalchemy import case, delete, func, insert, or_, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import raiseload, selectinload
+from ...domain.ports import AccountRepository, AssetRepository, AuthRepository, UnitOfWork
 from ...domain.entities import Account, Asset, User, UserId
-from .models import AccountModel, AssetModel, UserModel
+from ...domain.exceptions import (
+    ConcurrencyConflictException, EntityNotFoundException, PermissionDeniedException, VersionConflictException
+)
+from .models import AccountModel, AssetModel, QuoteAttemptModel, QuoteModel, UserModel
+
+# Codes per bulk UPDATE: keeps the CASE/IN bind parameters well under driver limits
+PRICE_UPDATE_CHUNK_SIZE = 500
+# Rows per fetch when streaming batch scans
+STREAM_CHUNK_SIZE = 1000
 
 class SqlAlchemyAuthRepository(AuthRepository):
     def __init__(self, session: Session):
@@ -57,17 +70,100 @@ class SqlAlchemyAuthRepository(AuthRepository):
         self.session.refresh(model)
         return self._to_entity(model)
 
+# 재시도하면 성공할 수 있는 DB 오류: 직렬화 실패/교착 상태 (PostgreSQL SQLSTATE), 잠금 대기 초과 (SQLite)
+_CONFLICT_SQLSTATES = {"40001", "40P01"}
+
+@contextmanager
+def _conflicts_as_domain_errors():
+    try:
+        yield
+    except OperationalError as e:
+        sqlstate = getattr(e.orig, "sqlstate", None) or getattr(e.orig, "pgcode", None)
+        if sqlstate in _CONFLICT_SQLSTATES or "database is locked" in str(e.orig):
+            raise ConcurrencyConflictException(str(e.orig)) from e
+        raise
+
+def _copy_fields(target, source, exclude=()) -> None:
+    for f in fields(source):
+        if f.name not in exclude:
+            setattr(target, f.name, getattr(source, f.name))
+
+class IdentityMap:
+    """
+    Account and asset entities already loaded in one unit of work, keyed by id.
+    A known id resolves to the same object without another query, so an edit made
+    through one repository is visible to the other.
+    """
+
+    def __init__(self):
+        self.accounts: Dict[int, Account] = {}
+        self.assets: Dict[int, Asset] = {}
+        self.asset_owners: Dict[int, UserId] = {}
+        self.accounts_with_assets: Set[int] = set()
+
+    def clear(self) -> None:
+        self.accounts.clear()
+        self.assets.clear()
+        self.asset_owners.clear()
+        self.accounts_with_assets.clear()
+
+    def account(self, account_id: int, with_assets: bool) -> Optional[Account]:
+        if with_assets and account_id not in self.accounts_with_assets:
+            return None
+        return self.accounts.get(account_id)
+
+    def add_account(self, loaded: Account, with_assets: bool) -> Account:
+        account = self.accounts.setdefault(loaded.id, loaded)
+        if with_assets and loaded.id not in self.accounts_with_assets:
+            account.assets = [self.add_asset(a, owner=account.user_id) for a in loaded.assets]
+            self.accounts_with_assets.add(loaded.id)
+        return account
+
+    def add_asset(self, loaded: Asset, owner: Optional[UserId] = None) -> Asset:
+        asset = self.assets.setdefault(loaded.id, loaded)
+        if owner is None and asset.account_id in self.accounts:
+            owner = self.accounts[asset.account_id].user_id
+        if owner is not None:
+            self.asset_owners[asset.id] = owner
+        # 자산 목록이 로드된 계좌라면 새로 저장된 자산도 목록에 포함
+        if asset.account_id in self.accounts_with_assets:
+            account = self.accounts[asset.account_id]
+            if all(a.id != asset.id for a in account.assets):
+                account.assets.append(asset)
+        return asset
+
+    def discard_asset(self, asset_id: int) -> None:
+        asset = self.assets.pop(asset_id, None)
+        self.asset_owners.pop(asset_id, None)
+        if asset is not None and asset.account_id in self.accounts:
+            account = self.accounts[asset.account_id]
+            account.assets = [a for a in account.assets if a.id != asset_id]
+
+    def discard_account(self, account_id: int) -> None:
+        self.accounts.pop(account_id, None)
+        self.accounts_with_assets.discard(account_id)
+        for asset_id in [i for i, a in self.assets.items() if a.account_id == account_id]:
+            self.assets.pop(asset_id)
+            self.asset_owners.pop(asset_id, None)
+
 class SqlAlchemyAccountRepository(AccountRepository):
-    def __init__(self, session: Session):
+    """
+    Commits on every write by default. Given an `identity_map` (see SqlAlchemyUnitOfWork)
+    it serves repeated lookups from memory and only flushes; the unit of work commits.
+    """
+
+    def __init__(self, session: Session, identity_map: Optional[IdentityMap] = None):
         self.session = session
+        self.identity_map = identity_map
 
-    def _to_entity(self, model: AccountModel) -> Account:
+    def _to_entity(self, model: AccountModel, with_assets: bool = True) -> Account:
         return Account(
             id=model.id,
             user_id=UserId(model.user_id),
             name=model.name,
             cash=model.cash,
-            assets=[self._to_asset_entity(a) for a in model.assets]
+            assets=[self._to_asset_entity(a) for a in model.assets] if with_assets else [],
+            version=model.version
         )
 
     def _to_asset_entity(self, model: AssetModel) -> Asset:
@@ -82,67 +178,127 @@ class SqlAlchemyAccountRepository(AccountRepository):
             target_weight=model.target_weight,
             current_price=model.current_price,
             avg_price=model.avg_price,
-            quantity=model.quantity
+            quantity=model.quantity,
+            version=model.version
         )
 
-    def get(self, account_id: int) -> Optional[Account]:
-        model = self.session.get(AccountModel, account_id)
+    def _select(self, with_assets: bool = True):
+        # 모든 읽기 경로에서 동일한 로딩 전략: 자산은 selectinload로 계좌 묶음당 SELECT 한 번,
+        # 자산이 필요 없으면 raiseload로 막아 실수로 인한 lazy load(N+1)를 즉시 드러낸다
+        loader = selectinload(AccountModel.assets) if with_assets else raiseload(AccountModel.assets)
+        return select(AccountModel).options(loader)
+
+    def _remember(self, model: AccountModel, with_assets: bool) -> Account:
+        if self.identity_map is None:
+            return self._to_entity(model, with_assets)
+        cached = self.identity_map.account(model.id, with_assets)
+        if cached is not None:
+            return cached
+        return self.identity_map.add_account(self._to_entity(model, with_assets), with_assets)
+
+    def get(self, account_id: int, with_assets: bool = True) -> Optional[Account]:
+        if self.identity_map is not None:
+            cached = self.identity_map.account(account_id, with_assets)
+            if cached is not None:
+                return cached
+        statement = self._select(with_assets).where(AccountModel.id == account_id)
+        model = self.session.exec(statement).first()
         if model:
-            return self._to_entity(model)
+            return self._remember(model, with_assets)
         return None
 
-    def list_all(self) -> List[Account]:
-        statement = select(AccountModel)
-        models = self.session.exec(statement).all()
-        return [self._to_entity(m) for m in models]
+    def get_account_for_user(self, account_id: int, user_id: UserId, with_assets: bool = True) -> Account:
+        account = self.get(account_id, with_assets)
+        if account is None:
+            raise EntityNotFoundException(f"Account with id {account_id} not found")
+        if account.user_id != user_id:
+            raise PermissionDeniedException(f"Account {account_id} belongs to another user")
+        return account
+
+    def list_all(self, with_assets: bool = True) -> List[Account]:
+        models = self.session.exec(self._select(with_assets)).all()
+        return [self._remember(m, with_assets) for m in models]
 
-    def list_by_user(self, user_id: UserId) -> List[Account]:
-        statement = select(AccountModel).where(AccountModel.user_id == user_id)
+    def list_by_user(self, user_id: UserId, with_assets: bool = True) -> List[Account]:
+        statement = self._select(with_assets).where(AccountModel.user_id == user_id)
         models = self.session.exec(statement).all()
-        return [self._to_entity(m) for m in models]
+        return [self._remember(m, with_assets) for m in models]
 
     def list_by_user_with_assets(self, user_id: UserId) -> List[Account]:
-        statement = (
-            select(AccountModel)
-            .where(AccountModel.user_id == user_id)
-            .options(selectinload(AccountModel.assets))
-        )
-        models = self.session.exec(statement).all()
-        return [self._to_entity(m) for m in models]
+        return self.list_by_user(user_id, with_assets=True)
 
     def save(self, account: Account) -> Account:
-        if account.id:
-            model = self.session.get(AccountModel, account.id)
-            if model:
-                model.name = account.name
-                model.cash = account.cash
-                # user_id typically doesn't change, but we can update it if needed
-                model.user_id = account.user_id
-                self.session.add(model)
-                self.session.commit()
-                self.session.refresh(model)
-                return self._to_entity(model)
-        
-        # Create new
-        model = AccountModel(
-            name=account.name, 
-            cash=account.cash,
-            user_id=account.user_id
+        model = self._update(account) if account.id else None
+        if model is None:
+            # Create new
+            model = AccountModel(
+                name=account.name,
+                cash=account.cash,
+                user_id=account.user_id
+            )
+            self.session.add(model)
+        if self.identity_map is None:
+            self.session.commit()
+            self.session.refresh(model)
+            return self._to_entity(model)
+
+        self.session.flush()
+        cached = self.identity_map.accounts.get(model.id)
+        if cached is not None:
+            _copy_fields(cached, account, exclude=("id", "assets", "version"))
+            cached.version = model.version
+        return self._remember(model, with_assets=True)
+
+    def _update(self, account: Account) -> Optional[AccountModel]:
+        """Version-checked UPDATE. Returns None if the row no longer exists."""
+        statement = (
+            update(AccountModel)
+            .where(AccountModel.id == account.id, AccountModel.version == account.version)
+            # user_id typically doesn't change, but we can update it if needed
+            .values(name=account.name, cash=account.cash, user_id=account.user_id, version=AccountModel.version + 1)
+            .returning(AccountModel.id)
         )
-        self.session.add(model)
-        self.session.commit()
-        self.session.refresh(model)
-        return self._to_entity(model)
+        with _conflicts_as_domain_errors():
+            updated = self.session.exec(statement).first()
+        if updated is None:
+            if self.session.exec(select(AccountModel.id).where(AccountModel.id == account.id)).first() is None:
+                return None
+            raise VersionConflictException(f"Account {account.id} was modified since version {account.version}")
+        return self.session.get(AccountModel, account.id)
 
     def delete(self, account_id: int) -> None:
         model = self.session.get(AccountModel, account_id)
         if model:
             self.session.delete(model)
-            self.session.commit()
+            if self.identity_map is None:
+                self.session.commit()
+            else:
+                self.session.flush()
+                self.identity_map.discard_account(account_id)
+
+    def adjust_cash(self, account_id: int, amount: float) -> Optional[float]:
+        # 조건부 UPDATE ... RETURNING: 읽고-고쳐-쓰기 없이 잔고 확인과 차감을 한 문장으로
+        statement = (
+            update(AccountModel)
+            .where(AccountModel.id == account_id, AccountModel.cash + amount >= 0)
+            .values(cash=AccountModel.cash + amount, version=AccountModel.version + 1)
+            .returning(AccountModel.cash, AccountModel.version)
+        )
+        with _conflicts_as_domain_errors():
+            row = self.session.exec(statement).first()
+        if row is None:
+            return None
+        if self.identity_map is not None and account_id in self.identity_map.accounts:
+            cached = self.identity_map.accounts[account_id]
+            cached.cash, cached.version = row
+        return row[0]
 
 class SqlAlchemyAssetRepository(AssetRepository):
-    def __init__(self, session: Session):
+    """Same commit/identity-map behaviour as SqlAlchemyAccountRepository; batch methods always commit."""
+
+    def __init__(self, session: Session, identity_map: Optional[IdentityMap] = None):
         self.session = session
+        self.identity_map = identity_map
 
     def _to_entity(self, model: AssetModel) -> Asset:
         if model.account_id is None:
@@ -156,63 +312,291 @@ class SqlAlchemyAssetRepository(AssetRepository):
             target_weight=model.target_weight,
             current_price=model.current_price,
             avg_price=model.avg_price,
-            quantity=model.quantity
+            quantity=model.quantity,
+            version=model.version
         )
 
+    def _remember(self, model: AssetModel, owner: Optional[UserId] = None) -> Asset:
+        if self.identity_map is None:
+            return self._to_entity(model)
+        cached = self.identity_map.assets.get(model.id)
+        return self.identity_map.add_asset(cached or self._to_entity(model), owner)
+
     def get(self, asset_id: int) -> Optional[Asset]:
+        if self.identity_map is not None and asset_id in self.identity_map.assets:
+            return self.identity_map.assets[asset_id]
         model = self.session.get(AssetModel, asset_id)
         if model:
-            return self._to_entity(model)
+            return self._remember(model)
         return None
 
+    def get_asset_for_user(self, asset_id: int, user_id: UserId) -> Asset:
+        if self.identity_map is not None and asset_id in self.identity_map.asset_owners:
+            asset, owner_id = self.identity_map.assets[asset_id], self.identity_map.asset_owners[asset_id]
+        else:
+            # 존재 여부와 소유자를 한 번의 JOIN으로 확인 (계좌의 자산 목록은 로드하지 않음)
+            statement = (
+                select(AssetModel, AccountModel.user_id)
+                .join(AccountModel, AssetModel.account_id == AccountModel.id)
+                .where(AssetModel.id == asset_id)
+            )
+            row = self.session.exec(statement).first()
+            if row is None:
+                raise EntityNotFoundException(f"Asset with id {asset_id} not found")
+            model, owner_id = row
+            asset = self._remember(model, UserId(owner_id))
+        if owner_id != user_id:
+            raise PermissionDeniedException(f"Asset {asset_id} belongs to another user")
+        return asset
+
     def save(self, asset: Asset) -> Asset:
-        if asset.id:
-            model = self.session.get(AssetModel, asset.id)
-            if model:
-                model.name = asset.name
-                model.code = asset.code
-                model.category = asset.category
-                model.target_weight = asset.target_weight
-                model.current_price = asset.current_price
-                model.avg_price = asset.avg_price
-                model.quantity = asset.quantity
-                # account_id usually doesn't change
-                self.session.add(model)
-                self.session.commit()
-                self.session.refresh(model)
-                return self._to_entity(model)
-        
-        # Create new
-        model = AssetModel(
-            account_id=asset.account_id,
-            name=asset.name,
-            code=asset.code,
-            category=asset.category,
-            target_weight=asset.target_weight,
-            current_price=asset.current_price,
-            avg_price=asset.avg_price,
-            quantity=asset.quantity
+        model = self._update(asset) if asset.id else None
+        if model is None:
+            # Create new
+            model = AssetModel(
+                account_id=asset.account_id,
+                name=asset.name,
+                code=asset.code,
+                category=asset.category,
+                target_weight=asset.target_weight,
+                current_price=asset.current_price,
+                avg_price=asset.avg_price,
+                quantity=asset.quantity
+            )
+            self.session.add(model)
+        if self.identity_map is None:
+            self.session.commit()
+            self.session.refresh(model)
+            return self._to_entity(model)
+
+        self.session.flush()
+        cached = self.identity_map.assets.get(model.id)
+        if cached is not None:
+            _copy_fields(cached, asset, exclude=("id", "version"))
+            cached.version = model.version
+        return self._remember(model)
+
+    def _update(self, asset: Asset) -> Optional[AssetModel]:
+        """Version-checked UPDATE. Returns None if the row no longer exists."""
+        statement = (
+            update(AssetModel)
+            .where(AssetModel.id == asset.id, AssetModel.version == asset.version)
+            # account_id usually doesn't change
+            .values(
+                name=asset.name,
+                code=asset.code,
+                category=asset.category,
+                target_weight=asset.target_weight,
+                current_price=asset.current_price,
+                avg_price=asset.avg_price,
+                quantity=asset.quantity,
+                version=AssetModel.version + 1
+            )
+            .returning(AssetModel.id)
         )
-        self.session.add(model)
-        self.session.commit()
-        self.session.refresh(model)
-        return self._to_entity(model)
+        with _conflicts_as_domain_errors():
+            updated = self.session.exec(statement).first()
+        if updated is None:
+            if self.session.exec(select(AssetModel.id).where(AssetModel.id == asset.id)).first() is None:
+                return None
+            raise VersionConflictException(f"Asset {asset.id} was modified since version {asset.version}")
+        return self.session.get(AssetModel, asset.id)
 
     def delete(self, asset_id: int) -> None:
         model = self.session.get(AssetModel, asset_id)
         if model:
             self.session.delete(model)
-            self.session.commit()
+            if self.identity_map is None:
+                self.session.commit()
+            else:
+                self.session.flush()
+                self.identity_map.discard_asset(asset_id)
 
     def list_by_account(self, account_id: int) -> List[Asset]:
         statement = select(AssetModel).where(AssetModel.account_id == account_id)
         models = self.session.exec(statement).all()
-        return [self._to_entity(m) for m in models]
+        return [self._remember(m) for m in models]
+
+    def apply_trade(self, asset_id: int, quantity: float, price: float) -> Optional[Asset]:
+        new_quantity = AssetModel.quantity + quantity
+        # SET 절의 컬럼은 갱신 전 값을 가리킨다: 평균단가 = (기존 매입액 + 체결액) / 새 수량
+        avg_price = (
+            (AssetModel.quantity * AssetModel.avg_price + quantity * price) / new_quantity
+            if quantity > 0 else AssetModel.avg_price
+        )
+        statement = (
+            update(AssetModel)
+            .where(AssetModel.id == asset_id, new_quantity >= 0)
+            .values(quantity=new_quantity, avg_price=avg_price, current_price=price, version=AssetModel.version + 1)
+            .returning(AssetModel.quantity, AssetModel.avg_price, AssetModel.current_price, AssetModel.version)
+        )
+        with _conflicts_as_domain_errors():
+            row = self.session.exec(statement).first()
+        if row is None:
+            return None
+
+        model = self.session.get(AssetModel, asset_id)
+        if self.identity_map is None:
+            return self._to_entity(model)
+        cached = self.identity_map.assets.get(asset_id)
+        if cached is not None:
+            cached.quantity, cached.avg_price, cached.current_price, cached.version = row
+        return self._remember(model)
+
+    def set_current_prices(self, prices: Dict[int, float]) -> None:
+        if not prices:
+            return
+        statement = (
+            update(AssetModel)
+            .where(AssetModel.id.in_(prices))
+            # 시세 반영은 version을 올리지 않는다 (update_prices와 동일)
+            .values(current_price=case(prices, value=AssetModel.id))
+            .execution_options(synchronize_session=False)
+        )
+        with _conflicts_as_domain_errors():
+            self.session.exec(statement)
+        if self.identity_map is not None:
+            for asset_id, price in prices.items():
+                cached = self.identity_map.assets.get(asset_id)
+                if cached is not None:
+                    cached.current_price = price
 
     def list_all_with_code(self) -> List[Asset]:
-        statement = select(AssetModel).where(
-            AssetModel.code != None,
-            AssetModel.code != ""
+        return list(self.iter_all_with_code())
+
+    def iter_all_with_code(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Asset]:
+        statement = (
+            select(AssetModel)
+            .where(AssetModel.code != None, AssetModel.code != "")
+            .order_by(AssetModel.id)
+            # yield_per: server-side cursor + fixed-size fetches instead of materializing the table
+            .execution_options(yield_per=chunk_size)
         )
-        models = self.session.exec(statement).all()
-        return [self._to_entity(m) for m in models]
+        for model in self.session.exec(statement):
+            yield self._to_entity(model)
+
+    def iter_ids_and_codes(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Tuple[int, str]]:
+        # Column projection: no ORM objects, no identity map entries
+        statement = (
+            select(AssetModel.id, AssetModel.code)
+            .where(AssetModel.code != None, AssetModel.code != "")
+            .order_by(AssetModel.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        for asset_id, code in self.session.exec(statement):
+            yield asset_id, code
+
+    def update_prices(
+        self,
+        prices: Dict[str, float],
+        updated_at: Optional[datetime] = None,
+        chunk_size: int = PRICE_UPDATE_CHUNK_SIZE,
+    ) -> int:
+        """
+        One set-based UPDATE per chunk of codes:
+        SET current_price = CASE code WHEN :c1 THEN :p1 ... END WHERE code IN (...),
+        plus a replace of the chunk's quote rows, all chunks committed together.
+        """
+        updated_at = updated_at or datetime.now(timezone.utc)
+        items = list(prices.items())
+        updated = 0
+        try:
+            for start in range(0, len(items), chunk_size):
+                chunk = dict(items[start:start + chunk_size])
+                statement = (
+                    update(AssetModel)
+                    .where(AssetModel.code.in_(chunk))
+                    # 시세 갱신은 version을 올리지 않는다: 매분 갱신이 사용자 편집을 매번 충돌시키지 않도록
+                    .values(current_price=case(chunk, value=AssetModel.code))
+                    # commit expires loaded models anyway; skip the in-session sync
+                    .execution_options(synchronize_session=False)
+                )
+                updated += self.session.exec(statement).rowcount
+                # Portable upsert (SQLite/Postgres): delete + executemany insert in the same transaction
+                self.session.exec(delete(QuoteModel).where(QuoteModel.code.in_(chunk)))
+                self.session.exec(
+                    insert(QuoteModel),
+                    params=[
+                        {"code": code, "price": price, "price_updated_at": updated_at}
+                        for code, price in chunk.items()
+                    ],
+                )
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        if self.identity_map is not None:
+            # 벌크 UPDATE는 identity map을 거치지 않으므로 이미 로드된 자산의 시세를 맞춰 둔다
+            for asset in self.identity_map.assets.values():
+                if asset.code in prices:
+                    asset.current_price = prices[asset.code]
+        return updated
+
+    def record_attempts(self, codes: List[str], attempted_at: Optional[datetime] = None) -> None:
+        attempted_at = attempted_at or datetime.now(timezone.utc)
+        codes = list(dict.fromkeys(codes))
+        try:
+            for start in range(0, len(codes), PRICE_UPDATE_CHUNK_SIZE):
+                chunk = codes[start:start + PRICE_UPDATE_CHUNK_SIZE]
+                self.session.exec(delete(QuoteAttemptModel).where(QuoteAttemptModel.code.in_(chunk)))
+                self.session.exec(
+                    insert(QuoteAttemptModel),
+                    params=[{"code": code, "attempted_at": attempted_at} for code in chunk],
+                )
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def list_stale_codes(self, stale_before: datetime, limit: Optional[int] = None) -> List[str]:
+        held_value = func.sum(AssetModel.quantity * AssetModel.current_price)
+        # 최근에 시도했는데도 오래된 종목(조회 실패)은 뒤로: 실패가 반복되는 종목이 매 배치를 차지하지 않도록
+        retried = case((func.max(QuoteAttemptModel.attempted_at) >= stale_before, 1), else_=0)
+        statement = (
+            select(AssetModel.code)
+            .outerjoin(QuoteModel, QuoteModel.code == AssetModel.code)
+            .outerjoin(QuoteAttemptModel, QuoteAttemptModel.code == AssetModel.code)
+            .where(AssetModel.code != None, AssetModel.code != "")
+            .group_by(AssetModel.code)
+            .having(or_(
+                func.max(QuoteModel.price_updated_at) == None,
+                func.max(QuoteModel.price_updated_at) < stale_before,
+            ))
+            .order_by(retried, held_value.desc(), AssetModel.code)
+            .limit(limit)
+        )
+        return list(self.session.exec(statement))
+
+class SqlAlchemyUnitOfWork(UnitOfWork):
+    """
+    Request-scoped unit of work: account and asset repositories over one session
+    and one IdentityMap. Their writes are flushed, not committed; leaving the
+    `with` block commits them together, or rolls everything back on an exception.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.identity_map = IdentityMap()
+        self.accounts = SqlAlchemyAccountRepository(session, self.identity_map)
+        self.assets = SqlAlchemyAssetRepository(session, self.identity_map)
+
+    def __enter__(self) -> "SqlAlchemyUnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def commit(self) -> None:
+        # 유스케이스가 이미 커밋했다면 요청 종료 시 빈 커밋을 하지 않는다
+        if not self.session.in_transaction():
+            return
+        with _conflicts_as_domain_errors():
+            self.session.commit()
+
+    def rollback(self) -> None:
+        self.session.rollback()
+        # 롤백된 변경이 메모리에 남지 않도록
+        self.identity_map.clear()
@@ -0,0 +1,145 @@
+import asyncio
+from typing import Optional
+
+import httpx
+
+from ...domain.exceptions import MarketDataUnavailableException
+from ...domain.ports import AsyncMarketDataProvider, SymbolMaster
+from ...domain.services import is_valid_code
+from .history import PriceHistory
+from .naver import naver_item_url, parse_naver_quote
+from .resilience import UpstreamGuard, naver_guard
+from .symbols import LocalSymbolMaster, display_name
+from .transport import DEFAULT_HEADERS
+
+
+def create_async_client(
+    max_connections: int = 200,
+    max_keepalive_connections: int = 50,
+    connect_timeout: float = 3.05,
+    read_timeout: float = 10.0,
+    retries: int = 2,
+) -> httpx.AsyncClient:
+    """Pooled keep-alive async client mirroring HttpTransport's limits and timeouts."""
+    return httpx.AsyncClient(
+        headers=DEFAULT_HEADERS,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        ),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        # httpx retries connection failures only
+        transport=httpx.AsyncHTTPTransport(retries=retries),
+    )
+
+
+class AsyncRealMarketDataProvider(AsyncMarketDataProvider):
+    """
+    Non-blocking Naver/FDR provider.
+
+    Network I/O is awaited on the event loop; HTML parsing and the FDR/history
+    path run in worker threads so the loop never blocks on CPU or sync I/O.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        history: Optional[PriceHistory] = None,
+        naver: Optional[UpstreamGuard] = None,
+        symbols: Optional[SymbolMaster] = None,
+    ):
+        self._owns_client = client is None
+        self.client = client or create_async_client()
+        self.history = history or PriceHistory()
+        self.naver = naver or naver_guard()
+        self.symbols = symbols or LocalSymbolMaster()
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def scrape_naver_finance(self, code: str) -> Optional[dict]:
+        try:
+            return await self._scrape_naver(code)
+        except MarketDataUnavailableException:
+            return None
+
+    async def _scrape_naver(self, code: str) -> Optional[dict]:
+        # None: Naver answered without a quote. Raises when Naver could not answer at all
+        delay = self.naver.admit()
+        if delay is None:
+            raise MarketDataUnavailableException("Naver skipped: breaker open or rate limited")
+
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            res = await self.client.get(naver_item_url(code))
+        except Exception as e:
+            self.naver.record_failure()
+            print(f"Naver scraping failed: {e}")
+            raise MarketDataUnavailableException(f"Naver request failed for {code}") from e
+        except BaseException:
+            # 취소된 호출은 성공도 실패도 아니다: half-open 탐침 슬롯만 반납
+            self.naver.release()
+            raise
+
+        self.naver.record_response(res.status_code)
+        if res.status_code == 429 or res.status_code >= 500:
+            raise MarketDataUnavailableException(f"Naver answered {res.status_code} for {code}")
+        if res.status_code != 200:
+            return None
+        try:
+            return await asyncio.to_thread(parse_naver_quote, res.text)
+        except Exception as e:
+            print(f"Naver parsing failed: {e}")
+            raise MarketDataUnavailableException(f"Naver page for {code} could not be parsed") from e
+
+    async def _scrape_or_failure(self, code: str) -> tuple[Optional[dict], Optional[MarketDataUnavailableException]]:
+        try:
+            return await self._scrape_naver(code), None
+        except MarketDataUnavailableException as e:
+            return None, e
+
+    async def _latest_close(self, code: str) -> Optional[float]:
+        try:
+            return await asyncio.to_thread(self.history.latest_close, code)
+        except MarketDataUnavailableException:
+            raise
+        except Exception as e:
+            print(f"Failed to fetch price for {code}: {e}")
+            raise MarketDataUnavailableException(f"History lookup failed for {code}") from e
+
+    async def fetch_price(self, code: str) -> Optional[float]:
+        if not is_valid_code(code):
+            return None
+
+        # 국내주식(숫자코드): Naver Finance에서 실시간 현재가 조회
+        naver_failure = None
+        if code.isdigit():
+            data, naver_failure = await self._scrape_or_failure(code)
+            if data and data.get('price'):
+                return data['price']
+
+        # 해외주식: FinanceDataReader 종가 (로컬 히스토리에 증분 저장)
+        price = await self._latest_close(code)
+        # 모든 소스가 확실히 없다고 답했을 때만 None: Naver 장애는 "없음"이 아니다
+        if price is None and naver_failure is not None:
+            raise naver_failure
+        return price
+
+    async def fetch_asset_info(self, code: str) -> Optional[dict]:
+        if not is_valid_code(code):
+            return None
+
+        naver_failure = None
+        if code.isdigit():
+            data, naver_failure = await self._scrape_or_failure(code)
+            if data:
+                return data
+
+        latest_close = await self._latest_close(code)
+        if latest_close is not None:
+            return {"name": display_name(self.symbols, code), "price": latest_close}
+        if naver_failure is not None:
+            raise naver_failure
+        return None
@@ -0,0 +1,221 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Optional
+
+from ...domain.exceptions import MarketDataUnavailableException
+from ...domain.ports import AsyncMarketDataProvider, MarketDataProvider
+from ...domain.services import is_valid_code
+
+DEFAULT_MAXSIZE = 2048
+DEFAULT_PRICE_TTL = 30.0
+DEFAULT_INFO_TTL = 600.0
+DEFAULT_NEGATIVE_TTL = 300.0
+
+# Cached marker for codes no upstream source could resolve
+MISSING = object()
+
+
+class QuoteCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL.
+
+    Keys are (kind, code) tuples so a single code can be invalidated across kinds.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE, clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    if value is MISSING:
+                        self.negative_hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, code: Optional[str] = None) -> int:
+        """Drop every entry for `code`, or the whole cache when no code is given."""
+        with self._lock:
+            if code is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            keys = [k for k in self._entries if k[1] == code]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class CachedMarketDataProvider(MarketDataProvider):
+    """
+    MarketDataProvider decorator serving repeated lookups from a QuoteCache.
+
+    Codes that fail `is_valid_code` never reach upstream; codes every upstream source
+    reported as unknown are remembered as MISSING for `negative_ttl` seconds. A miss
+    caused by a failed or skipped source (MarketDataUnavailableException) is returned
+    as None but not cached, so the next lookup tries upstream again.
+    """
+
+    def __init__(
+        self,
+        inner: MarketDataProvider,
+        cache: Optional[QuoteCache] = None,
+        price_ttl: float = DEFAULT_PRICE_TTL,
+        info_ttl: float = DEFAULT_INFO_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+    ):
+        self.inner = inner
+        self.cache = cache or QuoteCache()
+        self.price_ttl = price_ttl
+        self.info_ttl = info_ttl
+        self.negative_ttl = negative_ttl
+
+    def fetch_price(self, code: str) -> Optional[float]:
+        if not is_valid_code(code):
+            return None
+        found, price = self.cache.get(("price", code))
+        if found:
+            return None if price is MISSING else price
+        try:
+            price = self.inner.fetch_price(code)
+        except MarketDataUnavailableException:
+            return None
+        if price is None:
+            self.cache.set(("price", code), MISSING, self.negative_ttl)
+        else:
+            self.cache.set(("price", code), price, self.price_ttl)
+        return price
+
+    def fetch_asset_info(self, code: str) -> Optional[dict]:
+        if not is_valid_code(code):
+            return None
+        found, info = self.cache.get(("info", code))
+        if found:
+            # Callers enrich the dict (e.g. category), so never hand out the cached object
+            return None if info is MISSING else dict(info)
+        try:
+            info = self.inner.fetch_asset_info(code)
+        except MarketDataUnavailableException:
+            return None
+        if info is None:
+            self.cache.set(("info", code), MISSING, self.negative_ttl)
+        else:
+            self.cache.set(("info", code), dict(info), self.info_ttl)
+        return info
+
+    def fetch_prices(self, codes: list[str]) -> dict[str, float]:
+        prices: dict[str, float] = {}
+        misses: list[str] = []
+        for code in dict.fromkeys(codes):
+            if not is_valid_code(code):
+                continue
+            found, price = self.cache.get(("price", code))
+            if not found:
+                misses.append(code)
+            elif price is not MISSING:
+                prices[code] = price
+        if misses:
+            fetched = self.inner.fetch_prices(misses)
+            # A code absent from a batch may just have timed out, so misses are not negatively cached
+            for code, price in fetched.items():
+                self.cache.set(("price", code), price, self.price_ttl)
+            prices.update(fetched)
+        return prices
+
+    def invalidate(self, code: Optional[str] = None) -> int:
+        return self.cache.invalidate(code)
+
+    def stats(self) -> dict[str, int]:
+        return self.cache.stats()
+
+    def close(self) -> None:
+        close = getattr(self.inner, "close", None)
+        if close:
+            close()
+
+
+class AsyncCachedMarketDataProvider(AsyncMarketDataProvider):
+    """Async counterpart of CachedMarketDataProvider; can share the same QuoteCache."""
+
+    def __init__(
+        self,
+        inner: AsyncMarketDataProvider,
+        cache: Optional[QuoteCache] = None,
+        price_ttl: float = DEFAULT_PRICE_TTL,
+        info_ttl: float = DEFAULT_INFO_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+    ):
+        self.inner = inner
+        self.cache = cache or QuoteCache()
+        self.price_ttl = price_ttl
+        self.info_ttl = info_ttl
+        self.negative_ttl = negative_ttl
+
+    async def fetch_price(self, code: str) -> Optional[float]:
+        if not is_valid_code(code):
+            return None
+        found, price = self.cache.get(("price", code))
+        if found:
+            return None if price is MISSING else price
+        try:
+            price = await self.inner.fetch_price(code)
+        except MarketDataUnavailableException:
+            return None
+        if price is None:
+            self.cache.set(("price", code), MISSING, self.negative_ttl)
+        else:
+            self.cache.set(("price", code), price, self.price_ttl)
+        return price
+
+    async def fetch_asset_info(self, code: str) -> Optional[dict]:
+        if not is_valid_code(code):
+            return None
+        found, info = self.cache.get(("info", code))
+        if found:
+            return None if info is MISSING else dict(info)
+        try:
+            info = await self.inner.fetch_asset_info(code)
+        except MarketDataUnavailableException:
+            return None
+        if info is None:
+            self.cache.set(("info", code), MISSING, self.negative_ttl)
+        else:
+            self.cache.set(("info", code), dict(info), self.info_ttl)
+        return info
@@ -0,0 +1,169 @@
+import os
+import re
+import struct
+import threading
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+import FinanceDataReader as fdr
+
+from ...domain.exceptions import MarketDataUnavailableException
+from .resilience import CircuitBreaker
+
+DEFAULT_HISTORY_DIR = Path(os.getenv("SNOWBALL_HISTORY_DIR", Path.home() / ".cache" / "snowball" / "history"))
+DEFAULT_WINDOW_DAYS = 14
+DEFAULT_REFRESH_INTERVAL = 600.0
+
+# One daily bar = (date ordinal, close) packed little-endian: 12 bytes per record
+_BAR = struct.Struct("<id")
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
+Bar = tuple[date, float]
+
+
+class PriceHistoryStore:
+    """
+    Append-only on-disk store of daily closes, one compact binary file per code.
+
+    Records are fixed-width and date-ordered, so the latest bar is a single
+    12-byte read from the end of the file.
+    """
+
+    def __init__(self, root: Path = DEFAULT_HISTORY_DIR):
+        self.root = Path(root)
+
+    def path(self, code: str) -> Path:
+        return self.root / f"{_UNSAFE_CHARS.sub('_', code)}.bin"
+
+    def read(self, code: str) -> list[Bar]:
+        try:
+            data = self.path(code).read_bytes()
+        except FileNotFoundError:
+            return []
+        return [(date.fromordinal(d), close) for d, close in _BAR.iter_unpack(data)]
+
+    def last_bar(self, code: str) -> Optional[Bar]:
+        try:
+            with open(self.path(code), "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() < _BAR.size:
+                    return None
+                f.seek(-_BAR.size, os.SEEK_END)
+                d, close = _BAR.unpack(f.read(_BAR.size))
+                return date.fromordinal(d), close
+        except FileNotFoundError:
+            return None
+
+    def append(self, code: str, bars: list[Bar]) -> int:
+        """Append bars newer than the stored tail; a bar dated on the tail replaces it."""
+        last = self.last_bar(code)
+        if last:
+            bars = [b for b in bars if b[0] >= last[0]]
+        if not bars:
+            return 0
+
+        path = self.path(code)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "r+b" if last else "wb") as f:
+            f.seek(-_BAR.size if last and bars[0][0] == last[0] else 0, os.SEEK_END)
+            f.write(b"".join(_BAR.pack(d.toordinal(), close) for d, close in bars))
+        return len(bars)
+
+    def synced_at(self, code: str) -> Optional[float]:
+        try:
+            return self.path(code).stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def touch(self, code: str) -> None:
+        path = self.path(code)
+        if path.exists():
+            path.touch()
+
+
+class PriceHistory:
+    """
+    Windowed, incrementally synced daily history backed by PriceHistoryStore.
+
+    The first sync downloads only the last `window_days`; later syncs request
+    bars from the stored tail date onward. Within `refresh_interval` seconds of
+    a sync the latest close is served straight from disk. While the FDR breaker
+    is open, syncs are skipped and the stored close is served as-is.
+    """
+
+    def __init__(
+        self,
+        store: Optional[PriceHistoryStore] = None,
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        reader: Callable[..., Any] = fdr.DataReader,
+        clock: Callable[[], float] = time.time,
+        today: Callable[[], date] = date.today,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.store = store or PriceHistoryStore()
+        self.window_days = window_days
+        self.refresh_interval = refresh_interval
+        self._reader = reader
+        self._clock = clock
+        self._today = today
+        self.breaker = breaker or CircuitBreaker("fdr")
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def latest_close(self, code: str) -> Optional[float]:
+        """
+        Latest stored close, syncing first when stale. None means FDR has no data for
+        the code; a failed or skipped sync with nothing stored raises MarketDataUnavailableException.
+        """
+        with self._lock_for(code):
+            synced_at = self.store.synced_at(code)
+            if synced_at is None or self._clock() - synced_at >= self.refresh_interval:
+                try:
+                    self._sync(code)
+                except MarketDataUnavailableException:
+                    if self.store.last_bar(code) is None:
+                        raise
+        bar = self.store.last_bar(code)
+        return bar[1] if bar else None
+
+    def sync(self, code: str) -> int:
+        with self._lock_for(code):
+            try:
+                return self._sync(code)
+            except MarketDataUnavailableException:
+                return 0
+
+    def _sync(self, code: str) -> int:
+        last = self.store.last_bar(code)
+        today = self._today()
+        # Re-request the tail date too: its close may have been intraday when stored
+        start = last[0] if last else today - timedelta(days=self.window_days)
+        if not self.breaker.allow():
+            raise MarketDataUnavailableException(f"FDR breaker open, history of {code} not synced")
+        try:
+            df = self._reader(code, start.isoformat())
+        except Exception as e:
+            self.breaker.record_failure()
+            print(f"History sync failed for {code}: {e}")
+            raise MarketDataUnavailableException(f"History sync failed for {code}") from e
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+
+        bars: list[Bar] = []
+        if df is not None and not df.empty:
+            for ts, close in df["Close"].items():
+                if close == close:  # skip NaN
+                    bars.append((ts.date(), float(close)))
+        written = self.store.append(code, bars)
+        self.store.touch(code)
+        return written
+
+    def _lock_for(self, code: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(code, threading.Lock())
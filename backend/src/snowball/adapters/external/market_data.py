@@ -1,75 +1,183 @@
-import requests
-from bs4 import BeautifulSoup
-import FinanceDataReader as fdr
-from typing import Optional
-from ...domain.ports import MarketDataProvider
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+from ...domain.exceptions import MarketDataUnavailableException
+from ...domain.ports import MarketDataProvider, SymbolMaster
+from ...domain.services import is_valid_code
+from .history import PriceHistory
+from .naver import naver_item_url, parse_naver_quote
+from .resilience import UpstreamGuard, naver_guard
+from .symbols import LocalSymbolMaster, display_name
+from .transport import HttpTransport
+
+DEFAULT_BATCH_WORKERS = 8
+DEFAULT_BATCH_TIMEOUT = 60.0
+# 사용자가 응답을 기다리는 요청(리밸런싱 등)용: 늦은 종목은 저장된 시세로 대신한다
+INTERACTIVE_BATCH_TIMEOUT = 5.0
+
+def source_of(code: str) -> str:
+    # 숫자 6자리 = KRX (Naver), 그 외 = 해외 (FDR 히스토리)
+    return "krx" if code.isdigit() else "overseas"
 
 class RealMarketDataProvider(MarketDataProvider):
+    def __init__(
+        self,
+        transport: Optional[HttpTransport] = None,
+        history: Optional[PriceHistory] = None,
+        naver: Optional[UpstreamGuard] = None,
+        symbols: Optional[SymbolMaster] = None,
+        max_workers: int = DEFAULT_BATCH_WORKERS,
+        batch_timeout: Optional[float] = DEFAULT_BATCH_TIMEOUT,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        # Provider owns its connection pool unless one is shared in
+        self._owns_transport = transport is None
+        self.transport = transport or HttpTransport()
+        self.history = history or PriceHistory()
+        self.naver = naver or naver_guard()
+        self.symbols = symbols or LocalSymbolMaster()
+        self.max_workers = max_workers
+        self.batch_timeout = batch_timeout
+
+    def close(self) -> None:
+        if self._owns_transport:
+            self.transport.close()
+
     def scrape_naver_finance(self, code: str) -> Optional[dict]:
         """
         Scrape Name and Price from Naver Finance for KRX stocks.
+        Returns None without a request while Naver's breaker is open or its rate budget is spent.
         """
         try:
-            url = f"https://finance.naver.com/item/main.naver?code={code}"
-            headers = {"User-Agent": "Mozilla/5.0"}
-            res = requests.get(url, headers=headers)
-            if res.status_code != 200:
-                return None
-                
-            soup = BeautifulSoup(res.text, "lxml")
-            
-            # 1. Get Name
-            name_tag = soup.select_one(".wrap_company h2 a")
-            name = name_tag.text.strip() if name_tag else None
-            
-            # 2. Get Price
-            price_tag = soup.select_one(".no_today .blind")
-            price_str = price_tag.text.replace(",", "").strip() if price_tag else "0"
-            price = float(price_str)
-            
-            if name and price > 0:
-                return {"name": name, "price": price}
+            return self._scrape_naver(code)
+        except MarketDataUnavailableException:
             return None
+
+    def _scrape_naver(self, code: str) -> Optional[dict]:
+        # None: Naver answered without a quote. Raises when Naver could not answer at all
+        delay = self.naver.admit()
+        if delay is None:
+            raise MarketDataUnavailableException("Naver skipped: breaker open or rate limited")
+
+        try:
+            if delay:
+                time.sleep(delay)
+            res = self.transport.get(naver_item_url(code))
         except Exception as e:
+            self.naver.record_failure()
             print(f"Naver scraping failed: {e}")
+            raise MarketDataUnavailableException(f"Naver request failed for {code}") from e
+        except BaseException:
+            # 중단된 호출은 성공도 실패도 아니다: half-open 탐침 슬롯만 반납
+            self.naver.release()
+            raise
+
+        self.naver.record_response(res.status_code)
+        if res.status_code == 429 or res.status_code >= 500:
+            raise MarketDataUnavailableException(f"Naver answered {res.status_code} for {code}")
+        if res.status_code != 200:
             return None
+        try:
+            return parse_naver_quote(res.text)
+        except Exception as e:
+            print(f"Naver parsing failed: {e}")
+            raise MarketDataUnavailableException(f"Naver page for {code} could not be parsed") from e
+
+    def _scrape_or_failure(self, code: str) -> tuple[Optional[dict], Optional[MarketDataUnavailableException]]:
+        try:
+            return self._scrape_naver(code), None
+        except MarketDataUnavailableException as e:
+            return None, e
+
+    def _latest_close(self, code: str) -> Optional[float]:
+        try:
+            return self.history.latest_close(code)
+        except MarketDataUnavailableException:
+            raise
+        except Exception as e:
+            print(f"Failed to fetch price for {code}: {e}")
+            raise MarketDataUnavailableException(f"History lookup failed for {code}") from e
 
     def fetch_price(self, code: str) -> Optional[float]:
-        if not code:
+        if not is_valid_code(code):
             return None
 
         # 국내주식(숫자코드): Naver Finance에서 실시간 현재가 조회
+        naver_failure = None
         if code.isdigit():
-            data = self.scrape_naver_finance(code)
+            data, naver_failure = self._scrape_or_failure(code)
             if data and data.get('price'):
                 return data['price']
 
-        # 해외주식: FinanceDataReader (종가)
+        # 해외주식: FinanceDataReader 종가 (로컬 히스토리에 증분 저장)
+        price = self._latest_close(code)
+        # 모든 소스가 확실히 없다고 답했을 때만 None: Naver 장애는 "없음"이 아니다
+        if price is None and naver_failure is not None:
+            raise naver_failure
+        return price
+
+    def fetch_prices(self, codes: List[str]) -> Dict[str, float]:
+        """
+        Fetch many prices on one bounded worker pool per source.
+
+        KRX and overseas codes hit different upstreams, so a throttled or tripped
+        Naver never starves the overseas group. Codes still pending after
+        `batch_timeout` seconds are left out of the result instead of holding it up.
+        """
+        groups: Dict[str, List[str]] = defaultdict(list)
+        for code in dict.fromkeys(codes):
+            if is_valid_code(code):
+                groups[source_of(code)].append(code)
+
+        pools = []
+        futures = {}
+        for source, group in groups.items():
+            pool = ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(group)), thread_name_prefix=f"prices-{source}"
+            )
+            pools.append(pool)
+            for code in group:
+                futures[pool.submit(self.fetch_price, code)] = code
+
         try:
-            df = fdr.DataReader(code)
-            if df is None or df.empty:
-                return None
-            latest_close = df.iloc[-1]['Close']
-            return float(latest_close)
-        except Exception as e:
-            print(f"Failed to fetch price for {code}: {e}")
-            return None
+            done, pending = wait(futures, timeout=self.batch_timeout)
+        finally:
+            # 늦은 종목은 기다리지 않음: 대기 중인 작업은 취소, 실행 중인 작업은 백그라운드에서 종료
+            for pool in pools:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        prices: Dict[str, float] = {}
+        for future in done:
+            code = futures[future]
+            try:
+                price = future.result()
+            except Exception as e:
+                print(f"Failed to fetch price for {code}: {e}")
+                continue
+            if price is not None:
+                prices[code] = price
+        if pending:
+            print(f"Price fetch timed out for {len(pending)} codes: {sorted(futures[f] for f in pending)}")
+        return prices
 
     def fetch_asset_info(self, code: str) -> Optional[dict]:
+        if not is_valid_code(code):
+            return None
+
         # Strategy 1: If numeric, try Naver Finance (KRX)
+        naver_failure = None
         if code.isdigit():
-            data = self.scrape_naver_finance(code)
-            if data: 
+            data, naver_failure = self._scrape_or_failure(code)
+            if data:
                 return data
-            
+
         # Strategy 2: Use FinanceDataReader (US/KRX Fallback)
-        try:
-            df = fdr.DataReader(code)
-            if df is not None and not df.empty:
-                latest_close = float(df.iloc[-1]['Close'])
-                name = code.upper() # FDR doesn't return name easily
-                return {"name": name, "price": latest_close}
-        except:
-            pass
-            
+        latest_close = self._latest_close(code)
+        if latest_close is not None:
+            # FDR doesn't return names; resolve from the local symbol master
+            return {"name": display_name(self.symbols, code), "price": latest_close}
+        if naver_failure is not None:
+            raise naver_failure
         return None
@@ -0,0 +1,66 @@
+from typing import Optional
+
+from lxml import etree
+
+NAVER_ITEM_URL = "https://finance.naver.com/item/main.naver?code={code}"
+
+# Naver item pages are ~200KB; the quote block sits in the first third
+_CHUNK_SIZE = 16 * 1024
+
+# Flags tracked while walking the tree: inside .wrap_company, inside its h2, inside .no_today
+_COMPANY, _H2, _TODAY = 1, 2, 4
+
+
+def naver_item_url(code: str) -> str:
+    return NAVER_ITEM_URL.format(code=code)
+
+
+def parse_naver_quote(html: str) -> Optional[dict]:
+    """
+    Extract name (`.wrap_company h2 a`) and price (`.no_today .blind`) from a Naver item page.
+
+    Streams the page through lxml's pull parser and stops feeding as soon as both
+    values are seen, so the rest of the document is never parsed. Finished
+    elements are cleared to keep memory flat.
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    stack: list[int] = []
+    state = 0
+    name: Optional[str] = None
+    price_text: Optional[str] = None
+
+    for offset in range(0, len(html), _CHUNK_SIZE):
+        parser.feed(html[offset:offset + _CHUNK_SIZE])
+        for event, el in parser.read_events():
+            if event == "start":
+                stack.append(state)
+                classes = (el.get("class") or "").split()
+                if "wrap_company" in classes:
+                    state |= _COMPANY
+                elif el.tag == "h2" and state & _COMPANY:
+                    state |= _H2
+                elif "no_today" in classes:
+                    state |= _TODAY
+                continue
+
+            if name is None and el.tag == "a" and state & _H2:
+                name = "".join(el.itertext()).strip() or None
+            elif price_text is None and state & _TODAY and "blind" in (el.get("class") or "").split():
+                price_text = "".join(el.itertext())
+            state = stack.pop() if stack else 0
+            el.clear(keep_tail=True)
+
+            if name and price_text is not None:
+                return _quote(name, price_text)
+
+    return None
+
+
+def _quote(name: str, price_text: str) -> Optional[dict]:
+    try:
+        price = float(price_text.replace(",", "").strip())
+    except ValueError:
+        return None
+    if price > 0:
+        return {"name": name, "price": price}
+    return None
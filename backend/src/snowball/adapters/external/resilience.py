@@ -0,0 +1,173 @@
+import threading
+import time
+from collections.abc import Callable
+from enum import Enum
+from typing import Any, Optional
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker.
+
+    CLOSED: calls pass; `failure_threshold` consecutive failures open the circuit.
+    OPEN: calls are refused until `reset_timeout` elapses.
+    HALF_OPEN: up to `half_open_max_calls` probes pass; a success closes the
+    circuit, a failure re-opens it. A probe that ends without either (cancelled,
+    interrupted, never sent) must hand its slot back with `release()`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state is BreakerState.CLOSED:
+                return True
+            if state is BreakerState.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self) -> None:
+        """Return a half-open probe slot whose call ended without a recorded outcome."""
+        with self._lock:
+            if self._state is BreakerState.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = BreakerState.CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            if state is BreakerState.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = BreakerState.OPEN
+                self._opened_at = self._clock()
+                self._probes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self._current_state().value,
+                "consecutive_failures": self._failures,
+                "rejected": self.rejected,
+            }
+
+    def _current_state(self) -> BreakerState:
+        if self._state is BreakerState.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = BreakerState.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter (`rate` tokens/sec, bursts up to `capacity`).
+
+    `reserve` hands out a token now and tells the caller how long to wait
+    before using it, so sync callers can `time.sleep` and async callers can
+    `asyncio.sleep` on the same bucket.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = clock()
+        self.throttled = 0
+
+    def reserve(self, max_wait: float = 0.0) -> Optional[float]:
+        """Reserve one token; return the delay before it may be used, or None if that exceeds max_wait."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            delay = max(0.0, (1 - self._tokens) / self.rate)
+            if delay > max_wait:
+                self.throttled += 1
+                return None
+            self._tokens -= 1
+            return delay
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {"rate": self.rate, "capacity": self.capacity, "throttled": self.throttled}
+
+
+class UpstreamGuard:
+    """Rate limiter + circuit breaker pair guarding one upstream host."""
+
+    def __init__(self, breaker: CircuitBreaker, limiter: TokenBucket, max_wait: float = 2.0):
+        self.breaker = breaker
+        self.limiter = limiter
+        self.max_wait = max_wait
+
+    def admit(self) -> Optional[float]:
+        """
+        Return the delay to wait before calling upstream, or None to skip it (go to fallback).
+        The breaker is asked first so calls it refuses never spend rate-limit tokens.
+        """
+        if not self.breaker.allow():
+            return None
+        delay = self.limiter.reserve(self.max_wait)
+        if delay is None:
+            self.breaker.release()
+            return None
+        return delay
+
+    def record_response(self, status_code: int) -> None:
+        # Throttling and server errors count against the upstream; other statuses mean it is alive
+        if status_code == 429 or status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def record_failure(self) -> None:
+        self.breaker.record_failure()
+
+    def release(self) -> None:
+        self.breaker.release()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {**self.breaker.snapshot(), "rate_limit": self.limiter.snapshot()}
+
+
+def naver_guard() -> UpstreamGuard:
+    return UpstreamGuard(CircuitBreaker("naver"), TokenBucket(rate=10.0, capacity=20.0))
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Optional
+
+from ...domain.ports import AsyncMarketDataProvider, MarketDataProvider
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key into one execution.
+
+    The first caller runs `fn`; callers arriving while it is in flight wait
+    and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+            }
+
+
+class SingleFlightMarketDataProvider(MarketDataProvider):
+    """MarketDataProvider decorator sharing one in-flight upstream fetch per code."""
+
+    def __init__(self, inner: MarketDataProvider, flights: Optional[SingleFlight] = None):
+        self.inner = inner
+        self.flights = flights or SingleFlight()
+
+    def fetch_price(self, code: str) -> Optional[float]:
+        return self.flights.do(("price", code), lambda: self.inner.fetch_price(code))
+
+    def fetch_asset_info(self, code: str) -> Optional[dict]:
+        info = self.flights.do(("info", code), lambda: self.inner.fetch_asset_info(code))
+        # Every waiter gets the same object; hand each caller its own copy
+        return dict(info) if info is not None else None
+
+    def fetch_prices(self, codes: list[str]) -> dict[str, float]:
+        # Batches already fetch each code once; pass straight through to the source's own pool
+        return self.inner.fetch_prices(codes)
+
+    def stats(self) -> dict[str, int]:
+        return self.flights.stats()
+
+    def close(self) -> None:
+        close = getattr(self.inner, "close", None)
+        if close:
+            close()
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines running on one event loop."""
+
+    def __init__(self):
+        self._futures: dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._futures.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # shield: a cancelled waiter must not cancel the shared fetch
+            return await asyncio.shield(future)
+
+        future = self._futures[key] = asyncio.get_running_loop().create_future()
+        self.executions += 1
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody was waiting
+            raise
+        finally:
+            del self._futures[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._futures),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
+
+
+class AsyncSingleFlightMarketDataProvider(AsyncMarketDataProvider):
+    def __init__(self, inner: AsyncMarketDataProvider, flights: Optional[AsyncSingleFlight] = None):
+        self.inner = inner
+        self.flights = flights or AsyncSingleFlight()
+
+    async def fetch_price(self, code: str) -> Optional[float]:
+        return await self.flights.do(("price", code), lambda: self.inner.fetch_price(code))
+
+    async def fetch_asset_info(self, code: str) -> Optional[dict]:
+        info = await self.flights.do(("info", code), lambda: self.inner.fetch_asset_info(code))
+        return dict(info) if info is not None else None
+
+    def stats(self) -> dict[str, int]:
+        return self.flights.stats()
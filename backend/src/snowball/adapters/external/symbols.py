@@ -0,0 +1,261 @@
+import csv
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+import FinanceDataReader as fdr
+
+from ...domain.entities import Symbol
+from ...domain.ports import SymbolMaster
+
+DEFAULT_SYMBOLS_PATH = Path(os.getenv("SNOWBALL_SYMBOLS_PATH", Path.home() / ".cache" / "snowball" / "symbols.tsv"))
+DEFAULT_LISTINGS = ("KRX", "ETF/KR", "NASDAQ", "NYSE", "AMEX")
+DEFAULT_REFRESH_INTERVAL = 24 * 3600.0
+DEFAULT_RELOAD_CHECK = 60.0
+DEFAULT_REFRESH_RETRY = 3600.0
+DEFAULT_SEARCH_LIMIT = 10
+
+# Match ranks, searched in order: code prefix, full-name prefix, prefix of a later word in the name
+_CODE, _NAME, _WORD = range(3)
+
+
+def _normalize(text: str) -> str:
+    # 대소문자/공백 무시: "kodex 200" == "KODEX200"
+    return "".join(text.split()).casefold()
+
+
+def display_name(symbols: SymbolMaster, code: str) -> str:
+    """Listed name for `code`, or the upper-cased code when it is not in the master."""
+    symbol = symbols.resolve(code)
+    return symbol.name if symbol else code.upper()
+
+
+class SymbolSnapshot:
+    """On-disk listing snapshot: one `code<TAB>name<TAB>market` row per symbol."""
+
+    def __init__(self, path: Path = DEFAULT_SYMBOLS_PATH):
+        self.path = Path(path)
+
+    def read(self) -> list[Symbol]:
+        try:
+            with open(self.path, newline="", encoding="utf-8") as f:
+                return [Symbol(*row) for row in csv.reader(f, delimiter="\t") if len(row) == 3]
+        except FileNotFoundError:
+            return []
+
+    def write(self, symbols: Iterable[Symbol]) -> None:
+        # Write-then-rename so readers in other processes never see a half-written file
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, delimiter="\t")
+            writer.writerows((s.code, s.name, s.market) for s in symbols)
+        os.replace(tmp, self.path)
+
+    def modified_at(self) -> Optional[float]:
+        try:
+            return self.path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+
+class SymbolIndex:
+    """
+    Immutable in-memory prefix index over symbol codes and names.
+
+    Each match rank keeps its keys in one sorted array, so a prefix query is a
+    binary search plus a forward scan that stops after `limit` hits:
+    O(log n + limit) regardless of how many symbols share the prefix.
+    """
+
+    def __init__(self, symbols: Iterable[Symbol] = ()):
+        self._by_code: dict[str, Symbol] = {}
+        entries: list[list[tuple[str, Symbol]]] = [[], [], []]
+        for symbol in symbols:
+            self._by_code.setdefault(symbol.code.upper(), symbol)
+            entries[_CODE].append((_normalize(symbol.code), symbol))
+            entries[_NAME].append((_normalize(symbol.name), symbol))
+            for word in symbol.name.split()[1:]:
+                entries[_WORD].append((_normalize(word), symbol))
+
+        self._keys: list[list[str]] = []
+        self._symbols: list[list[Symbol]] = []
+        for rank in entries:
+            rank.sort(key=lambda e: e[0])
+            self._keys.append([key for key, _ in rank])
+            self._symbols.append([symbol for _, symbol in rank])
+
+    def __len__(self) -> int:
+        return len(self._by_code)
+
+    def resolve(self, code: str) -> Optional[Symbol]:
+        return self._by_code.get(code.upper())
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> list[Symbol]:
+        prefix = _normalize(query)
+        if not prefix or limit < 1:
+            return []
+
+        results: list[Symbol] = []
+        seen: set[str] = set()
+        for keys, symbols in zip(self._keys, self._symbols):
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and keys[i].startswith(prefix):
+                symbol = symbols[i]
+                if symbol.code not in seen:
+                    seen.add(symbol.code)
+                    results.append(symbol)
+                    if len(results) == limit:
+                        return results
+                i += 1
+        return results
+
+
+def _spawn_daemon(fn: Callable[[], None]) -> None:
+    threading.Thread(target=fn, name="symbol-reload", daemon=True).start()
+
+
+class LocalSymbolMaster(SymbolMaster):
+    """
+    Symbol master served from a local listing snapshot.
+
+    `refresh` downloads the listings (FinanceDataReader `StockListing`) into the
+    snapshot (`manage.py refresh-symbols`). Serving processes rebuild their index
+    when the snapshot's mtime changes, checking at most every `reload_check`
+    seconds, so lookups never touch the network. A due rebuild runs on a
+    background thread (`spawn`) and swaps the new index in as a whole; lookups
+    keep answering from the current index meanwhile, so they never read the file
+    or block an event loop. With `auto_refresh`, that background check also
+    downloads a snapshot older than `refresh_interval` (retrying a failed
+    download after `refresh_retry` seconds), so no external cron is needed.
+
+    Nothing is read until the first lookup (or an explicit `reload`), so
+    processes that never resolve symbols pay nothing for holding one.
+    """
+
+    def __init__(
+        self,
+        snapshot: Optional[SymbolSnapshot] = None,
+        listings: tuple[str, ...] = DEFAULT_LISTINGS,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        reload_check: float = DEFAULT_RELOAD_CHECK,
+        loader: Callable[[str], Any] = fdr.StockListing,
+        clock: Callable[[], float] = time.time,
+        spawn: Optional[Callable[[Callable[[], None]], None]] = None,
+        auto_refresh: bool = False,
+        refresh_retry: float = DEFAULT_REFRESH_RETRY,
+    ):
+        self.snapshot = snapshot or SymbolSnapshot()
+        self.listings = listings
+        self.refresh_interval = refresh_interval
+        self.reload_check = reload_check
+        self._loader = loader
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._index = SymbolIndex()
+        self._loaded_mtime: Optional[float] = None
+        self._checked_at = -math.inf
+        self._spawn = spawn or _spawn_daemon
+        self._reloading = False
+        self._reload_guard = threading.Lock()
+        self.auto_refresh = auto_refresh
+        self.refresh_retry = refresh_retry
+        self._refresh_attempted_at = -math.inf
+
+    def resolve(self, code: str) -> Optional[Symbol]:
+        return self._current().resolve(code)
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> list[Symbol]:
+        return self._current().search(query, limit)
+
+    def reload(self) -> int:
+        """Rebuild the index from the snapshot and swap it in."""
+        with self._lock:
+            self._checked_at = self._clock()
+            mtime = self.snapshot.modified_at()
+            if mtime is not None and mtime != self._loaded_mtime:
+                self._index = SymbolIndex(self.snapshot.read())
+                self._loaded_mtime = mtime
+            return len(self._index)
+
+    def is_stale(self) -> bool:
+        mtime = self.snapshot.modified_at()
+        return mtime is None or self._clock() - mtime >= self.refresh_interval
+
+    def refresh(self) -> int:
+        """
+        Download every listing into the snapshot and reload it.
+        A listing that fails to download keeps its rows from the previous snapshot.
+        """
+        previous: dict[str, list[Symbol]] = {}
+        for symbol in self.snapshot.read():
+            previous.setdefault(symbol.market, []).append(symbol)
+
+        symbols: list[Symbol] = []
+        for market in self.listings:
+            try:
+                symbols.extend(self._download(market))
+            except Exception as e:
+                print(f"Symbol listing download failed for {market}: {e}")
+                symbols.extend(previous.get(market, []))
+
+        if symbols:
+            self.snapshot.write(symbols)
+        return self.reload()
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self._index), "snapshot_mtime": self._loaded_mtime, "stale": self.is_stale()}
+
+    def _current(self) -> SymbolIndex:
+        if self._checked_at == -math.inf:
+            # 첫 조회에서만 동기로 읽는다: 이후 재적재/갱신은 백그라운드
+            self.reload()
+            if self.auto_refresh and self.is_stale():
+                self._reload_in_background()
+        elif self._clock() - self._checked_at >= self.reload_check:
+            self._reload_in_background()
+        return self._index
+
+    def _reload_in_background(self) -> None:
+        with self._reload_guard:
+            if self._reloading:
+                return
+            self._reloading = True
+            # 재확인은 다음 주기까지 미룬다: 조회마다 재시작되지 않도록
+            self._checked_at = self._clock()
+        self._spawn(self._background_reload)
+
+    def _background_reload(self) -> None:
+        try:
+            if self._refresh_due():
+                self._refresh_attempted_at = self._clock()
+                self.refresh()
+            else:
+                self.reload()
+        except Exception as e:
+            print(f"Symbol index reload failed: {e}")
+        finally:
+            with self._reload_guard:
+                self._reloading = False
+
+    def _refresh_due(self) -> bool:
+        return (
+            self.auto_refresh
+            and self.is_stale()
+            and self._clock() - self._refresh_attempted_at >= self.refresh_retry
+        )
+
+    def _download(self, market: str) -> list[Symbol]:
+        df = self._loader(market)
+        # KRX 상장목록은 'Code', 그 외(해외, ETF)는 'Symbol' 컬럼
+        code_col = "Code" if "Code" in df.columns else "Symbol"
+        symbols = []
+        for code, name in zip(df[code_col], df["Name"]):
+            if isinstance(code, str) and isinstance(name, str) and code.strip() and name.strip():
+                symbols.append(Symbol(code=code.strip(), name=" ".join(name.split()), market=market))
+        return symbols
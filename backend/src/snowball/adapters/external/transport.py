@@ -0,0 +1,64 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpTransport:
+    """
+    Keep-alive connection pool shared by every upstream quote lookup.
+
+    - pool_maxsize: connections kept per host (pool_block caps concurrent sockets at that limit)
+    - connect_timeout / read_timeout: applied to every request unless overridden
+    - max_retries: idempotent GET retries on connect/read errors and 429/5xx,
+      with exponential backoff plus random jitter so callers don't retry in lockstep
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        max_retries: int = 2,
+        backoff_factor: float = 0.3,
+        backoff_jitter: float = 0.5,
+        headers: dict[str, str] | None = None,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "HttpTransport":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
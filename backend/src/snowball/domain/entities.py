@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, NewType
+from enum import Enum
+from typing import List, Optional, NewType, Sequence
 from datetime import datetime
 from uuid import UUID, uuid4
 
@@ -28,6 +29,13 @@ class Asset:
     current_price: float = 0.0
     avg_price: float = 0.0
     quantity: float = 0.0
+    version: int = 1
+
+@dataclass(frozen=True)
+class Symbol:
+    code: str
+    name: str
+    market: str
 
 @dataclass
 class Account:
@@ -36,6 +44,19 @@ class Account:
     cash: float = 0.0
     id: Optional[int] = None
     assets: List[Asset] = field(default_factory=list)
+    version: int = 1
+
+@dataclass(frozen=True)
+class TradeLeg:
+    asset_id: int
+    action_quantity: int  # > 0 BUY, < 0 SELL
+    price: float
+
+class CalculationMode(str, Enum):
+    # 자산별로 int(diff / price): 현금 한도와 반올림 잔여를 고려하지 않는다
+    PER_ASSET = "per_asset"
+    # 현금 한도 안에서 목표 비중 오차를 최소화하는 정수 주식 거래
+    OPTIMIZED = "optimized"
 
 @dataclass
 class AssetCalculationResult:
@@ -57,4 +78,12 @@ class PortfolioCalculationResult:
     total_invested_value: float
     total_pl_amount: float
     total_pl_rate: float
-    assets: List[AssetCalculationResult]
+    assets: Sequence[AssetCalculationResult]
+
+@dataclass
+class PriceUpdateResult:
+    updated_count: int
+    code_count: int
+    failed_codes: List[str]
+    fetch_seconds: float
+    total_seconds: float
@@ -4,8 +4,26 @@ class DomainException(Exception):
 class EntityNotFoundException(DomainException):
     pass
 
+class PermissionDeniedException(DomainException):
+    pass
+
 class InsufficientFundsException(DomainException):
     pass
 
 class InvalidActionException(DomainException):
     pass
+
+class InvalidAssetCodeException(DomainException):
+    pass
+
+class MarketDataUnavailableException(DomainException):
+    """An upstream quote source failed or was skipped (timeout, open breaker, rate limit); the code may still exist."""
+    pass
+
+class ConcurrencyConflictException(DomainException):
+    """A concurrent transaction got in the way; the operation may succeed if retried."""
+    pass
+
+class VersionConflictException(ConcurrencyConflictException):
+    """The row changed since it was read: its version no longer matches the one being saved."""
+    pass
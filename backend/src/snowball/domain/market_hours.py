@@ -0,0 +1,42 @@
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+@dataclass(frozen=True)
+class MarketHours:
+    """
+    Regular trading session of one exchange, in its local time zone.
+    Exchange holidays are not modelled: a holiday looks like an ordinary weekday.
+    """
+    name: str
+    tz: str
+    opens: time
+    closes: time
+    weekdays: frozenset = field(default_factory=lambda: frozenset(range(5)))  # Mon-Fri
+
+    def is_open(self, now: datetime, grace: timedelta = timedelta(0)) -> bool:
+        """True between the open and `grace` after the close (to catch closing prices)."""
+        local = now.astimezone(ZoneInfo(self.tz))
+        if local.weekday() not in self.weekdays:
+            return False
+        opens = datetime.combine(local.date(), self.opens, local.tzinfo)
+        closes = datetime.combine(local.date(), self.closes, local.tzinfo) + grace
+        return opens <= local < closes
+
+    def next_open(self, now: datetime) -> datetime:
+        local = now.astimezone(ZoneInfo(self.tz))
+        for days in range(8):
+            day = local.date() + timedelta(days=days)
+            if day.weekday() not in self.weekdays:
+                continue
+            opens = datetime.combine(day, self.opens, local.tzinfo)
+            if opens > local:
+                return opens
+        raise ValueError(f"{self.name} has no trading days")
+
+KRX_HOURS = MarketHours("KRX", "Asia/Seoul", time(9, 0), time(15, 30))
+US_HOURS = MarketHours("US", "America/New_York", time(9, 30), time(16, 0))
+
+def market_of(code: str) -> str:
+    """Exchange a ticker trades on: 6-digit numeric codes are KRX, everything else is treated as US."""
+    return KRX_HOURS.name if code.isdigit() else US_HOURS.name
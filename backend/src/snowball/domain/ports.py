@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from .entities import Account, Asset, User, UserId
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from .entities import Account, Asset, Symbol, User, UserId
 
 class AuthRepository(ABC):
     @abstractmethod
@@ -17,15 +18,24 @@ class AuthRepository(ABC):
 
 class AccountRepository(ABC):
     @abstractmethod
-    def get(self, account_id: int) -> Optional[Account]:
+    def get(self, account_id: int, with_assets: bool = True) -> Optional[Account]:
+        """`with_assets=False` loads account fields only; `assets` is left empty."""
         pass
 
     @abstractmethod
-    def list_all(self) -> List[Account]:
+    def get_account_for_user(self, account_id: int, user_id: UserId, with_assets: bool = True) -> Account:
+        """
+        Fetch an account the user owns, in one query.
+        Raises EntityNotFoundException if it does not exist, PermissionDeniedException if another user owns it.
+        """
         pass
 
     @abstractmethod
-    def list_by_user(self, user_id: UserId) -> List[Account]:
+    def list_all(self, with_assets: bool = True) -> List[Account]:
+        pass
+
+    @abstractmethod
+    def list_by_user(self, user_id: UserId, with_assets: bool = True) -> List[Account]:
         pass
 
     @abstractmethod
@@ -36,11 +46,28 @@ class AccountRepository(ABC):
     def delete(self, account_id: int) -> None:
         pass
 
+    @abstractmethod
+    def adjust_cash(self, account_id: int, amount: float) -> Optional[float]:
+        """
+        Atomically add `amount` (negative to withdraw) to the balance unless it would go
+        below zero. Returns the new balance, or None when the condition failed.
+        Runs in the caller's transaction; does not commit.
+        """
+        pass
+
 class AssetRepository(ABC):
     @abstractmethod
     def get(self, asset_id: int) -> Optional[Asset]:
         pass
 
+    @abstractmethod
+    def get_asset_for_user(self, asset_id: int, user_id: UserId) -> Asset:
+        """
+        Fetch an asset together with its account's owner, in one joined query.
+        Raises EntityNotFoundException if it does not exist, PermissionDeniedException if another user owns it.
+        """
+        pass
+
     @abstractmethod
     def save(self, asset: Asset) -> Asset:
         pass
@@ -53,13 +80,115 @@ class AssetRepository(ABC):
     def list_by_account(self, account_id: int) -> List[Asset]:
         pass
 
+    @abstractmethod
+    def apply_trade(self, asset_id: int, quantity: float, price: float) -> Optional[Asset]:
+        """
+        Atomically add `quantity` (negative to sell) to the holding, re-averaging
+        avg_price on buys and setting current_price to the execution price, unless
+        the holding would go negative. Returns the updated asset, or None when the
+        condition failed. Runs in the caller's transaction; does not commit.
+        """
+        pass
+
+    @abstractmethod
+    def set_current_prices(self, prices: Dict[int, float]) -> None:
+        """
+        Set current_price of each asset by id. Unlike update_prices, touches only
+        these assets and no quote rows. Runs in the caller's transaction; does not commit.
+        """
+        pass
+
+    @abstractmethod
+    def list_all_with_code(self) -> List[Asset]:
+        """Return every asset (across all users) that has a ticker code. Batch use only."""
+        pass
+
+    @abstractmethod
+    def iter_all_with_code(self, chunk_size: int = 1000) -> Iterator[Asset]:
+        """Stream every coded asset, fetching `chunk_size` rows at a time. Batch use only."""
+        pass
+
+    @abstractmethod
+    def iter_ids_and_codes(self, chunk_size: int = 1000) -> Iterator[Tuple[int, str]]:
+        """Stream only (id, code) of every coded asset, `chunk_size` rows at a time. Batch use only."""
+        pass
+
+    @abstractmethod
+    def update_prices(self, prices: Dict[str, float], updated_at: Optional[datetime] = None) -> int:
+        """
+        Set current_price on every asset holding each code and record each code's
+        price_updated_at, in a single transaction.
+        Returns the number of asset rows updated. Batch use only.
+        """
+        pass
+
+    @abstractmethod
+    def record_attempts(self, codes: List[str], attempted_at: Optional[datetime] = None) -> None:
+        """Record `attempted_at` as the last refresh attempt of each code, in a single transaction. Batch use only."""
+        pass
+
+    @abstractmethod
+    def list_stale_codes(self, stale_before: datetime, limit: Optional[int] = None) -> List[str]:
+        """
+        Codes held by any asset whose price was never refreshed or last refreshed
+        before `stale_before`, highest total market value held first. Codes already
+        attempted since `stale_before` (i.e. whose refresh failed) come last. Batch use only.
+        """
+        pass
+
+class UnitOfWork(ABC):
+    """One database transaction over the account and asset repositories."""
+    accounts: AccountRepository
+    assets: AssetRepository
+
+    @abstractmethod
+    def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    def rollback(self) -> None:
+        pass
+
 class MarketDataProvider(ABC):
     @abstractmethod
     def fetch_price(self, code: str) -> Optional[float]:
-        """Fetch current price for a given ticker code."""
+        """
+        Fetch current price for a given ticker code.
+        None means the code is unknown; MarketDataUnavailableException means no source could answer.
+        """
         pass
 
     @abstractmethod
     def fetch_asset_info(self, code: str) -> Optional[dict]:
-        """Fetch name, price, and category for a given code."""
+        """Fetch name, price, and category for a given code. Same None / exception contract as fetch_price."""
+        pass
+
+    @abstractmethod
+    def fetch_prices(self, codes: List[str]) -> Dict[str, float]:
+        """
+        Fetch current prices for many codes at once.
+        Returns partial results: codes that fail or time out are simply absent.
+        """
+        pass
+
+class AsyncMarketDataProvider(ABC):
+    @abstractmethod
+    async def fetch_price(self, code: str) -> Optional[float]:
+        """Async fetch_price: same None / MarketDataUnavailableException contract, without blocking the loop."""
+        pass
+
+    @abstractmethod
+    async def fetch_asset_info(self, code: str) -> Optional[dict]:
+        """Async fetch_asset_info: same None / MarketDataUnavailableException contract, without blocking the loop."""
+        pass
+
+class SymbolMaster(ABC):
+    @abstractmethod
+    def resolve(self, code: str) -> Optional[Symbol]:
+        """Look up a listed symbol by its exact code."""
+        pass
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 10) -> List[Symbol]:
+        """Typeahead search: symbols whose code, name or a word of the name starts with `query`."""
         pass
@@ -0,0 +1,185 @@
+import heapq
+import math
+from typing import Dict, List, Sequence
+
+# 교환 한 번에 나눠 팔 수 있는 최대 종목 수
+SELLERS_PER_EXCHANGE = 8
+
+
+def _water_level(targets: Sequence[float], budget: float) -> float:
+    """
+    Smallest s >= 0 with sum(max(t - s, 0)) <= budget: the common amount by which
+    every target is lowered when the budget cannot cover all of them.
+    """
+    if sum(targets) <= budget:
+        return 0.0
+    ordered = sorted(targets, reverse=True)
+    prefix = 0.0
+    for k, t in enumerate(ordered, start=1):
+        prefix += t
+        level = (prefix - budget) / k
+        if k == len(ordered) or level >= ordered[k]:
+            return level
+    return ordered[0]
+
+
+def solve_whole_share_trades(
+    prices: Sequence[float],
+    quantities: Sequence[float],
+    target_values: Sequence[float],
+    cash: float,
+    min_trade_value: float = 0.0,
+) -> List[int]:
+    """
+    Whole-share trade per asset that brings holdings close to `target_values`
+    (least squares on value) without spending more than `cash` plus sale proceeds.
+
+    1. Assets without a price, or whose whole gap to target is below
+       `min_trade_value`, are left alone.
+    2. The remaining targets are lowered by a common level if the budget cannot
+       cover them. Each holding is then rounded to whole shares of its target:
+       down for buys, to the nearest share for sells (a fractional remainder of
+       a holding is kept as is). If that overspends, the sells that cost the
+       least per unit of cash go back to rounding down.
+    3. At most 2n exchange rounds, each taking the asset whose next share
+       lowers the error most per unit of cash. It is bought with leftover cash,
+       or by selling the assets whose sale raises the error least per unit of
+       cash (looking at up to `SELLERS_PER_EXCHANGE` of them, and at selling
+       just one of them), if that lowers the error overall.
+    4. Trades still below `min_trade_value` are dropped where cash allows.
+
+    Marginal gains sit in heaps, and a round makes a bounded number of O(log n)
+    heap updates, so the cost is O(n log n). The result is a heuristic, not a
+    proven optimum of the integer problem.
+    """
+    n = len(prices)
+    holdings = [p * q for p, q in zip(prices, quantities)]
+    free = [
+        i for i in range(n)
+        if prices[i] > 0 and abs(target_values[i] - holdings[i]) >= max(min_trade_value, 0.0)
+    ]
+    trades = [0] * n
+
+    # 소수점 이하 보유분은 거래할 수 없으므로 고정: 정수 주식 수만 목표에 맞춘다
+    whole = {i: math.floor(quantities[i]) for i in free}
+    targets = {i: target_values[i] - prices[i] * (quantities[i] - whole[i]) for i in free}
+    # 고정된 평가액을 뺀 나머지가 정수 주식에 배분할 예산
+    budget = cash + sum(prices[i] * whole[i] for i in free)
+    level = _water_level([max(targets[i], 0.0) for i in free], budget)
+    shares, rounded_up = {}, []
+    for i in free:
+        ideal = max(targets[i] - level, 0.0) / prices[i]
+        # 매수는 내림, 매도는 반올림: 내림으로 매도하면 필요 이상 판다
+        shares[i] = math.floor(ideal) if ideal >= whole[i] else min(round(ideal), whole[i])
+        if shares[i] > ideal:
+            rounded_up.append(i)
+    residue = budget - sum(prices[i] * shares[i] for i in free)
+
+    def error(i: int, count: int) -> float:
+        return (targets[i] - prices[i] * count) ** 2
+
+    # 한 주 사고팔 때의 금액당 오차 변화: 매수 이득 = 2 * 남은 차이 - 가격, 매도 손실 = 2 * 남은 차이 + 가격
+    def buy_gain(i: int) -> float:
+        return 2 * (targets[i] - prices[i] * shares[i]) - prices[i]
+
+    def sell_cost(i: int) -> float:
+        return 2 * (targets[i] - prices[i] * shares[i]) + prices[i]
+
+    # 반올림으로 예산을 넘었다면, 확보 금액당 오차가 가장 적게 늘어나는 매도부터 내림으로 되돌린다
+    rounded_up.sort(key=lambda i: (error(i, shares[i] - 1) - error(i, shares[i])) / prices[i], reverse=True)
+    while residue < 0 and rounded_up:
+        i = rounded_up.pop()
+        shares[i] -= 1
+        residue += prices[i]
+
+    # 힙 항목은 넣을 때의 주식 수를 함께 들고, 주식 수가 바뀐 항목은 꺼낼 때 버린다
+    buyers = [(-buy_gain(i), i, shares[i]) for i in free]
+    sellers = [(sell_cost(i), i, shares[i]) for i in free if shares[i] > 0]
+    heapq.heapify(buyers)
+    heapq.heapify(sellers)
+
+    def push(i: int) -> None:
+        heapq.heappush(buyers, (-buy_gain(i), i, shares[i]))
+        if shares[i] > 0:
+            heapq.heappush(sellers, (sell_cost(i), i, shares[i]))
+
+    for _ in range(2 * len(free)):
+        while buyers and buyers[0][2] != shares[buyers[0][1]]:
+            heapq.heappop(buyers)
+        if not buyers or buyers[0][0] >= 0:
+            break
+        _, i, _ = heapq.heappop(buyers)
+
+        if prices[i] <= residue:
+            # 다음 후보보다 금액당 이득이 큰 동안은 한 번에 산다
+            floor_gain = max(-buyers[0][0], 0.0) if buyers else 0.0
+            count = min(int(residue // prices[i]), int((buy_gain(i) - floor_gain) // (2 * prices[i])) + 1)
+            shares[i] += count
+            residue -= prices[i] * count
+            push(i)
+            continue
+
+        # 모자란 금액은 금액당 오차가 가장 적게 늘어나는 매도로 마련. 한 종목은 다음 후보보다
+        # 손실이 작은 동안만 팔고, 더 팔 수 있으면 늘어난 손실로 다시 넣는다
+        needed = prices[i] - residue
+        remaining, sales, popped = needed, {}, []
+        for _ in range(SELLERS_PER_EXCHANGE):
+            while sellers and sellers[0][2] != shares[sellers[0][1]] - sales.get(sellers[0][1], 0):
+                heapq.heappop(sellers)
+            if not sellers:
+                break
+            entry = heapq.heappop(sellers)
+            cost, j, held = entry
+            if held == shares[j]:
+                popped.append(entry)
+            # 다 마련한 뒤에는 한 종목 매도 후보만 더 모은다
+            if j == i or remaining <= 0:
+                continue
+            count = min(held, math.ceil(remaining / prices[j]))
+            if sellers:
+                count = min(count, int((sellers[0][0] - cost) // (2 * prices[j])) + 1)
+            sales[j] = sales.get(j, 0) + count
+            remaining -= prices[j] * count
+            if held > count:
+                heapq.heappush(sellers, (cost + 2 * prices[j] * count, j, held - count))
+
+        # 금액당 손실은 작아도 한 주가 커서 총손실이 클 수 있으니, 한 종목만 파는 경우와도 비교
+        options = [sales] if remaining <= 0 else []
+        options += [
+            {j: math.ceil(needed / prices[j])} for _, j, _ in popped
+            if j != i and prices[j] * shares[j] >= needed
+        ]
+
+        def change(sold: Dict[int, int]) -> float:
+            return error(i, shares[i] + 1) - error(i, shares[i]) + sum(
+                error(j, shares[j] - count) - error(j, shares[j]) for j, count in sold.items()
+            )
+
+        best = min(options, key=change, default=None)
+        if best is None or change(best) >= 0:
+            # 이득이 없으면 i만 후보에서 빼고 매도 후보는 되돌린다
+            for entry in popped:
+                heapq.heappush(sellers, entry)
+            continue
+        shares[i] += 1
+        residue -= prices[i]
+        for j, count in best.items():
+            shares[j] -= count
+            residue += prices[j] * count
+            push(j)
+        for entry in popped:
+            heapq.heappush(sellers, entry)
+        push(i)
+
+    for i in free:
+        trades[i] = shares[i] - whole[i]
+
+    if min_trade_value > 0:
+        # 매수 취소는 현금을 늘리므로 먼저, 매도 취소는 남은 현금으로 감당될 때만
+        small = [i for i in free if 0 < abs(trades[i]) * prices[i] < min_trade_value]
+        for i in sorted(small, key=lambda i: -trades[i]):
+            if -trades[i] * prices[i] <= residue:
+                residue += trades[i] * prices[i]
+                trades[i] = 0
+
+    return trades
@@ -1,29 +1,91 @@
-def infer_category(name: str, code: str) -> str:
+import functools
+import re
+
+# KRX: 6-digit numeric codes. Others (US tickers, FDR symbols): alnum with . - / separators
+_KRX_CODE = re.compile(r"[0-9]{6}")
+_TICKER = re.compile(r"[A-Za-z0-9][A-Za-z0-9.\-/]{0,11}")
+
+def is_valid_code(code: str) -> bool:
     """
-    Infer asset category based on name and code keywords.
+    Cheap local check that rejects obviously malformed ticker codes before any network I/O.
     """
-    name_upper = name.upper()
-    
+    if not code:
+        return False
+    if code.isdigit():
+        return _KRX_CODE.fullmatch(code) is not None
+    return _TICKER.fullmatch(code) is not None
+
+# (category, keywords) in precedence order: the first category with a keyword
+# anywhere in the upper-cased name wins; no match falls back to DEFAULT_CATEGORY.
+DEFAULT_CATEGORY_KEYWORDS: tuple[tuple[str, tuple[str, ...]], ...] = (
     # Keywords for Bonds (채권)
-    bond_keywords = [
+    ("채권", (
         "채권", "국고채", "단기채", "중기채", "회사채", "전단채", "국채", "미국채",
-        "BOND", "TREASURY", "TIPS", "TLT", "IEF", "SHY", "BND", "AGG", "JNK", "HYG"
-    ]
-    if any(k in name_upper for k in bond_keywords):
-        return "채권"
-        
+        "BOND", "TREASURY", "TIPS", "TLT", "IEF", "SHY", "BND", "AGG", "JNK", "HYG",
+    )),
     # Keywords for Raw Materials (원자재)
-    raw_keywords = [
+    ("원자재", (
         "골드", "금선물", "은선물", "구리", "원유", "콩", "옥수수", "농산물",
-        "GOLD", "SILVER", "OIL", "COMMODITY", "GLD", "IAU", "SLV", "DBC", "PDBC", "USO"
-    ]
-    if any(k in name_upper for k in raw_keywords):
-        return "원자재"
-    
+        "GOLD", "SILVER", "OIL", "COMMODITY", "GLD", "IAU", "SLV", "DBC", "PDBC", "USO",
+    )),
     # Keywords for Cash (현금) - e.g. Dollar ETF
-    cash_keywords = ["달러선물", "USDOLLAR", "SHV", "BIL"]
-    if any(k in name_upper for k in cash_keywords):
-        return "현금"
+    ("현금", ("달러선물", "USDOLLAR", "SHV", "BIL")),
+)
+DEFAULT_CATEGORY = "주식"
+
+class CategoryClassifier:
+    """
+    Keyword-based category classifier compiled into one regex.
+
+    Every keyword of every category becomes one alternation inside a lookahead,
+    so a single scan of the name sees matches starting at every position
+    (overlapping ones included). Categories are alternated in precedence order
+    and the scan stops at the first top-precedence hit. A plain alternation
+    search first finds the earliest keyword, so names without any keyword (most
+    listings) never reach the lookahead scan. Results are memoized per (name, code).
+    """
 
-    # Default to Stock
-    return "주식"
+    def __init__(
+        self,
+        keywords: tuple[tuple[str, tuple[str, ...]], ...] = DEFAULT_CATEGORY_KEYWORDS,
+        default: str = DEFAULT_CATEGORY,
+        cache_size: int = 4096,
+    ):
+        self.default = default
+        self._categories: list[str] = []
+        alternatives: list[str] = []
+        every_word: set[str] = set()
+        for category, words in keywords:
+            words = sorted({w.upper() for w in words if w}, key=len, reverse=True)
+            every_word.update(words)
+            if words:
+                alternatives.append(f"(?P<c{len(self._categories)}>{'|'.join(map(re.escape, words))})")
+                self._categories.append(category)
+        self._pattern = re.compile(f"(?=(?:{'|'.join(alternatives)}))") if alternatives else None
+        self._any = re.compile("|".join(map(re.escape, sorted(every_word, key=len, reverse=True))))
+        self.classify = functools.lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, name: str, code: str) -> str:
+        if self._pattern is None:
+            return self.default
+        name_upper = name.upper()
+        first = self._any.search(name_upper)
+        if first is None:
+            return self.default
+        best = len(self._categories)
+        for match in self._pattern.finditer(name_upper, first.start()):
+            best = min(best, int(match.lastgroup[1:]))
+            if best == 0:
+                break
+        return self._categories[best] if best < len(self._categories) else self.default
+
+    def cache_clear(self) -> None:
+        self.classify.cache_clear()
+
+_default_classifier = CategoryClassifier()
+
+def infer_category(name: str, code: str) -> str:
+    """
+    Infer asset category based on name and code keywords.
+    """
+    return _default_classifier.classify(name, code)
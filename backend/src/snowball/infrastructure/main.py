@@ -7,6 +7,7 @@ from .db import create_db_and_tables, get_session
 from .security import PasswordHasher
 from ..adapters.db.models import AccountModel, UserModel
 from ..adapters.api.routes import router
+from .market_data import build_market_data_services
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -38,7 +39,14 @@ async def lifespan(app: FastAPI):
             session.commit()
     finally:
         session.close()
-    yield
+
+    # App-scoped provider: lookups reuse warm keep-alive connections, a shared quote cache
+    # and coalesce concurrent fetches of the same code
+    app.state.market_data = build_market_data_services()
+    try:
+        yield
+    finally:
+        await app.state.market_data.aclose()
 
 def create_app() -> FastAPI:
     app = FastAPI(lifespan=lifespan)
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from typing import Any
+
+from ..domain.ports import AsyncMarketDataProvider, MarketDataProvider
+from ..adapters.external.async_market_data import AsyncRealMarketDataProvider
+from ..adapters.external.cache import AsyncCachedMarketDataProvider, CachedMarketDataProvider, QuoteCache
+from ..adapters.external.history import PriceHistory
+from ..adapters.external.market_data import INTERACTIVE_BATCH_TIMEOUT, RealMarketDataProvider
+from ..adapters.external.resilience import UpstreamGuard, naver_guard
+from ..adapters.external.symbols import LocalSymbolMaster
+from ..adapters.external.singleflight import AsyncSingleFlightMarketDataProvider, SingleFlightMarketDataProvider
+
+
+@dataclass
+class MarketDataServices:
+    """
+    App-scoped market data stacks: cache -> single-flight -> upstream source.
+
+    The sync stack serves threadpool callers, the async stack serves `async def`
+    routes; both share one QuoteCache, one local price history, one symbol
+    master and one breaker/rate limiter per upstream. `fresh` skips the cache
+    and gives up on a batch after INTERACTIVE_BATCH_TIMEOUT, for requests that
+    need current prices while a user waits (e.g. rebalancing).
+    """
+    provider: MarketDataProvider
+    fresh: MarketDataProvider
+    cache: CachedMarketDataProvider
+    single_flight: SingleFlightMarketDataProvider
+    source: RealMarketDataProvider
+    async_provider: AsyncMarketDataProvider
+    async_single_flight: AsyncSingleFlightMarketDataProvider
+    async_source: AsyncRealMarketDataProvider
+    naver: UpstreamGuard
+    history: PriceHistory
+    symbols: LocalSymbolMaster
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "cache": self.cache.stats(),
+            "single_flight": self.single_flight.stats(),
+            "async_single_flight": self.async_single_flight.stats(),
+            "upstreams": {
+                "naver": self.naver.snapshot(),
+                "fdr": self.history.breaker.snapshot(),
+            },
+            "symbols": self.symbols.stats(),
+        }
+
+    def close(self) -> None:
+        self.source.close()
+
+    async def aclose(self) -> None:
+        self.close()
+        await self.async_source.aclose()
+
+
+def build_market_data_services() -> MarketDataServices:
+    quotes = QuoteCache()
+    history = PriceHistory()
+    naver = naver_guard()
+    # API 프로세스만 종목 마스터를 직접 갱신: 스냅샷이 오래되면 백그라운드에서 다시 내려받는다
+    symbols = LocalSymbolMaster(auto_refresh=True)
+    symbols.reload()
+
+    source = RealMarketDataProvider(history=history, naver=naver, symbols=symbols)
+    single_flight = SingleFlightMarketDataProvider(source)
+    cache = CachedMarketDataProvider(single_flight, quotes)
+    fresh = RealMarketDataProvider(
+        transport=source.transport, history=history, naver=naver, symbols=symbols,
+        batch_timeout=INTERACTIVE_BATCH_TIMEOUT,
+    )
+
+    async_source = AsyncRealMarketDataProvider(history=history, naver=naver, symbols=symbols)
+    async_single_flight = AsyncSingleFlightMarketDataProvider(async_source)
+    async_cache = AsyncCachedMarketDataProvider(async_single_flight, quotes)
+
+    return MarketDataServices(
+        provider=cache,
+        fresh=fresh,
+        cache=cache,
+        single_flight=single_flight,
+        source=source,
+        async_provider=async_cache,
+        async_single_flight=async_single_flight,
+        async_source=async_source,
+        naver=naver,
+        history=history,
+        symbols=symbols,
+    )
@@ -0,0 +1,123 @@
+import random
+import threading
+from collections.abc import Callable, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from ..domain.entities import PriceUpdateResult
+from ..domain.market_hours import KRX_HOURS, US_HOURS, MarketHours
+
+DEFAULT_OPEN_INTERVAL = 60.0
+DEFAULT_CLOSE_GRACE = timedelta(minutes=20)
+DEFAULT_MAX_SLEEP = 3600.0
+DEFAULT_JITTER = 0.1
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RefreshSchedule:
+    """
+    Tick cadence driven by exchange hours.
+
+    While any market is open (or within `close_grace` of its close, to pick up
+    closing prices) ticks come every `open_interval` seconds. Otherwise the
+    schedule sleeps until the next open, waking at least every `max_sleep`
+    seconds to re-evaluate. Every delay is spread by +/- `jitter` so replicas
+    started together drift apart instead of hitting upstream in lockstep.
+    """
+
+    def __init__(
+        self,
+        markets: Sequence[MarketHours] = (KRX_HOURS, US_HOURS),
+        open_interval: float = DEFAULT_OPEN_INTERVAL,
+        close_grace: timedelta = DEFAULT_CLOSE_GRACE,
+        max_sleep: float = DEFAULT_MAX_SLEEP,
+        jitter: float = DEFAULT_JITTER,
+        rng: Optional[random.Random] = None,
+    ):
+        if open_interval <= 0:
+            raise ValueError("open_interval must be positive")
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be in [0, 1)")
+        self.markets = tuple(markets)
+        self.open_interval = open_interval
+        self.close_grace = close_grace
+        self.max_sleep = max_sleep
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+
+    def open_markets(self, now: datetime) -> list[str]:
+        return [m.name for m in self.markets if m.is_open(now, self.close_grace)]
+
+    def next_delay(self, now: datetime) -> float:
+        if self.open_markets(now):
+            base = self.open_interval
+        else:
+            until_open = min((m.next_open(now) - now).total_seconds() for m in self.markets)
+            base = min(max(until_open, 0.0), self.max_sleep)
+        return base * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def startup_delay(self) -> float:
+        """
+        Random offset up to the width of the tick jitter band (2 * jitter * open_interval),
+        so replicas do not start in phase. Zero when jitter is disabled.
+        """
+        return self.rng.uniform(0, self.open_interval * self.jitter * 2) if self.jitter else 0.0
+
+
+class PriceRefreshDaemon:
+    """
+    Long-running refresh loop: calls `tick(open_markets)` on the schedule and
+    sleeps in between. `stop()` (e.g. from a signal handler) interrupts the
+    sleep immediately; a tick in progress is allowed to finish.
+    """
+
+    def __init__(
+        self,
+        tick: Callable[[list[str]], PriceUpdateResult],
+        schedule: Optional[RefreshSchedule] = None,
+        clock: Callable[[], datetime] = utcnow,
+        log: Callable[[str], None] = print,
+    ):
+        self.tick = tick
+        self.schedule = schedule or RefreshSchedule()
+        self.clock = clock
+        self.log = log
+        self._stop = threading.Event()
+        self.ticks = 0
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def run(self) -> None:
+        if self._stop.wait(self.schedule.startup_delay()):
+            return
+        while not self._stop.is_set():
+            markets = self.schedule.open_markets(self.clock())
+            if markets:
+                self._run_tick(markets)
+            delay = self.schedule.next_delay(self.clock())
+            if not markets:
+                self.log(f"Markets closed; sleeping {delay:.0f}s")
+            if self._stop.wait(delay):
+                break
+        self.log("Price refresh daemon stopped")
+
+    def _run_tick(self, markets: list[str]) -> None:
+        self.ticks += 1
+        try:
+            result = self.tick(markets)
+        except Exception as e:
+            # One failed tick (DB blip, upstream outage) must not kill the daemon
+            self.log(f"Price refresh tick failed: {e}")
+            return
+        self.log(
+            f"[{'/'.join(markets)}] {result.code_count} codes, {result.updated_count} assets updated, "
+            f"{len(result.failed_codes)} failed in {result.total_seconds:.2f}s"
+        )
@@ -16,6 +16,11 @@ class PasswordHasher:
         hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
         return hashed.decode('utf-8')
 
+def admin_emails() -> frozenset[str]:
+    """Users allowed to run operational endpoints (comma-separated SNOWBALL_ADMIN_EMAILS)."""
+    raw = os.getenv("SNOWBALL_ADMIN_EMAILS", "")
+    return frozenset(email.strip().lower() for email in raw.split(",") if email.strip())
+
 class JWTService:
     SECRET_KEY = os.getenv("SECRET_KEY", "secret")
     ALGORITHM = os.getenv("ALGORITHM", "HS256")
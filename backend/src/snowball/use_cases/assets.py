@@ -1,39 +1,114 @@
-from typing import Optional
-from ..domain.ports import AssetRepository, MarketDataProvider
-from ..domain.services import infer_category
-from ..domain.entities import Asset
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional
+from ..domain.ports import AssetRepository, AsyncMarketDataProvider, MarketDataProvider, SymbolMaster
+from ..domain.services import infer_category, is_valid_code
+from ..domain.exceptions import InvalidAssetCodeException
+from ..domain.entities import PriceUpdateResult, Symbol
+
+DEFAULT_SCAN_CHUNK_SIZE = 1000
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
 
 class UpdateAssetPricesUseCase:
-    def __init__(self, asset_repo: AssetRepository, market_data: MarketDataProvider):
+    def __init__(
+        self,
+        asset_repo: AssetRepository,
+        market_data: MarketDataProvider,
+        chunk_size: int = DEFAULT_SCAN_CHUNK_SIZE,
+        clock: Callable[[], datetime] = _utcnow,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
         self.asset_repo = asset_repo
         self.market_data = market_data
+        self.chunk_size = chunk_size
+        self.clock = clock
+
+    def execute(
+        self,
+        max_age: Optional[timedelta] = None,
+        max_codes: Optional[int] = None,
+        code_filter: Optional[Callable[[str], bool]] = None,
+    ) -> PriceUpdateResult:
+        """
+        Full refresh by default. With `max_age`, only codes whose price is older than
+        that (or never fetched) are refreshed, highest held market value first, at most
+        `max_codes` of them. `code_filter` narrows the incremental set (e.g. to open markets).
+        """
+        started = time.perf_counter()
+
+        if max_age is None:
+            # (id, code)만 스트리밍: 메모리는 보유 자산 수가 아니라 종목 수에 비례
+            # 같은 종목을 보유한 자산이 여럿이어도 종목당 한 번만 조회
+            codes = list(dict.fromkeys(
+                code for _, code in self.asset_repo.iter_ids_and_codes(self.chunk_size)
+            ))
+        else:
+            stale_before = self.clock() - max_age
+            if code_filter is None:
+                codes = self.asset_repo.list_stale_codes(stale_before, limit=max_codes)
+            else:
+                codes = [c for c in self.asset_repo.list_stale_codes(stale_before) if code_filter(c)][:max_codes]
+
+        # 조회 시작 시각을 갱신 시각으로 기록 (보수적으로 오래된 쪽)
+        fetched_at = self.clock()
+        fetch_started = time.perf_counter()
+        prices = self.market_data.fetch_prices(codes) if codes else {}
+        fetch_seconds = time.perf_counter() - fetch_started
+
+        if max_age is not None and codes:
+            # 실패한 종목도 시도 시각은 남겨, 다음 증분 배치에서 다른 종목보다 뒤로 보낸다
+            self.asset_repo.record_attempts(codes, attempted_at=fetched_at)
+
+        # 종목 단위 일괄 UPDATE, 단일 트랜잭션
+        updated_count = self.asset_repo.update_prices(prices, updated_at=fetched_at) if prices else 0
 
-    def execute(self) -> int:
-        assets = self.asset_repo.list_all_with_code()
-        updated_count = 0
+        return PriceUpdateResult(
+            updated_count=updated_count,
+            code_count=len(codes),
+            failed_codes=sorted(set(codes) - set(prices)),
+            fetch_seconds=fetch_seconds,
+            total_seconds=time.perf_counter() - started,
+        )
 
-        for asset in assets:
-            new_price = self.market_data.fetch_price(asset.code)
-            if new_price is not None:
-                asset.current_price = new_price
-                self.asset_repo.save(asset)
-                updated_count += 1
+def _validate_code(code: str) -> None:
+    if not is_valid_code(code):
+        raise InvalidAssetCodeException(f"Invalid asset code: {code!r}")
 
-        return updated_count
+Classify = Callable[[str, str], str]
+
+def _with_category(info: Optional[dict], code: str, classify: Classify) -> Optional[dict]:
+    # Providers may already classify; otherwise infer from our keyword rules
+    if info and not info.get("category"):
+        info["category"] = classify(info["name"], code)
+    return info
 
 class FetchAssetInfoUseCase:
-    def __init__(self, market_data: MarketDataProvider):
+    def __init__(self, market_data: MarketDataProvider, classify: Classify = infer_category):
         self.market_data = market_data
+        self.classify = classify
 
     def execute(self, code: str) -> Optional[dict]:
-        info = self.market_data.fetch_asset_info(code)
-        if info:
-            # Ensure category is inferred if not present or if we want to enforce our logic
-            if "category" not in info or not info["category"]:
-                info["category"] = infer_category(info["name"], code)
-            else:
-                # Re-infer to be safe/consistent with our rules? 
-                # The main.py logic called infer_category inside fetch_asset_info strategies.
-                # Let's trust the provider to return it or use service if missing.
-                pass
-        return info
+        _validate_code(code)
+        return _with_category(self.market_data.fetch_asset_info(code), code, self.classify)
+
+class AsyncFetchAssetInfoUseCase:
+    def __init__(self, market_data: AsyncMarketDataProvider, classify: Classify = infer_category):
+        self.market_data = market_data
+        self.classify = classify
+
+    async def execute(self, code: str) -> Optional[dict]:
+        _validate_code(code)
+        return _with_category(await self.market_data.fetch_asset_info(code), code, self.classify)
+
+class SearchSymbolsUseCase:
+    def __init__(self, symbols: SymbolMaster):
+        self.symbols = symbols
+
+    def execute(self, query: str, limit: int = 10) -> List[Symbol]:
+        query = query.strip()
+        if not query:
+            return []
+        return self.symbols.search(query, limit)
@@ -1,7 +1,42 @@
-from typing import List
-from ..domain.entities import Account, AssetCalculationResult, PortfolioCalculationResult
+from itertools import chain
+from operator import attrgetter
+from collections.abc import Sequence
+from typing import Iterator, List, Optional
+import numpy as np
+from ..domain.entities import Account, Asset, AssetCalculationResult, CalculationMode, PortfolioCalculationResult
+from ..domain.rebalance import solve_whole_share_trades
+
+# np.sign(action_quantity) + 1 로 인덱싱
+_ACTIONS = np.array(["SELL", "HOLD", "BUY"], dtype=object)
+_PACKED_FIELDS = attrgetter("current_price", "quantity", "avg_price", "target_weight")
+
+def _asset_order(asset: Asset):
+    # Sort by ID if available, else name
+    return asset.id if asset.id else asset.name
+
+def _result_order(item: AssetCalculationResult):
+    return _asset_order(item.asset)
+
+def _optimize_actions(calc_assets: List[AssetCalculationResult], cash: float, min_trade_value: float) -> None:
+    """Replace the per-asset action quantities with the whole-share solver's trades."""
+    trades = solve_whole_share_trades(
+        [item.asset.current_price for item in calc_assets],
+        [item.asset.quantity for item in calc_assets],
+        [item.target_value for item in calc_assets],
+        cash,
+        min_trade_value,
+    )
+    for item, quantity in zip(calc_assets, trades):
+        item.action_quantity = quantity
+        item.action = _ACTIONS[(quantity > 0) - (quantity < 0) + 1]
 
 class CalculatePortfolioUseCase:
+    def __init__(self, mode: CalculationMode = CalculationMode.PER_ASSET, min_trade_value: float = 0.0):
+        if min_trade_value < 0:
+            raise ValueError("min_trade_value must not be negative")
+        self.mode = mode
+        self.min_trade_value = min_trade_value
+
     def execute(self, account: Account) -> PortfolioCalculationResult:
         assets = account.assets
         
@@ -43,9 +78,10 @@ class CalculatePortfolioUseCase:
                 action=action,
                 action_quantity=action_qty
             ))
-        
-        # Sort by ID if available, else name
-        calc_assets.sort(key=lambda x: x.asset.id if x.asset.id else x.asset.name)
+
+        calc_assets.sort(key=_result_order)
+        if self.mode == CalculationMode.OPTIMIZED:
+            _optimize_actions(calc_assets, account.cash, self.min_trade_value)
 
         return PortfolioCalculationResult(
             account=account,
@@ -55,3 +91,133 @@ class CalculatePortfolioUseCase:
             total_pl_rate=total_pl_rate,
             assets=calc_assets
         )
+
+class _ResultRows(Sequence[AssetCalculationResult]):
+    """
+    One account's AssetCalculationResult rows, built from its slice of the batch
+    columns on first access. Compares equal to a list of the same rows.
+    """
+
+    def __init__(self, assets: List[Asset], columns: List[list], start: int, end: int):
+        self._assets = assets
+        self._columns = columns
+        self._start, self._end = start, end
+        self._rows: Optional[List[AssetCalculationResult]] = None
+
+    def _materialize(self) -> List[AssetCalculationResult]:
+        if self._rows is None:
+            s, e = self._start, self._end
+            # 필드 순서대로 위치 인자로 생성
+            self._rows = list(map(AssetCalculationResult, self._assets[s:e], *(c[s:e] for c in self._columns)))
+            self._assets = self._columns = None
+        return self._rows
+
+    def __getitem__(self, index):
+        return self._materialize()[index]
+
+    def __iter__(self) -> Iterator[AssetCalculationResult]:
+        return iter(self._materialize())
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return self._materialize() == list(other)
+
+    def __repr__(self) -> str:
+        return repr(self._materialize())
+
+class BatchCalculatePortfolioUseCase:
+    """
+    Same calculation as CalculatePortfolioUseCase for many accounts at once.
+    The assets of all accounts are packed into columnar arrays, and the per-asset
+    figures are computed in one vectorized pass. Each account's asset rows are
+    only built from its column slice when they are first read, so accounts whose
+    rows are never read cost no per-asset objects. The results are identical to
+    calling the scalar use case once per account.
+    """
+
+    def __init__(self, mode: CalculationMode = CalculationMode.PER_ASSET, min_trade_value: float = 0.0):
+        if min_trade_value < 0:
+            raise ValueError("min_trade_value must not be negative")
+        self.mode = mode
+        self.min_trade_value = min_trade_value
+
+    def execute(self, accounts: List[Account]) -> List[PortfolioCalculationResult]:
+        assets = [a for account in accounts for a in account.assets]
+        counts = np.fromiter((len(account.assets) for account in accounts), dtype=np.intp, count=len(accounts))
+        cash_list = [account.cash for account in accounts]
+        columns = np.fromiter(
+            chain.from_iterable(map(_PACKED_FIELDS, assets)), dtype=np.float64, count=4 * len(assets)
+        ).reshape(len(assets), 4)
+        price, quantity, avg_price, target_weight = columns.T
+
+        current_val = price * quantity
+        invested_val = avg_price * quantity
+
+        # 계좌별 합계는 내장 sum()으로 구한다: Python 3.12+의 float sum은 보정 합산이라
+        # np.add.reduceat과 마지막 자리가 달라질 수 있고, 스칼라 경로와 결과가 같아야 한다
+        bounds = np.concatenate(([0], np.cumsum(counts))).tolist()
+        spans = list(zip(bounds, bounds[1:]))
+        current_list, invested_list = current_val.tolist(), invested_val.tolist()
+        total_invest_value = np.array([sum(current_list[s:e]) for s, e in spans], dtype=np.float64)
+        total_principal = np.array([sum(invested_list[s:e]) for s, e in spans], dtype=np.float64)
+        total_asset_value = total_invest_value + np.array(cash_list, dtype=np.float64)
+        total_pl = total_invest_value - total_principal
+
+        account_total = np.repeat(total_asset_value, counts)
+        pl = current_val - invested_val
+        with np.errstate(divide="ignore", invalid="ignore"):
+            total_pl_rate = np.where(total_principal > 0, total_pl / total_principal * 100, 0.0)
+            pl_rate = np.where(invested_val > 0, pl / invested_val * 100, 0.0)
+            current_weight = np.where(account_total > 0, current_val / account_total * 100, 0.0)
+            target_val = account_total * (target_weight / 100.0)
+            diff = target_val - current_val
+            # int()와 같은 0 방향 절사
+            action_qty = np.where(price > 0, np.trunc(diff / price), 0.0).astype(np.int64)
+        actions = _ACTIONS[np.sign(action_qty) + 1]
+
+        per_asset = [current_val, invested_val, pl, pl_rate, current_weight, target_val, diff, actions, action_qty]
+        if all(a.id for a in assets):
+            # 모든 자산에 id가 있으면 계좌 안에서 id 순 정렬을 한 번에 (lexsort는 안정 정렬)
+            ids = np.fromiter((a.id for a in assets), dtype=np.int64, count=len(assets))
+            order = np.lexsort((ids, np.repeat(np.arange(len(accounts)), counts)))
+        else:
+            order = np.fromiter(
+                chain.from_iterable(sorted(range(s, e), key=lambda k: _asset_order(assets[k])) for s, e in spans),
+                dtype=np.intp, count=len(assets),
+            )
+        if np.array_equal(order, np.arange(len(assets))):
+            # 저장소가 이미 id 순으로 돌려준 경우(일반적): 재배열 생략
+            per_asset = [column.tolist() for column in per_asset]
+        else:
+            assets = [assets[i] for i in order.tolist()]
+            price, quantity = price[order], quantity[order]
+            per_asset = [column[order].tolist() for column in per_asset]
+
+        if self.mode == CalculationMode.OPTIMIZED:
+            prices, quantities = price.tolist(), quantity.tolist()
+            target_list, action_list, qty_list = per_asset[5], per_asset[7], per_asset[8]
+            for (s, e), cash in zip(spans, cash_list):
+                trades = solve_whole_share_trades(
+                    prices[s:e], quantities[s:e], target_list[s:e], cash, self.min_trade_value
+                )
+                qty_list[s:e] = trades
+                action_list[s:e] = [_ACTIONS[(q > 0) - (q < 0) + 1] for q in trades]
+
+        totals = zip(
+            total_asset_value.tolist(), total_invest_value.tolist(), total_pl.tolist(), total_pl_rate.tolist()
+        )
+        return [
+            PortfolioCalculationResult(
+                account=account,
+                total_asset_value=asset_value,
+                total_invested_value=invest_value,
+                total_pl_amount=pl_amount,
+                total_pl_rate=pl_rate_value,
+                assets=_ResultRows(assets, per_asset, s, e)
+            )
+            for account, (s, e), (asset_value, invest_value, pl_amount, pl_rate_value) in zip(accounts, spans, totals)
+        ]
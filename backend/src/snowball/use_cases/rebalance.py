@@ -0,0 +1,108 @@
+from dataclasses import replace
+from typing import Dict, List
+from ..domain.ports import MarketDataProvider, UnitOfWork
+from ..domain.entities import (
+    Account, AssetCalculationResult, CalculationMode, PortfolioCalculationResult, TradeLeg, UserId
+)
+from .portfolio import CalculatePortfolioUseCase
+from .retry import DEFAULT_MAX_ATTEMPTS, retry_on_conflict
+from .trade import ExecuteTradeBatchUseCase
+
+def plan_legs(plan: PortfolioCalculationResult) -> List[TradeLeg]:
+    """Trade legs for every BUY/SELL row of a calculation, sells first, priced at the valuation price."""
+    rows = [item for item in plan.assets if item.action_quantity != 0]
+    rows.sort(key=lambda item: item.action_quantity > 0)
+    return [
+        TradeLeg(asset_id=item.asset.id, action_quantity=item.action_quantity, price=item.asset.current_price)
+        for item in rows
+    ]
+
+def fund_buys(plan: PortfolioCalculationResult) -> PortfolioCalculationResult:
+    """
+    The plan with its BUY rows cut down to what cash plus the SELL rows' proceeds
+    can pay for, most underweight asset first. Per-asset plans ignore cash, so
+    their buys can otherwise exceed it; plans that already fit are returned as is.
+    """
+    available = plan.account.cash + sum(
+        -item.action_quantity * item.asset.current_price for item in plan.assets if item.action_quantity < 0
+    )
+    capped = {}
+    for item in sorted((i for i in plan.assets if i.action_quantity > 0), key=lambda i: -i.diff_value):
+        price = item.asset.current_price
+        quantity = min(item.action_quantity, max(int(available // price), 0))
+        available -= quantity * price
+        if quantity != item.action_quantity:
+            capped[id(item)] = quantity
+    if not capped:
+        return plan
+
+    def cap(item: AssetCalculationResult) -> AssetCalculationResult:
+        if id(item) not in capped:
+            return item
+        quantity = capped[id(item)]
+        return replace(item, action="BUY" if quantity else "HOLD", action_quantity=quantity)
+
+    return replace(plan, assets=[cap(item) for item in plan.assets])
+
+class RebalanceAccountUseCase:
+    """
+    Server-side rebalance of one account. Prices for the account's coded assets
+    are fetched once, outside any transaction; the plan is computed from that snapshot and its legs are
+    executed at the same prices in one transaction, together with saving the
+    snapshot as the assets' current prices, so nothing drifts between plan and
+    execution and a failed rebalance leaves the account untouched. Buys are
+    capped to cash plus sale proceeds (see fund_buys) and sells go first.
+    `dry_run` returns the plan (the snapshot valuation with its BUY/SELL
+    actions) without writing anything. `mode` selects how the plan's
+    quantities are derived (see CalculationMode).
+    """
+
+    def __init__(
+        self,
+        uow: UnitOfWork,
+        market_data: MarketDataProvider,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        mode: CalculationMode = CalculationMode.PER_ASSET,
+        min_trade_value: float = 0.0,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.uow = uow
+        self.market_data = market_data
+        self.max_attempts = max_attempts
+        self.calc_use_case = CalculatePortfolioUseCase(mode, min_trade_value)
+        self.batch_use_case = ExecuteTradeBatchUseCase(uow)
+
+    def execute(self, account_id: int, user_id: UserId, dry_run: bool = False) -> PortfolioCalculationResult:
+        account = self.uow.accounts.get_account_for_user(account_id, user_id)
+        # 시세 조회(네트워크) 동안 트랜잭션을 열어 두지 않는다: 읽기만 했으므로 끝내고, 적용은 다시 읽어서 한다
+        self.uow.rollback()
+        prices = self._fetch_prices(account)
+
+        if dry_run:
+            return fund_buys(self.calc_use_case.execute(_revalued(account, prices)))
+
+        return retry_on_conflict(self.uow, lambda: self._apply(account_id, user_id, prices), self.max_attempts)
+
+    def _fetch_prices(self, account: Account) -> Dict[str, float]:
+        codes = sorted({a.code for a in account.assets if a.code})
+        # 조회 실패한 종목은 저장된 시세로 계산 (fetch_prices는 부분 결과를 돌려준다)
+        return self.market_data.fetch_prices(codes) if codes else {}
+
+    def _apply(self, account_id: int, user_id: UserId, prices: Dict[str, float]) -> PortfolioCalculationResult:
+        # 재시도 시에도 최신 상태로 다시 계획, 시세는 같은 스냅샷
+        account = self.uow.accounts.get_account_for_user(account_id, user_id)
+        plan = fund_buys(self.calc_use_case.execute(_revalued(account, prices)))
+        # 이 계좌 자산의 시세만 거래와 같은 트랜잭션에서 저장: 실패하면 함께 롤백
+        snapshot = {a.id: prices[a.code] for a in account.assets if a.code in prices}
+        if snapshot:
+            self.uow.assets.set_current_prices(snapshot)
+        legs = plan_legs(plan)
+        if not legs:
+            return plan
+        # 체결 후 계좌를 같은 모드로 다시 계산
+        return self.calc_use_case.execute(self.batch_use_case.apply(account_id, legs, user_id).account)
+
+def _revalued(account: Account, prices: Dict[str, float]) -> Account:
+    assets = [replace(a, current_price=prices.get(a.code, a.current_price)) for a in account.assets]
+    return replace(account, assets=assets)
@@ -0,0 +1,29 @@
+from typing import Callable, TypeVar
+from ..domain.ports import UnitOfWork
+from ..domain.exceptions import ConcurrencyConflictException
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+T = TypeVar("T")
+
+def retry_on_conflict(uow: UnitOfWork, operation: Callable[[], T], max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> T:
+    """
+    Run `operation` and commit it as one transaction. On a concurrency conflict
+    (version mismatch, lock or serialization failure) roll back and run it again
+    from scratch, up to `max_attempts` times in total; any other error rolls back
+    and propagates. `operation` must therefore re-read whatever it decides on.
+    """
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be at least 1")
+    for attempt in range(1, max_attempts + 1):
+        try:
+            result = operation()
+            uow.commit()
+            return result
+        except ConcurrencyConflictException:
+            uow.rollback()
+            if attempt == max_attempts:
+                raise
+        except Exception:
+            uow.rollback()
+            raise
@@ -13,10 +13,7 @@ class SyncPortfolioUseCase:
         If server has no accounts, migrate local data.
         If server has accounts, for now we prioritize server data (Spec FR-004).
         """
-        existing_accounts = self.account_repo.list_all() # Should filter by user_id in real implementation
-        # Note: list_all currently doesn't filter by user_id. 
-        # For simplicity in this refactor, we assume list_all returns all and we filter.
-        user_accounts = [acc for acc in existing_accounts if acc.user_id == user_id]
+        user_accounts = self.account_repo.list_by_user(user_id)
 
         if not user_accounts and local_accounts:
             # Migrate local data
@@ -41,6 +38,6 @@ class SyncPortfolioUseCase:
                     )
                     self.asset_repo.save(new_asset)
             
-            return self.account_repo.list_all() # Refresh list
+            return self.account_repo.list_by_user(user_id) # Refresh list
         
         return user_accounts
@@ -1,56 +1,103 @@
-from ..domain.ports import AccountRepository, AssetRepository
+from typing import List
+from ..domain.ports import UnitOfWork
 from ..domain.exceptions import EntityNotFoundException, InsufficientFundsException, InvalidActionException
-from ..domain.entities import PortfolioCalculationResult
+from ..domain.entities import PortfolioCalculationResult, TradeLeg, UserId
 from .portfolio import CalculatePortfolioUseCase
+from .retry import DEFAULT_MAX_ATTEMPTS, retry_on_conflict
 
 class ExecuteTradeUseCase:
-    def __init__(self, asset_repo: AssetRepository, account_repo: AccountRepository):
-        self.asset_repo = asset_repo
-        self.account_repo = account_repo
+    """
+    Executes one trade in a single transaction. Cash and holding are changed by
+    conditional updates, so concurrent trades on the same account can neither
+    overdraw it nor lose each other's writes; transient conflicts are retried.
+    """
+
+    def __init__(self, uow: UnitOfWork, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.uow = uow
+        self.max_attempts = max_attempts
         self.calc_use_case = CalculatePortfolioUseCase()
 
-    def execute(self, asset_id: int, action_quantity: int, price: float) -> PortfolioCalculationResult:
-        asset = self.asset_repo.get(asset_id)
-        if not asset:
-            raise EntityNotFoundException(f"Asset with id {asset_id} not found")
-        
-        account = self.account_repo.get(asset.account_id)
-        if not account:
-            raise EntityNotFoundException(f"Account with id {asset.account_id} not found")
+    def execute(self, asset_id: int, action_quantity: int, price: float, user_id: UserId) -> PortfolioCalculationResult:
+        return retry_on_conflict(
+            self.uow, lambda: self._apply(asset_id, action_quantity, price, user_id), self.max_attempts
+        )
+
+    def _apply(self, asset_id: int, action_quantity: int, price: float, user_id: UserId) -> PortfolioCalculationResult:
+        # 소유권 확인을 겸한 조회: EntityNotFoundException / PermissionDeniedException
+        asset = self.uow.assets.get_asset_for_user(asset_id, user_id)
+        if asset.quantity + action_quantity < 0:
+            raise InvalidActionException("Cannot sell more than you hold.")
 
         total_amount = abs(action_quantity) * price
-        
-        if action_quantity > 0: # BUY
-            if account.cash < total_amount:
-                raise InsufficientFundsException(f"Not enough cash. Need {total_amount}, Have {account.cash}")
-            account.cash -= total_amount
-        else: # SELL
-            account.cash += total_amount
-            
-        new_qty = asset.quantity + action_quantity
-        if new_qty < 0:
+        # BUY는 차감, SELL은 입금. 잔고 조건은 UPDATE의 WHERE 절에서 원자적으로 검사
+        cash_delta = -total_amount if action_quantity > 0 else total_amount
+        if self.uow.accounts.adjust_cash(asset.account_id, cash_delta) is None:
+            account = self.uow.accounts.get(asset.account_id, with_assets=False)
+            have = account.cash if account else 0.0
+            raise InsufficientFundsException(f"Not enough cash. Need {total_amount}, Have {have}")
+
+        # 조회 이후 다른 거래가 수량을 줄였다면 여기서 걸러진다
+        if self.uow.assets.apply_trade(asset_id, action_quantity, price) is None:
             raise InvalidActionException("Cannot sell more than you hold.")
-            
-        if action_quantity > 0: # BUY: Update Avg Price
-            old_val = asset.quantity * asset.avg_price
-            new_val = action_quantity * price
-            if new_qty > 0:
-                asset.avg_price = (old_val + new_val) / new_qty
-        
-        asset.quantity = new_qty
-        asset.current_price = price # Update current price to execution price as well? usually yes or fetch fresh.
-        # Main.py logic didn't explicitly update current_price in execute_trade, only avg_price and qty. 
-        # But logically, if we traded at price, current_price is likely that. 
-        # I'll stick to main.py logic: "asset.quantity = new_qty ... session.add(asset)". 
-        # It DOES NOT update current_price in main.py. I will strictly follow main.py logic.
-        
-        self.account_repo.save(account)
-        self.asset_repo.save(asset)
-        
-        # Re-fetch account with updated assets to calculate
-        # (Assuming save updates the object or we might need to fetch fresh if assets list is not updated in memory)
-        # For simplicity, if account.assets is loaded, we might need to update the specific asset instance in that list 
-        # if AccountRepo.save doesn't handle relationship refresh.
-        # To be safe, let's re-fetch.
-        saved_account = self.account_repo.get(account.id)
-        return self.calc_use_case.execute(saved_account)
+
+        # 같은 트랜잭션에서 갱신된 계좌를 읽어 재계산
+        account = self.uow.accounts.get(asset.account_id)
+        if account is None:
+            raise EntityNotFoundException(f"Account with id {asset.account_id} not found")
+        return self.calc_use_case.execute(account)
+
+class ExecuteTradeBatchUseCase:
+    """
+    Executes several legs on one account as a single transaction: ownership is
+    checked once, cash is validated against the net of the whole batch (sale
+    proceeds fund the buys), and the portfolio is recalculated once at the end.
+    """
+
+    def __init__(self, uow: UnitOfWork, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.uow = uow
+        self.max_attempts = max_attempts
+        self.calc_use_case = CalculatePortfolioUseCase()
+
+    def execute(self, account_id: int, legs: List[TradeLeg], user_id: UserId) -> PortfolioCalculationResult:
+        if not legs:
+            raise InvalidActionException("A trade batch needs at least one leg.")
+        asset_ids = [leg.asset_id for leg in legs]
+        if len(set(asset_ids)) != len(asset_ids):
+            raise InvalidActionException("Each asset may appear only once in a trade batch.")
+        return retry_on_conflict(self.uow, lambda: self.apply(account_id, legs, user_id), self.max_attempts)
+
+    def apply(self, account_id: int, legs: List[TradeLeg], user_id: UserId) -> PortfolioCalculationResult:
+        """Validate and apply the legs inside the caller's transaction, without committing."""
+        account = self.uow.accounts.get_account_for_user(account_id, user_id)
+        holdings = {a.id: a for a in account.assets}
+
+        buy_total = sell_total = 0.0
+        for leg in legs:
+            asset = holdings.get(leg.asset_id)
+            if asset is None:
+                raise EntityNotFoundException(f"Asset with id {leg.asset_id} not found in account {account_id}")
+            if asset.quantity + leg.action_quantity < 0:
+                raise InvalidActionException(f"Cannot sell more than you hold: {asset.name}")
+            if leg.action_quantity > 0:
+                buy_total += leg.action_quantity * leg.price
+            else:
+                sell_total += -leg.action_quantity * leg.price
+
+        if account.cash + sell_total < buy_total:
+            raise InsufficientFundsException(
+                f"Not enough cash. Need {buy_total}, Have {account.cash + sell_total}"
+            )
+
+        # 현금은 배치 순액으로 한 번만 조건부 갱신: 동시에 다른 거래가 잔고를 줄였다면 여기서 걸러진다
+        if self.uow.accounts.adjust_cash(account_id, sell_total - buy_total) is None:
+            raise InsufficientFundsException("Not enough cash: the balance changed during the trade.")
+        for leg in legs:
+            if leg.action_quantity and self.uow.assets.apply_trade(leg.asset_id, leg.action_quantity, leg.price) is None:
+                raise InvalidActionException(f"Cannot sell more than you hold: {holdings[leg.asset_id].name}")
+
+        # 같은 트랜잭션에서 갱신된 계좌로 한 번만 재계산 (SqlAlchemyUnitOfWork에서는 재조회 없음)
+        return self.calc_use_case.execute(self.uow.accounts.get(account_id))
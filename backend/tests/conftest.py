@@ -1,5 +1,7 @@
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
@@ -26,6 +28,27 @@ def session_fixture():
         yield session
     SQLModel.metadata.drop_all(engine)
 
+@pytest.fixture(name="count_queries")
+def count_queries_fixture():
+    """
+    `with count_queries() as statements:` records every SQL statement the test
+    engine executes inside the block, for asserting a method's query count.
+    """
+    @contextmanager
+    def count_queries():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+    return count_queries
+
 @pytest.fixture(name="client")
 def client_fixture(session: Session):
     def get_session_override():
@@ -1,5 +1,6 @@
 from http import HTTPStatus
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from unittest.mock import MagicMock
 from src.snowball.domain.ports import MarketDataProvider
 from src.snowball.adapters.api.routes import get_market_data
@@ -55,6 +56,20 @@ def test_should_delete_asset(client: TestClient):
     assert len(acc["assets"]) == 0
 
 
+def test_update_asset_with_stale_version_conflicts(client: TestClient):
+    # Given: Two tabs read version 1; the first one saves
+    acc_id = client.post("/accounts", json={"name": "Tabs", "cash": 0}).json()["id"]
+    asset = client.post("/assets", json={"account_id": acc_id, "name": "A", "target_weight": 10}).json()
+    first = client.patch(f"/assets/{asset['id']}", json={"target_weight": 20.0, "version": asset["version"]})
+
+    # When: The second tab saves with the version it read
+    second = client.patch(f"/assets/{asset['id']}", json={"target_weight": 30.0, "version": asset["version"]})
+
+    # Then
+    assert first.status_code == HTTPStatus.OK
+    assert first.json()["version"] == asset["version"] + 1
+    assert second.status_code == HTTPStatus.CONFLICT
+
 def test_should_execute_trade(client: TestClient):
     # Given: Account with cash and asset
     acc_res = client.post("/accounts", json={"name": "Trade Acc", "cash": 1000})
@@ -73,6 +88,26 @@ def test_should_execute_trade(client: TestClient):
     assert response.status_code == HTTPStatus.OK
     assert response.json()["cash"] == 900.0
 
+def test_trade_commits_once_per_request(client: TestClient, session):
+    # Given: Account with cash and asset
+    acc_id = client.post("/accounts", json={"name": "Commit Acc", "cash": 1000}).json()["id"]
+    asset_id = client.post("/assets", json={"account_id": acc_id, "name": "S", "current_price": 100}).json()["id"]
+    commits = []
+
+    def record(s):
+        commits.append(s)
+
+    event.listen(session, "after_commit", record)
+
+    # When: Executing BUY
+    response = client.post("/assets/execute", json={"asset_id": asset_id, "action_quantity": 2, "price": 100})
+    event.remove(session, "after_commit", record)
+
+    # Then: Cash and quantity written in a single commit, before the response
+    assert response.status_code == HTTPStatus.OK
+    assert len(commits) == 1
+    assert response.json()["assets"][0]["quantity"] == 2
+
 def test_should_fail_trade_insufficient_funds(client: TestClient):
     # Given: Poor account
     acc_res = client.post("/accounts", json={"name": "Poor Acc", "cash": 0})
@@ -102,3 +137,39 @@ def test_should_fail_trade_not_found(client: TestClient):
 
     # Then: Returns 404
     assert response.status_code == HTTPStatus.NOT_FOUND
+
+def test_should_execute_trade_batch_in_one_request(client: TestClient):
+    # Given: Cash 0, holding A to fund a buy of B
+    acc_id = client.post("/accounts", json={"name": "Batch", "cash": 0}).json()["id"]
+    a = client.post("/assets", json={"account_id": acc_id, "name": "A", "current_price": 100, "quantity": 10}).json()
+    b = client.post("/assets", json={"account_id": acc_id, "name": "B", "current_price": 50}).json()
+
+    # When: Sell 5 A, buy 10 B in one batch
+    response = client.post(f"/accounts/{acc_id}/execute", json={"legs": [
+        {"asset_id": a["id"], "action_quantity": -5, "price": 100},
+        {"asset_id": b["id"], "action_quantity": 10, "price": 50},
+    ]})
+
+    # Then: Both legs applied, portfolio recalculated once
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert body["cash"] == 0.0
+    assert {x["name"]: x["quantity"] for x in body["assets"]} == {"A": 5, "B": 10}
+
+def test_trade_batch_is_all_or_nothing(client: TestClient):
+    # Given
+    acc_id = client.post("/accounts", json={"name": "Batch", "cash": 100}).json()["id"]
+    a = client.post("/assets", json={"account_id": acc_id, "name": "A", "current_price": 100, "quantity": 1}).json()
+    b = client.post("/assets", json={"account_id": acc_id, "name": "B", "current_price": 50}).json()
+
+    # When: First leg is fine, second leg oversells
+    response = client.post(f"/accounts/{acc_id}/execute", json={"legs": [
+        {"asset_id": b["id"], "action_quantity": 1, "price": 50},
+        {"asset_id": a["id"], "action_quantity": -5, "price": 100},
+    ]})
+
+    # Then: Rejected, nothing changed
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    account = next(x for x in client.get("/accounts").json() if x["id"] == acc_id)
+    assert account["cash"] == 100.0
+    assert {x["name"]: x["quantity"] for x in account["assets"]} == {"A": 1, "B": 0}
@@ -1,12 +1,12 @@
 from http import HTTPStatus
 from fastapi.testclient import TestClient
-from unittest.mock import MagicMock
-from src.snowball.domain.ports import MarketDataProvider
-from src.snowball.adapters.api.routes import get_market_data
+from unittest.mock import AsyncMock, MagicMock
+from src.snowball.domain.ports import AsyncMarketDataProvider, MarketDataProvider
+from src.snowball.adapters.api.routes import get_async_market_data
 
 def test_finance_lookup_success(client: TestClient):
     # Given: Mocked market data provider finding an asset
-    mock_provider = MagicMock(spec=MarketDataProvider)
+    mock_provider = AsyncMock(spec=AsyncMarketDataProvider)
     mock_provider.fetch_asset_info.return_value = {
         "name": "Mock Samsung",
         "price": 70000,
@@ -14,7 +14,7 @@ def test_finance_lookup_success(client: TestClient):
     }
 
     from main import app
-    app.dependency_overrides[get_market_data] = lambda: mock_provider
+    app.dependency_overrides[get_async_market_data] = lambda: mock_provider
 
     # When: Calling lookup endpoint with valid code
     response = client.get("/finance/lookup?code=005930")
@@ -26,15 +26,15 @@ def test_finance_lookup_success(client: TestClient):
     assert data["price"] == 70000
     assert data["category"] == "주식"
 
-    app.dependency_overrides.pop(get_market_data)
+    app.dependency_overrides.pop(get_async_market_data)
 
 def test_finance_lookup_not_found(client: TestClient):
     # Given: Mocked provider returning None
-    mock_provider = MagicMock(spec=MarketDataProvider)
+    mock_provider = AsyncMock(spec=AsyncMarketDataProvider)
     mock_provider.fetch_asset_info.return_value = None
 
     from main import app
-    app.dependency_overrides[get_market_data] = lambda: mock_provider
+    app.dependency_overrides[get_async_market_data] = lambda: mock_provider
 
     # When: Calling lookup with invalid code
     response = client.get("/finance/lookup?code=INVALID")
@@ -42,4 +42,114 @@ def test_finance_lookup_not_found(client: TestClient):
     # Then: 404 Not Found
     assert response.status_code == HTTPStatus.NOT_FOUND
 
-    app.dependency_overrides.pop(get_market_data)
+    app.dependency_overrides.pop(get_async_market_data)
+
+def test_finance_lookup_rejects_malformed_code(client: TestClient):
+    # Given: A provider that must not be reached
+    mock_provider = AsyncMock(spec=AsyncMarketDataProvider)
+
+    from main import app
+    app.dependency_overrides[get_async_market_data] = lambda: mock_provider
+
+    # When: Calling lookup with a malformed code
+    response = client.get("/finance/lookup?code=5930")
+
+    # Then: 400 without any upstream call
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    mock_provider.fetch_asset_info.assert_not_called()
+
+    app.dependency_overrides.pop(get_async_market_data)
+
+def _services_over(inner, async_inner):
+    from src.snowball.adapters.external.cache import (
+        AsyncCachedMarketDataProvider, CachedMarketDataProvider, QuoteCache
+    )
+    from src.snowball.adapters.external.singleflight import (
+        AsyncSingleFlightMarketDataProvider, SingleFlightMarketDataProvider
+    )
+    from src.snowball.adapters.external.history import PriceHistory
+    from src.snowball.adapters.external.resilience import naver_guard
+    from src.snowball.adapters.external.symbols import LocalSymbolMaster
+    from src.snowball.infrastructure.market_data import MarketDataServices
+    quotes = QuoteCache()
+    single_flight = SingleFlightMarketDataProvider(inner)
+    cache = CachedMarketDataProvider(single_flight, quotes)
+    async_single_flight = AsyncSingleFlightMarketDataProvider(async_inner)
+    return MarketDataServices(
+        provider=cache, fresh=inner, cache=cache, single_flight=single_flight, source=inner,
+        async_provider=AsyncCachedMarketDataProvider(async_single_flight, quotes),
+        async_single_flight=async_single_flight, async_source=async_inner,
+        naver=naver_guard(), history=PriceHistory(), symbols=LocalSymbolMaster(),
+    )
+
+def test_finance_lookup_reuses_app_scoped_cache(client: TestClient):
+    # Given: One market data stack shared across requests
+    from src.snowball.adapters.api.routes import get_market_data_services
+    inner = AsyncMock(spec=AsyncMarketDataProvider)
+    inner.fetch_asset_info.return_value = {"name": "Mock Samsung", "price": 70000}
+    services = _services_over(MagicMock(spec=MarketDataProvider), inner)
+
+    from main import app
+    app.dependency_overrides[get_market_data_services] = lambda: services
+
+    # When: The same code is looked up twice, and an admin reads the metrics
+    from src.snowball.adapters.api.routes import get_admin_emails
+    client.get("/finance/lookup?code=005930")
+    client.get("/finance/lookup?code=005930")
+    app.dependency_overrides[get_admin_emails] = lambda: frozenset({"test@example.com"})
+    metrics = client.get("/finance/metrics").json()
+
+    # Then: Upstream was called once and the second lookup was a hit
+    inner.fetch_asset_info.assert_called_once_with("005930")
+    assert metrics["cache"]["hits"] == 1
+    assert metrics["async_single_flight"]["executions"] == 1
+    assert metrics["upstreams"]["naver"]["state"] == "closed"
+
+    # When: A regular user tries to read the metrics or flush the process-wide cache
+    app.dependency_overrides[get_admin_emails] = lambda: frozenset({"ops@example.com"})
+    hidden = client.get("/finance/metrics")
+    forbidden = client.delete("/finance/cache?code=005930")
+
+    # Then: Both rejected, nothing dropped
+    assert hidden.status_code == HTTPStatus.FORBIDDEN
+    assert forbidden.status_code == HTTPStatus.FORBIDDEN
+
+    # When: An admin invalidates the code
+    app.dependency_overrides[get_admin_emails] = lambda: frozenset({"test@example.com"})
+    response = client.delete("/finance/cache?code=005930")
+
+    # Then: Its entry is dropped
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["removed"] == 1
+
+    app.dependency_overrides.pop(get_market_data_services)
+
+def test_finance_search_returns_typeahead_matches(client: TestClient):
+    # Given: A symbol master over a small listing
+    from src.snowball.adapters.api.routes import get_symbol_master
+    from src.snowball.adapters.external.symbols import SymbolIndex
+    from src.snowball.domain.entities import Symbol
+    from src.snowball.domain.ports import SymbolMaster
+    index = SymbolIndex([
+        Symbol("005930", "삼성전자", "KRX"),
+        Symbol("005935", "삼성전자우", "KRX"),
+        Symbol("AAPL", "Apple Inc", "NASDAQ"),
+    ])
+    symbols = MagicMock(spec=SymbolMaster)
+    symbols.search.side_effect = index.search
+
+    from main import app
+    app.dependency_overrides[get_symbol_master] = lambda: symbols
+
+    # When: Searching by name prefix
+    response = client.get("/finance/search", params={"q": "삼성", "limit": 1})
+
+    # Then: Matches come back from the local index
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == [{"code": "005930", "name": "삼성전자", "market": "KRX"}]
+
+    # When/Then: Blank queries and out-of-range limits
+    assert client.get("/finance/search", params={"q": " "}).json() == []
+    assert client.get("/finance/search", params={"q": "a", "limit": 0}).status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    app.dependency_overrides.pop(get_symbol_master)
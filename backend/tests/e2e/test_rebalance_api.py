@@ -0,0 +1,111 @@
+from http import HTTPStatus
+from unittest.mock import MagicMock
+from fastapi.testclient import TestClient
+from main import app
+from src.snowball.domain.exceptions import InvalidActionException
+from src.snowball.domain.ports import MarketDataProvider
+from src.snowball.adapters.api.routes import get_fresh_market_data, get_market_data, get_market_data_services
+from src.snowball.infrastructure.market_data import MarketDataServices
+from src.snowball.use_cases.trade import ExecuteTradeBatchUseCase
+
+def setup_account(client: TestClient, market_data: MarketDataProvider) -> int:
+    app.dependency_overrides[get_market_data] = lambda: market_data
+    app.dependency_overrides[get_fresh_market_data] = lambda: market_data
+    acc_id = client.post("/accounts", json={"name": "Rebalance", "cash": 1000}).json()["id"]
+    client.post("/assets", json={"account_id": acc_id, "name": "A", "code": "AAA", "current_price": 100, "target_weight": 50})
+    client.post("/assets", json={"account_id": acc_id, "name": "B", "current_price": 100, "quantity": 10, "target_weight": 50})
+    return acc_id
+
+def test_rebalance_dry_run_returns_plan_only(client: TestClient):
+    # Given: A's fresh price is 200
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {"AAA": 200.0}
+    acc_id = setup_account(client, market_data)
+
+    # When
+    response = client.post(f"/accounts/{acc_id}/rebalance", params={"dry_run": True})
+
+    # Then: Plan at the snapshot price, account untouched
+    assert response.status_code == HTTPStatus.OK
+    plan = {a["name"]: (a["action"], a["action_quantity"]) for a in response.json()["assets"]}
+    assert plan == {"A": ("BUY", 5), "B": ("HOLD", 0)}
+    account = next(x for x in client.get("/accounts").json() if x["id"] == acc_id)
+    assert account["cash"] == 1000.0
+
+def test_rebalance_applies_plan_atomically(client: TestClient):
+    # Given
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {"AAA": 200.0}
+    acc_id = setup_account(client, market_data)
+
+    # When
+    response = client.post(f"/accounts/{acc_id}/rebalance")
+
+    # Then: Bought 5 A @ 200; the returned valuation is on target
+    assert response.status_code == HTTPStatus.OK
+    body = response.json()
+    assert body["cash"] == 0.0
+    assert {a["name"]: a["quantity"] for a in body["assets"]} == {"A": 5, "B": 10}
+    assert all(a["action"] == "HOLD" for a in body["assets"])
+    assert next(a for a in body["assets"] if a["name"] == "A")["current_price"] == 200.0
+
+def test_failed_rebalance_leaves_prices_unchanged(client: TestClient, monkeypatch):
+    # Given: A's fresh price is 200, and executing the legs fails
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {"AAA": 200.0}
+    acc_id = setup_account(client, market_data)
+
+    def fail(*args, **kwargs):
+        raise InvalidActionException("Cannot sell more than you hold: A")
+
+    monkeypatch.setattr(ExecuteTradeBatchUseCase, "apply", fail)
+
+    # When
+    response = client.post(f"/accounts/{acc_id}/rebalance")
+
+    # Then: The snapshot price was rolled back with the trades
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    account = next(x for x in client.get("/accounts").json() if x["id"] == acc_id)
+    assert {a["name"]: a["current_price"] for a in account["assets"]} == {"A": 100.0, "B": 100.0}
+    assert account["cash"] == 1000.0
+
+def test_rebalance_optimized_mode_stays_within_cash(client: TestClient):
+    # Given: 1000 cash, two 50% assets at 300; per-asset rounding would leave 400 idle
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {}
+    app.dependency_overrides[get_market_data] = lambda: market_data
+    app.dependency_overrides[get_fresh_market_data] = lambda: market_data
+    acc_id = client.post("/accounts", json={"name": "Optimized", "cash": 1000}).json()["id"]
+    for name in ("A", "B"):
+        client.post("/assets", json={"account_id": acc_id, "name": name, "current_price": 300, "target_weight": 50})
+
+    # When
+    listed = client.get("/accounts", params={"mode": "optimized"})
+    response = client.post(f"/accounts/{acc_id}/rebalance", params={"mode": "optimized"})
+
+    # Then: The plan buys three shares in total and the trade spends 900 of the 1000
+    planned = next(x for x in listed.json() if x["id"] == acc_id)
+    assert sorted(a["action_quantity"] for a in planned["assets"]) == [1, 2]
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["cash"] == 100.0
+    assert client.get("/accounts", params={"mode": "bogus"}).status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+def test_rebalance_prices_bypass_the_quote_cache(client: TestClient):
+    # Given: The cached stack still holds A at 100, the uncached source says 200
+    acc_id = setup_account(client, MagicMock(spec=MarketDataProvider))
+    app.dependency_overrides.pop(get_fresh_market_data)
+    services = MagicMock(spec=MarketDataServices)
+    services.provider = MagicMock(spec=MarketDataProvider)
+    services.provider.fetch_prices.return_value = {"AAA": 100.0}
+    services.fresh = MagicMock(spec=MarketDataProvider)
+    services.fresh.fetch_prices.return_value = {"AAA": 200.0}
+    app.dependency_overrides[get_market_data_services] = lambda: services
+
+    # When
+    response = client.post(f"/accounts/{acc_id}/rebalance", params={"dry_run": True})
+    app.dependency_overrides.pop(get_market_data_services)
+
+    # Then: Planned at the uncached price
+    a = next(x for x in response.json()["assets"] if x["name"] == "A")
+    assert a["current_price"] == 200.0
+    services.provider.fetch_prices.assert_not_called()
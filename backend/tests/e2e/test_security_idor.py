@@ -36,3 +36,39 @@ def test_idor_update_account_missing_authorization(session):
     print("Response json:", response.json())
 
     assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_idor_trade_on_other_users_asset_is_forbidden(session):
+    # Given: User A owns an account with an asset
+    user_a_id = UserId(uuid4())
+    user_b_id = UserId(uuid4())
+
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_current_user] = lambda: User(id=user_b_id, email="b@example.com", password_hash="hash")
+    client_b = TestClient(app, base_url="http://testserver/api/v1")
+
+    from src.snowball.adapters.db.models import AccountModel, AssetModel
+
+    acc = AccountModel(name="User A Account", cash=1000.0, user_id=user_a_id)
+    session.add(acc)
+    session.commit()
+    session.refresh(acc)
+    asset = AssetModel(account_id=acc.id, name="S", current_price=100.0, quantity=1.0)
+    session.add(asset)
+    session.commit()
+    session.refresh(asset)
+    asset_id = asset.id
+
+    # When: User B trades, edits and deletes it
+    trade = client_b.post("/assets/execute", json={"asset_id": asset_id, "action_quantity": 1, "price": 100})
+    patch = client_b.patch(f"/assets/{asset_id}", json={"name": "Hacked"})
+    delete = client_b.delete(f"/assets/{asset_id}")
+    missing = client_b.delete(f"/assets/{asset_id + 100}")
+
+    app.dependency_overrides.clear()
+
+    # Then: Forbidden, while a missing asset is still Not Found
+    assert trade.status_code == HTTPStatus.FORBIDDEN
+    assert patch.status_code == HTTPStatus.FORBIDDEN
+    assert delete.status_code == HTTPStatus.FORBIDDEN
+    assert missing.status_code == HTTPStatus.NOT_FOUND
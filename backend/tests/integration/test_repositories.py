@@ -1,9 +1,11 @@
 import pytest
+from datetime import datetime, timedelta
 from uuid import uuid4
 from sqlmodel import Session
 from src.snowball.adapters.db.repositories import SqlAlchemyAccountRepository, SqlAlchemyAssetRepository
 from src.snowball.domain.entities import Account, Asset, UserId
 from src.snowball.adapters.db.models import UserModel
+from src.snowball.domain.exceptions import EntityNotFoundException, PermissionDeniedException, VersionConflictException
 
 @pytest.fixture
 def account_repo(session: Session):
@@ -190,3 +192,291 @@ def test_list_by_user_with_assets_only_returns_current_user_accounts(session, ac
     # Then
     assert len(result) == 1
     assert result[0].name == "A계좌"
+
+
+def test_update_prices_sets_price_on_every_holding_of_each_code(asset_repo, sample_account):
+    # Given: two holdings of one code, one of another, one untouched
+    ids = [
+        asset_repo.save(Asset(account_id=sample_account.id, name=name, code=code, current_price=1.0)).id
+        for name, code in [("삼성전자", "005930"), ("삼성전자", "005930"), ("애플", "AAPL"), ("MSFT", "MSFT")]
+    ]
+
+    # When: updating in chunks smaller than the price map
+    updated = asset_repo.update_prices({"005930": 75000.0, "AAPL": 190.0, "NVDA": 900.0}, chunk_size=1)
+
+    # Then
+    assert updated == 3
+    assert [asset_repo.get(i).current_price for i in ids] == [75000.0, 75000.0, 190.0, 1.0]
+
+
+def test_update_prices_rolls_back_all_chunks_on_failure(session, asset_repo, sample_account, monkeypatch):
+    # Given
+    first = asset_repo.save(Asset(account_id=sample_account.id, name="A", code="A", current_price=1.0))
+    second = asset_repo.save(Asset(account_id=sample_account.id, name="B", code="B", current_price=1.0))
+    real_exec = session.exec
+    calls = []
+
+    def failing_exec(statement, *args, **kwargs):
+        calls.append(statement)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return real_exec(statement, *args, **kwargs)
+
+    monkeypatch.setattr(session, "exec", failing_exec)
+
+    # When: the second chunk fails
+    with pytest.raises(RuntimeError):
+        asset_repo.update_prices({"A": 2.0, "B": 2.0}, chunk_size=1)
+    monkeypatch.undo()
+
+    # Then: the first chunk was not committed either
+    assert asset_repo.get(first.id).current_price == 1.0
+    assert asset_repo.get(second.id).current_price == 1.0
+
+
+def test_iter_all_with_code_streams_coded_assets_in_chunks(asset_repo, sample_account):
+    # Given: more coded assets than one chunk, plus uncoded ones
+    for i in range(5):
+        asset_repo.save(Asset(account_id=sample_account.id, name=f"A{i}", code=f"C{i}"))
+    asset_repo.save(Asset(account_id=sample_account.id, name="현금", code=None))
+    asset_repo.save(Asset(account_id=sample_account.id, name="빈코드", code=""))
+
+    # When: streaming two rows per fetch
+    stream = asset_repo.iter_all_with_code(chunk_size=2)
+
+    # Then: a lazy iterator over every coded asset, in id order
+    assert not isinstance(stream, list)
+    assert [a.code for a in stream] == ["C0", "C1", "C2", "C3", "C4"]
+
+
+def test_iter_ids_and_codes_returns_projection_only(asset_repo, sample_account):
+    # Given
+    first = asset_repo.save(Asset(account_id=sample_account.id, name="삼성전자", code="005930"))
+    second = asset_repo.save(Asset(account_id=sample_account.id, name="애플", code="AAPL"))
+    asset_repo.save(Asset(account_id=sample_account.id, name="현금", code=None))
+
+    # When
+    rows = list(asset_repo.iter_ids_and_codes(chunk_size=1))
+
+    # Then: plain (id, code) tuples
+    assert rows == [(first.id, "005930"), (second.id, "AAPL")]
+
+
+def test_update_prices_records_price_updated_at_per_code(session, asset_repo, sample_account):
+    # Given
+    from src.snowball.adapters.db.models import QuoteModel
+    asset_repo.save(Asset(account_id=sample_account.id, name="삼성전자", code="005930"))
+    first = datetime(2026, 4, 10, 9, 0)
+    second = datetime(2026, 4, 10, 9, 5)
+
+    # When: the same code is refreshed twice
+    asset_repo.update_prices({"005930": 75000.0}, updated_at=first)
+    asset_repo.update_prices({"005930": 75100.0}, updated_at=second)
+
+    # Then: one quote row holding the latest price and time
+    quote = session.get(QuoteModel, "005930")
+    assert (quote.price, quote.price_updated_at) == (75100.0, second)
+
+
+def test_list_stale_codes_orders_by_held_value_and_skips_fresh(asset_repo, account_repo, sample_account, test_user):
+    # Given: the same code held in two accounts, plus smaller and zero-quantity holdings
+    other = account_repo.save(Account(name="Other", user_id=UserId(test_user.id)))
+    for account_id, code, price, qty in [
+        (sample_account.id, "SMALL", 10.0, 1),
+        (sample_account.id, "BIG", 100.0, 5),
+        (other.id, "BIG", 100.0, 5),
+        (sample_account.id, "MID", 300.0, 2),
+        (sample_account.id, "WATCH", 50.0, 0),
+        (sample_account.id, "FRESH", 1000.0, 100),
+    ]:
+        asset_repo.save(Asset(account_id=account_id, name=code, code=code, current_price=price, quantity=qty))
+    now = datetime(2026, 4, 10, 9, 0)
+    asset_repo.update_prices({"FRESH": 1000.0, "MID": 300.0}, updated_at=now - timedelta(minutes=1))
+    asset_repo.update_prices({"MID": 300.0}, updated_at=now - timedelta(minutes=30))
+
+    # When
+    stale = asset_repo.list_stale_codes(now - timedelta(minutes=5))
+
+    # Then: never-fetched and old codes, largest total value first; fresh ones skipped
+    assert stale == ["BIG", "MID", "SMALL", "WATCH"]
+    assert asset_repo.list_stale_codes(now - timedelta(minutes=5), limit=2) == ["BIG", "MID"]
+
+
+def test_list_stale_codes_puts_recently_attempted_codes_last(asset_repo, sample_account):
+    # Given: BROKEN holds the most value but its refresh failed a minute ago
+    for code, price in [("BROKEN", 1000.0), ("MID", 300.0), ("SMALL", 10.0)]:
+        asset_repo.save(Asset(account_id=sample_account.id, name=code, code=code, current_price=price, quantity=1))
+    now = datetime(2026, 4, 10, 9, 0)
+    asset_repo.record_attempts(["BROKEN"], attempted_at=now - timedelta(minutes=1))
+    asset_repo.record_attempts(["MID"], attempted_at=now - timedelta(minutes=30))
+
+    # When
+    stale = asset_repo.list_stale_codes(now - timedelta(minutes=5))
+
+    # Then: still stale, but behind codes not tried since the cutoff; it cannot starve a capped batch
+    assert stale == ["MID", "SMALL", "BROKEN"]
+    assert asset_repo.list_stale_codes(now - timedelta(minutes=5), limit=2) == ["MID", "SMALL"]
+    # Once the failure is older than the cutoff it is back in value order
+    assert asset_repo.list_stale_codes(now + timedelta(minutes=5), limit=1) == ["BROKEN"]
+
+
+def _accounts_with_assets(account_repo, asset_repo, user, count):
+    for i in range(count):
+        acc = account_repo.save(Account(name=f"계좌{i}", cash=0.0, user_id=UserId(user.id)))
+        for code in ("005930", "AAPL"):
+            asset_repo.save(Asset(account_id=acc.id, name=code, code=code, category="주식",
+                                  target_weight=50.0, current_price=1.0, avg_price=1.0, quantity=1.0))
+    return acc
+
+
+@pytest.mark.parametrize("account_count", [1, 5])
+def test_account_reads_issue_constant_query_count(account_repo, asset_repo, test_user, count_queries, account_count):
+    # Given — 계좌 수와 무관하게 계좌 SELECT 1 + 자산 SELECT 1
+    last = _accounts_with_assets(account_repo, asset_repo, test_user, account_count)
+    user_id = UserId(test_user.id)
+
+    # When / Then
+    with count_queries() as statements:
+        accounts = account_repo.list_all()
+    assert len(statements) == 2
+    assert all(len(acc.assets) == 2 for acc in accounts)
+
+    with count_queries() as statements:
+        accounts = account_repo.list_by_user(user_id)
+    assert len(statements) == 2
+    assert all(len(acc.assets) == 2 for acc in accounts)
+
+    with count_queries() as statements:
+        account = account_repo.get(last.id)
+    assert len(statements) == 2
+    assert len(account.assets) == 2
+
+
+def test_account_reads_without_assets_issue_single_query(account_repo, asset_repo, test_user, count_queries):
+    # Given
+    last = _accounts_with_assets(account_repo, asset_repo, test_user, 3)
+    user_id = UserId(test_user.id)
+
+    # When
+    with count_queries() as statements:
+        accounts = account_repo.list_all(with_assets=False)
+        by_user = account_repo.list_by_user(user_id, with_assets=False)
+        account = account_repo.get(last.id, with_assets=False)
+
+    # Then — 자산 테이블은 건드리지 않는다
+    assert len(statements) == 3
+    assert not any("FROM asset" in s for s in statements)
+    assert len(accounts) == len(by_user) == 3
+    assert account.name == last.name
+    assert account.assets == []
+
+
+def test_account_get_after_assetless_read_still_loads_assets(account_repo, asset_repo, test_user):
+    # Given — 같은 세션에서 자산 없이 먼저 읽은 계좌
+    last = _accounts_with_assets(account_repo, asset_repo, test_user, 1)
+    account_repo.get(last.id, with_assets=False)
+
+    # When
+    account = account_repo.get(last.id)
+
+    # Then
+    assert len(account.assets) == 2
+
+
+def test_get_asset_for_user_resolves_ownership_in_one_query(asset_repo, sample_account, test_user, count_queries):
+    # Given
+    user_id = UserId(test_user.id)
+    saved = asset_repo.save(Asset(account_id=sample_account.id, name="삼성전자", code="005930", quantity=1.0))
+
+    # When
+    with count_queries() as statements:
+        asset = asset_repo.get_asset_for_user(saved.id, user_id)
+
+    # Then
+    assert len(statements) == 1
+    assert asset.code == "005930"
+
+
+def test_get_asset_for_user_distinguishes_missing_and_foreign(asset_repo, sample_account):
+    # Given
+    saved = asset_repo.save(Asset(account_id=sample_account.id, name="삼성전자", code="005930", quantity=1.0))
+
+    # When / Then
+    with pytest.raises(EntityNotFoundException):
+        asset_repo.get_asset_for_user(saved.id + 100, sample_account.user_id)
+    with pytest.raises(PermissionDeniedException):
+        asset_repo.get_asset_for_user(saved.id, UserId(uuid4()))
+
+
+def test_get_account_for_user_distinguishes_missing_and_foreign(account_repo, sample_account, count_queries):
+    # When
+    with count_queries() as statements:
+        account = account_repo.get_account_for_user(sample_account.id, sample_account.user_id, with_assets=False)
+
+    # Then
+    assert len(statements) == 1
+    assert account.id == sample_account.id
+    with pytest.raises(EntityNotFoundException):
+        account_repo.get_account_for_user(sample_account.id + 100, sample_account.user_id)
+    with pytest.raises(PermissionDeniedException):
+        account_repo.get_account_for_user(sample_account.id, UserId(uuid4()))
+
+
+def test_adjust_cash_is_conditional_on_balance(session, account_repo, sample_account):
+    # When
+    withdrawn = account_repo.adjust_cash(sample_account.id, -60.0)
+    overdrawn = account_repo.adjust_cash(sample_account.id, -60.0)
+    session.commit()
+
+    # Then — 두 번째 인출은 잔고 부족으로 적용되지 않는다
+    assert withdrawn == 40.0
+    assert overdrawn is None
+    assert account_repo.get(sample_account.id).cash == 40.0
+
+
+def test_apply_trade_reaverages_buys_and_rejects_oversell(session, asset_repo, sample_account):
+    # Given — 10주 @ 100
+    saved = asset_repo.save(Asset(account_id=sample_account.id, name="S", quantity=10.0, avg_price=100.0))
+
+    # When
+    bought = asset_repo.apply_trade(saved.id, 10, 200.0)
+    sold = asset_repo.apply_trade(saved.id, -5, 300.0)
+    oversold = asset_repo.apply_trade(saved.id, -100, 300.0)
+    session.commit()
+
+    # Then
+    assert (bought.quantity, bought.avg_price, bought.current_price) == (20.0, 150.0, 200.0)
+    assert (sold.quantity, sold.avg_price, sold.current_price) == (15.0, 150.0, 300.0)
+    assert oversold is None
+    assert (asset_repo.get(saved.id).quantity, asset_repo.get(saved.id).current_price) == (15.0, 300.0)
+
+
+def test_save_bumps_version_and_rejects_stale_writes(account_repo, asset_repo, sample_account):
+    # Given — 두 탭에서 같은 버전을 읽음
+    tab_a = account_repo.get(sample_account.id)
+    tab_b = account_repo.get(sample_account.id)
+
+    # When
+    tab_a.name = "A에서 수정"
+    saved = account_repo.save(tab_a)
+    tab_b.name = "B에서 수정"
+
+    # Then — 뒤늦은 저장은 덮어쓰지 않고 충돌
+    assert saved.version == sample_account.version + 1
+    with pytest.raises(VersionConflictException):
+        account_repo.save(tab_b)
+    assert account_repo.get(sample_account.id).name == "A에서 수정"
+
+
+def test_asset_save_after_trade_update_conflicts(session, asset_repo, sample_account):
+    # Given — 편집 화면이 읽은 뒤 거래가 수량을 바꿈
+    asset = asset_repo.save(Asset(account_id=sample_account.id, name="S", quantity=1.0))
+    traded = asset_repo.apply_trade(asset.id, 1, 100.0)
+    session.commit()
+
+    # When / Then
+    assert traded.version == asset.version + 1
+    asset.target_weight = 50.0
+    with pytest.raises(VersionConflictException):
+        asset_repo.save(asset)
+    assert asset_repo.get(asset.id).quantity == 2.0
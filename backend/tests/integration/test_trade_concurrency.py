@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+from sqlmodel import Session, SQLModel, create_engine
+from src.snowball.adapters.db.models import AccountModel, AssetModel, UserModel
+from src.snowball.adapters.db.repositories import SqlAlchemyUnitOfWork
+from src.snowball.domain.entities import UserId
+from src.snowball.domain.exceptions import InsufficientFundsException
+from src.snowball.use_cases.trade import ExecuteTradeUseCase
+
+WORKERS = 4
+TRADES_PER_WORKER = 10
+
+def test_parallel_trades_lose_no_updates(tmp_path):
+    # Given: File-backed DB shared by several connections; cash for all but 3 trades
+    engine = create_engine(f"sqlite:///{tmp_path / 'trades.db'}", connect_args={"check_same_thread": False})
+    SQLModel.metadata.create_all(engine)
+    user_id = UserId(uuid4())
+    total = WORKERS * TRADES_PER_WORKER
+    with Session(engine) as session:
+        session.add(UserModel(id=user_id, email="race@test.com", password_hash="h"))
+        account = AccountModel(name="계좌", cash=float(total - 3), user_id=user_id)
+        session.add(account)
+        session.commit()
+        asset = AssetModel(account_id=account.id, name="S", quantity=0.0, avg_price=0.0)
+        session.add(asset)
+        session.commit()
+        account_id, asset_id = account.id, asset.id
+
+    def worker(_):
+        rejected = 0
+        for _ in range(TRADES_PER_WORKER):
+            with Session(engine) as session:
+                try:
+                    ExecuteTradeUseCase(SqlAlchemyUnitOfWork(session), max_attempts=50).execute(asset_id, 1, 1.0, user_id)
+                except InsufficientFundsException:
+                    rejected += 1
+        return rejected
+
+    # When: Workers buy 1 unit @ 1 concurrently
+    with ThreadPoolExecutor(WORKERS) as pool:
+        rejected = sum(pool.map(worker, range(WORKERS)))
+
+    # Then: Every accepted trade is reflected exactly once and cash never went negative
+    with Session(engine) as session:
+        account = session.get(AccountModel, account_id)
+        asset = session.get(AssetModel, asset_id)
+        assert rejected == 3
+        assert account.cash == 0.0
+        assert asset.quantity == total - 3
+    engine.dispose()
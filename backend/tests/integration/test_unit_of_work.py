@@ -0,0 +1,102 @@
+import pytest
+from sqlalchemy import event
+from sqlmodel import Session, select
+from src.snowball.adapters.db.repositories import SqlAlchemyUnitOfWork
+from src.snowball.adapters.db.models import AccountModel, AssetModel, UserModel
+from src.snowball.domain.entities import Account, Asset, UserId
+
+@pytest.fixture
+def user_id(session: Session):
+    user = UserModel(email="uow@test.com", password_hash="hash")
+    session.add(user)
+    session.commit()
+    return UserId(user.id)
+
+@pytest.fixture
+def seeded(session: Session, user_id):
+    account = AccountModel(name="계좌", cash=1000.0, user_id=user_id)
+    session.add(account)
+    session.commit()
+    asset = AssetModel(account_id=account.id, name="삼성전자", code="005930", quantity=1.0)
+    session.add(asset)
+    session.commit()
+    return account.id, asset.id
+
+@pytest.fixture
+def commits(session: Session):
+    counter = []
+
+    def record(s):
+        counter.append(s)
+
+    event.listen(session, "after_commit", record)
+    yield counter
+    event.remove(session, "after_commit", record)
+
+def test_repeated_lookups_come_from_memory(session, user_id, seeded, count_queries):
+    # Given
+    account_id, asset_id = seeded
+    with SqlAlchemyUnitOfWork(session) as uow:
+        asset = uow.assets.get_asset_for_user(asset_id, user_id)
+        account = uow.accounts.get_account_for_user(account_id, user_id)
+
+        # When
+        with count_queries() as statements:
+            again = uow.assets.get_asset_for_user(asset_id, user_id)
+            account_again = uow.accounts.get(account_id)
+            by_plain_get = uow.assets.get(asset_id)
+
+    # Then — 같은 객체, 추가 쿼리 없음, 계좌의 자산 목록과도 동일 객체
+    assert statements == []
+    assert again is asset is by_plain_get
+    assert account_again is account
+    assert account.assets[0] is asset
+
+def test_writes_are_committed_once_at_the_end(session, user_id, seeded, commits):
+    # Given
+    account_id, asset_id = seeded
+
+    # When
+    with SqlAlchemyUnitOfWork(session) as uow:
+        account = uow.accounts.get(account_id)
+        account.cash = 500.0
+        uow.accounts.save(account)
+        new_asset = uow.assets.save(Asset(account_id=account_id, name="Apple", code="AAPL", quantity=2.0))
+        assert commits == []
+
+    # Then
+    assert len(commits) == 1
+    assert session.get(AccountModel, account_id).cash == 500.0
+    assert new_asset in account.assets
+    assert len(session.exec(select(AssetModel).where(AssetModel.account_id == account_id)).all()) == 2
+
+def test_exception_rolls_back_every_write(session, user_id, seeded, commits):
+    # Given
+    account_id, asset_id = seeded
+
+    # When
+    with pytest.raises(RuntimeError):
+        with SqlAlchemyUnitOfWork(session) as uow:
+            account = uow.accounts.get(account_id)
+            account.cash = 0.0
+            uow.accounts.save(account)
+            uow.assets.delete(asset_id)
+            raise RuntimeError("boom")
+
+    # Then
+    assert commits == []
+    assert session.get(AccountModel, account_id).cash == 1000.0
+    assert session.get(AssetModel, asset_id) is not None
+
+def test_trade_updates_the_cached_asset_in_place(session, user_id, seeded):
+    # Given — 계좌를 먼저 읽어 자산이 identity map에 올라가 있음
+    account_id, asset_id = seeded
+    with SqlAlchemyUnitOfWork(session) as uow:
+        account = uow.accounts.get_account_for_user(account_id, user_id)
+
+        # When
+        uow.assets.apply_trade(asset_id, 1, 70000.0)
+
+    # Then — 재조회 없이도 수량·평균단가·현재가가 체결 결과를 반영
+    assert (account.assets[0].quantity, account.assets[0].current_price) == (2.0, 70000.0)
+    assert session.get(AssetModel, asset_id).current_price == 70000.0
@@ -0,0 +1,131 @@
+import asyncio
+import httpx
+from unittest.mock import AsyncMock, MagicMock
+from src.snowball.adapters.external.async_market_data import AsyncRealMarketDataProvider
+from src.snowball.adapters.external.cache import AsyncCachedMarketDataProvider, QuoteCache
+from src.snowball.adapters.external.history import PriceHistory
+from src.snowball.adapters.external.resilience import CircuitBreaker, TokenBucket, UpstreamGuard
+from src.snowball.adapters.external.singleflight import AsyncSingleFlight
+from src.snowball.domain.ports import AsyncMarketDataProvider
+
+NAVER_PAGE = (
+    '<div class="wrap_company"><h2><a>삼성전자</a></h2></div>'
+    '<p class="no_today"><em><span class="blind">71,500</span></em></p>'
+)
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+def test_should_scrape_naver_without_blocking_event_loop():
+    # Given: An async client answering with a Naver item page
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, text=NAVER_PAGE)
+
+    history = MagicMock(spec=PriceHistory)
+
+    async def scenario():
+        provider = AsyncRealMarketDataProvider(client=_client(handler), history=history)
+        return await provider.fetch_asset_info("005930")
+
+    # When
+    info = asyncio.run(scenario())
+
+    # Then: Naver answered and the FDR fallback was not needed
+    assert info == {"name": "삼성전자", "price": 71500.0}
+    assert requested == ["https://finance.naver.com/item/main.naver?code=005930"]
+    history.latest_close.assert_not_called()
+
+def test_should_fall_back_to_history_for_overseas_codes():
+    # Given: A non-numeric code
+    history = MagicMock(spec=PriceHistory)
+    history.latest_close.return_value = 190.0
+
+    async def scenario():
+        provider = AsyncRealMarketDataProvider(client=_client(lambda r: httpx.Response(500)), history=history)
+        return await provider.fetch_price("AAPL")
+
+    # When/Then: The close comes from local history
+    assert asyncio.run(scenario()) == 190.0
+    history.latest_close.assert_called_once_with("AAPL")
+
+def test_should_handle_many_outstanding_lookups_concurrently():
+    # Given: An upstream that takes 50ms per response
+    async def handler(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, text=NAVER_PAGE)
+
+    unthrottled = UpstreamGuard(CircuitBreaker("naver"), TokenBucket(rate=1e6, capacity=1e6))
+
+    async def scenario():
+        provider = AsyncRealMarketDataProvider(
+            client=_client(handler), history=MagicMock(spec=PriceHistory), naver=unthrottled
+        )
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await asyncio.gather(*(provider.fetch_price(f"{i:06d}") for i in range(200)))
+        return results, loop.time() - started
+
+    # When: 200 lookups are outstanding at once
+    results, elapsed = asyncio.run(scenario())
+
+    # Then: They overlap instead of queueing (serial would take 10s)
+    assert results == [71500.0] * 200
+    assert elapsed < 2.0
+
+def test_async_single_flight_should_coalesce_same_code():
+    # Given: A slow upstream fetch
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 70000.0
+
+    async def scenario():
+        flights = AsyncSingleFlight()
+        results = await asyncio.gather(*(flights.do("005930", fetch) for _ in range(20)))
+        return results, flights.stats()
+
+    # When: Twenty coroutines ask for the same key
+    results, stats = asyncio.run(scenario())
+
+    # Then: Upstream ran once
+    assert len(calls) == 1
+    assert results == [70000.0] * 20
+    assert stats == {"in_flight": 0, "executions": 1, "coalesced": 19}
+
+def test_async_cache_should_share_quote_cache():
+    # Given: A QuoteCache warmed by another stack
+    quotes = QuoteCache()
+    quotes.set(("price", "005930"), 70000.0, ttl=30)
+    inner = AsyncMock(spec=AsyncMarketDataProvider)
+    provider = AsyncCachedMarketDataProvider(inner, quotes)
+
+    # When/Then: The async stack serves the hit without touching upstream
+    assert asyncio.run(provider.fetch_price("005930")) == 70000.0
+    inner.fetch_price.assert_not_called()
+
+def test_async_cache_should_retry_after_an_upstream_timeout():
+    # Given: Naver times out once, then answers; FDR has nothing
+    responses = iter([httpx.ReadTimeout("slow"), httpx.Response(200, text=NAVER_PAGE)])
+
+    def handler(request):
+        response = next(responses)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    history = MagicMock(spec=PriceHistory)
+    history.latest_close.return_value = None
+    unthrottled = UpstreamGuard(CircuitBreaker("naver"), TokenBucket(rate=1e6, capacity=1e6))
+
+    async def scenario():
+        source = AsyncRealMarketDataProvider(client=_client(handler), history=history, naver=unthrottled)
+        provider = AsyncCachedMarketDataProvider(source, QuoteCache())
+        return await provider.fetch_price("005930"), await provider.fetch_price("005930")
+
+    # When/Then: The timeout is not cached as an unknown code
+    assert asyncio.run(scenario()) == (None, 71500.0)
@@ -0,0 +1,110 @@
+import threading
+import time
+from unittest.mock import MagicMock
+from src.snowball.adapters.external.cache import CachedMarketDataProvider, QuoteCache
+from src.snowball.adapters.external.history import PriceHistory
+from src.snowball.adapters.external.market_data import RealMarketDataProvider
+from src.snowball.adapters.external.transport import HttpTransport
+from src.snowball.domain.ports import MarketDataProvider
+
+def _provider(**kwargs) -> RealMarketDataProvider:
+    return RealMarketDataProvider(
+        transport=MagicMock(spec=HttpTransport), history=MagicMock(spec=PriceHistory), **kwargs
+    )
+
+def test_should_fetch_each_source_on_its_own_pool():
+    # Given: KRX and overseas codes, with duplicates and an invalid code
+    provider = _provider()
+    pools = {}
+
+    def fetch(code):
+        pools[code] = threading.current_thread().name.split("_")[0]
+        return 1.0
+
+    provider.fetch_price = fetch
+
+    # When
+    prices = provider.fetch_prices(["005930", "AAPL", "005930", "069500", "bad code!"])
+
+    # Then: Each valid code fetched once, on the pool for its source
+    assert prices == {"005930": 1.0, "069500": 1.0, "AAPL": 1.0}
+    assert pools == {"005930": "prices-krx", "069500": "prices-krx", "AAPL": "prices-overseas"}
+
+def test_should_parallelize_within_group_up_to_max_workers():
+    # Given: Ten KRX codes and three workers per source
+    provider = _provider(max_workers=3)
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def fetch(code):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return 1.0
+
+    provider.fetch_price = fetch
+
+    # When
+    prices = provider.fetch_prices([f"{i:06d}" for i in range(10)])
+
+    # Then: Work overlapped but never exceeded the limit
+    assert len(prices) == 10
+    assert 1 < peak <= 3
+
+def test_should_return_partial_results_when_a_code_is_slow():
+    # Given: One code hangs well past the batch timeout
+    release = threading.Event()
+    provider = _provider(batch_timeout=0.2)
+
+    def fetch(code):
+        if code == "000660":
+            release.wait(5)
+        return 100.0
+
+    provider.fetch_price = fetch
+
+    # When
+    started = time.perf_counter()
+    prices = provider.fetch_prices(["005930", "000660", "AAPL"])
+    elapsed = time.perf_counter() - started
+    release.set()
+
+    # Then: The rest of the batch came back without waiting for it
+    assert prices == {"005930": 100.0, "AAPL": 100.0}
+    assert elapsed < 2.0
+
+def test_should_omit_codes_that_fail_or_resolve_to_nothing():
+    # Given: One code raises and one is unknown upstream
+    provider = _provider()
+
+    def fetch(code):
+        if code == "BOOM":
+            raise RuntimeError("upstream down")
+        return None if code == "NONE" else 5.0
+
+    provider.fetch_price = fetch
+
+    # When/Then
+    assert provider.fetch_prices(["OK", "NONE", "BOOM"]) == {"OK": 5.0}
+
+def test_cached_batch_should_only_fetch_misses():
+    # Given: One code already cached
+    inner = MagicMock(spec=MarketDataProvider)
+    inner.fetch_prices.return_value = {"AAPL": 190.0}
+    quotes = QuoteCache()
+    quotes.set(("price", "005930"), 70000.0, ttl=30)
+    provider = CachedMarketDataProvider(inner, quotes)
+
+    # When
+    prices = provider.fetch_prices(["005930", "AAPL", "MSFT"])
+
+    # Then: Upstream saw only the misses; the new price is cached, the gap is not
+    assert prices == {"005930": 70000.0, "AAPL": 190.0}
+    inner.fetch_prices.assert_called_once_with(["AAPL", "MSFT"])
+    assert quotes.get(("price", "AAPL")) == (True, 190.0)
+    assert quotes.get(("price", "MSFT")) == (False, None)
@@ -0,0 +1,62 @@
+from unittest.mock import MagicMock, patch
+from src.snowball.adapters.external.transport import HttpTransport
+from src.snowball.adapters.external.market_data import RealMarketDataProvider
+
+def test_should_mount_bounded_keep_alive_pool_with_jittered_retries():
+    # Given/When: A transport with explicit pool and retry settings
+    transport = HttpTransport(pool_connections=2, pool_maxsize=5, max_retries=3, backoff_jitter=0.4)
+
+    # Then: Both schemes share one blocking, size-limited pool
+    adapter = transport.session.get_adapter("https://finance.naver.com")
+    assert adapter is transport.adapter
+    assert adapter._pool_maxsize == 5
+    assert adapter._pool_block is True
+    # And: Retries back off with jitter
+    assert adapter.max_retries.total == 3
+    assert adapter.max_retries.backoff_jitter == 0.4
+    assert 503 in adapter.max_retries.status_forcelist
+
+def test_should_apply_default_timeouts_unless_overridden():
+    # Given: A transport whose session is stubbed out
+    transport = HttpTransport(connect_timeout=1.0, read_timeout=2.0)
+    transport.session = MagicMock()
+
+    # When: Issuing requests with and without an explicit timeout
+    transport.get("https://example.com/a")
+    transport.get("https://example.com/b", timeout=9)
+
+    # Then: The default (connect, read) pair is used only when none is given
+    assert transport.session.get.call_args_list[0].kwargs["timeout"] == (1.0, 2.0)
+    assert transport.session.get.call_args_list[1].kwargs["timeout"] == 9
+
+def test_provider_should_close_only_the_transport_it_owns():
+    # Given: One provider with its own transport, one with a shared transport
+    shared = MagicMock(spec=HttpTransport)
+    with patch("src.snowball.adapters.external.market_data.HttpTransport") as transport_cls:
+        owning = RealMarketDataProvider()
+    borrowing = RealMarketDataProvider(transport=shared)
+
+    # When: Both providers are closed
+    owning.close()
+    borrowing.close()
+
+    # Then: The shared transport is left open for its owner
+    transport_cls.return_value.close.assert_called_once()
+    shared.close.assert_not_called()
+
+def test_scrape_should_use_pooled_transport():
+    # Given: A provider backed by a stub transport returning a Naver-like page
+    transport = MagicMock(spec=HttpTransport)
+    transport.get.return_value = MagicMock(
+        status_code=200,
+        text='<div class="wrap_company"><h2><a>삼성전자</a></h2></div>'
+             '<p class="no_today"><em><span class="blind">71,500</span></em></p>',
+    )
+    provider = RealMarketDataProvider(transport=transport)
+
+    # When
+    result = provider.scrape_naver_finance("005930")
+
+    # Then: The request went through the shared pool
+    assert result == {"name": "삼성전자", "price": 71500.0}
+    transport.get.assert_called_once_with("https://finance.naver.com/item/main.naver?code=005930")
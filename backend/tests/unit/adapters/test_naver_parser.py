@@ -0,0 +1,76 @@
+import pytest
+from pathlib import Path
+from lxml import etree
+from src.snowball.adapters.external import naver
+from src.snowball.adapters.external.naver import parse_naver_quote
+
+FIXTURES = Path(__file__).parents[2] / "fixtures" / "naver"
+
+QUOTE_BLOCK = (
+    '<div class="wrap_company"><h2><a href="#">{name}</a></h2></div>'
+    '<div class="rate_info"><p class="no_today"><em class="no_up">'
+    '<span class="blind">{price}</span><span class="no7">7</span></em></p></div>'
+)
+
+@pytest.mark.parametrize("fixture,expected", [
+    ("005930.html", {"name": "삼성전자", "price": 71500.0}),
+    ("069500.html", {"name": "KODEX 200", "price": 36215.0}),
+    ("not_found.html", None),
+])
+def test_should_extract_quote_from_saved_pages(fixture, expected):
+    # Given: A saved Naver item page
+    html = (FIXTURES / fixture).read_text(encoding="utf-8")
+
+    # When
+    result = parse_naver_quote(html)
+
+    # Then
+    assert result == expected
+
+@pytest.mark.parametrize("html", [
+    QUOTE_BLOCK.format(name="삼성전자", price="0"),                         # zero price
+    QUOTE_BLOCK.format(name="", price="71,500"),                            # missing name
+    '<div class="wrap_company"><h2><a>삼성전자</a></h2></div>',              # no price block
+    '<h2><a>삼성전자</a></h2><p class="no_today"><span class="blind">1</span></p>',  # h2 outside wrap_company
+])
+def test_should_return_none_when_quote_incomplete(html):
+    # Given/When/Then: Incomplete quote blocks are rejected like the selector-based parser did
+    assert parse_naver_quote(html) is None
+
+def test_should_ignore_blind_spans_outside_no_today():
+    # Given: A .blind span (e.g. 전일) before the current price block
+    html = (
+        '<table class="no_info"><span class="blind">70,300</span></table>'
+        + QUOTE_BLOCK.format(name="삼성전자", price="71,500")
+    )
+
+    # When/Then: Only the .no_today price is used
+    assert parse_naver_quote(html) == {"name": "삼성전자", "price": 71500.0}
+
+def test_should_handle_quote_split_across_chunks(monkeypatch):
+    # Given: A tiny chunk size so tags straddle feed boundaries
+    monkeypatch.setattr(naver, "_CHUNK_SIZE", 7)
+    html = "<html><body>" + QUOTE_BLOCK.format(name="카카오", price="41,850") + "</body></html>"
+
+    # When/Then
+    assert parse_naver_quote(html) == {"name": "카카오", "price": 41850.0}
+
+def test_should_stop_feeding_once_both_values_found(monkeypatch):
+    # Given: A quote block followed by a long page tail
+    fed = []
+
+    class CountingParser(etree.HTMLPullParser):
+        def feed(self, data):
+            fed.append(len(data))
+            return super().feed(data)
+
+    monkeypatch.setattr(naver.etree, "HTMLPullParser", CountingParser)
+    monkeypatch.setattr(naver, "_CHUNK_SIZE", 1024)
+    html = QUOTE_BLOCK.format(name="삼성전자", price="71,500") + "<p>tail</p>" * 10_000
+
+    # When
+    result = parse_naver_quote(html)
+
+    # Then: Only the first chunk was parsed
+    assert result == {"name": "삼성전자", "price": 71500.0}
+    assert len(fed) == 1
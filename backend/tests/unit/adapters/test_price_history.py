@@ -0,0 +1,104 @@
+import pandas as pd
+import pytest
+from datetime import date
+from src.snowball.adapters.external.history import PriceHistory, PriceHistoryStore
+
+TODAY = date(2026, 4, 10)
+
+def _frame(rows):
+    index = pd.DatetimeIndex([pd.Timestamp(d) for d, _ in rows])
+    return pd.DataFrame({"Close": [c for _, c in rows]}, index=index)
+
+class FakeReader:
+    def __init__(self, rows):
+        self.rows = rows
+        self.starts = []
+
+    def __call__(self, code, start):
+        self.starts.append(start)
+        return _frame([r for r in self.rows if r[0] >= date.fromisoformat(start)])
+
+@pytest.fixture
+def store(tmp_path):
+    return PriceHistoryStore(tmp_path)
+
+def test_store_should_round_trip_and_read_tail(store):
+    # Given: Three bars appended
+    bars = [(date(2026, 4, 7), 100.0), (date(2026, 4, 8), 101.5), (date(2026, 4, 9), 99.25)]
+
+    # When
+    written = store.append("AAPL", bars)
+
+    # Then: The full series and the tail are readable
+    assert written == 3
+    assert store.read("AAPL") == bars
+    assert store.last_bar("AAPL") == (date(2026, 4, 9), 99.25)
+    assert store.path("AAPL").stat().st_size == 36
+
+def test_store_should_replace_tail_bar_with_same_date(store):
+    # Given: A stored intraday close for the latest date
+    store.append("AAPL", [(date(2026, 4, 8), 100.0), (date(2026, 4, 9), 50.0)])
+
+    # When: The same date arrives again with the final close, plus a new day
+    store.append("AAPL", [(date(2026, 4, 8), 999.0), (date(2026, 4, 9), 55.0), (date(2026, 4, 10), 56.0)])
+
+    # Then: Older bars are untouched, the tail is replaced, the new bar appended
+    assert store.read("AAPL") == [(date(2026, 4, 8), 100.0), (date(2026, 4, 9), 55.0), (date(2026, 4, 10), 56.0)]
+
+def test_first_sync_should_request_only_recent_window(store):
+    # Given: An empty store
+    reader = FakeReader([(date(2026, 4, 9), 190.0)])
+    history = PriceHistory(store, window_days=14, reader=reader, today=lambda: TODAY)
+
+    # When
+    price = history.latest_close("AAPL")
+
+    # Then: Only the window was requested
+    assert price == 190.0
+    assert reader.starts == ["2026-03-27"]
+
+def test_later_sync_should_fetch_from_stored_tail(store):
+    # Given: History already synced up to 2026-04-08
+    store.append("AAPL", [(date(2026, 4, 7), 180.0), (date(2026, 4, 8), 185.0)])
+    reader = FakeReader([(date(2026, 4, 8), 186.0), (date(2026, 4, 9), 190.0)])
+    history = PriceHistory(store, refresh_interval=0, reader=reader, today=lambda: TODAY)
+
+    # When
+    price = history.latest_close("AAPL")
+
+    # Then: Only bars from the tail date onward were requested
+    assert reader.starts == ["2026-04-08"]
+    assert price == 190.0
+    assert len(store.read("AAPL")) == 3
+
+def test_fresh_store_should_serve_latest_close_without_network(store):
+    # Given: A store synced moments ago
+    store.append("AAPL", [(date(2026, 4, 9), 190.0)])
+    reader = FakeReader([])
+    history = PriceHistory(store, refresh_interval=600, reader=reader, today=lambda: TODAY)
+
+    # When
+    price = history.latest_close("AAPL")
+
+    # Then: No upstream request was made
+    assert price == 190.0
+    assert reader.starts == []
+
+def test_failed_sync_should_fall_back_to_stored_close(store):
+    # Given: Stored history and a failing upstream
+    store.append("AAPL", [(date(2026, 4, 9), 190.0)])
+
+    def broken_reader(code, start):
+        raise ConnectionError("down")
+
+    history = PriceHistory(store, refresh_interval=0, reader=broken_reader, today=lambda: TODAY)
+
+    # When/Then: The last known close is returned
+    assert history.latest_close("AAPL") == 190.0
+
+def test_unknown_code_should_return_none(store):
+    # Given: Upstream has no data for the code
+    history = PriceHistory(store, reader=FakeReader([]), today=lambda: TODAY)
+
+    # When/Then
+    assert history.latest_close("NOPE") is None
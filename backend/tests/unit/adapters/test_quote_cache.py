@@ -0,0 +1,149 @@
+import pytest
+from unittest.mock import MagicMock
+from src.snowball.adapters.external.cache import CachedMarketDataProvider, QuoteCache
+from src.snowball.domain.exceptions import MarketDataUnavailableException
+from src.snowball.domain.ports import MarketDataProvider
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def inner():
+    provider = MagicMock(spec=MarketDataProvider)
+    provider.fetch_price.return_value = 70000.0
+    provider.fetch_asset_info.return_value = {"name": "삼성전자", "price": 70000.0}
+    return provider
+
+def test_should_serve_repeated_price_lookups_from_cache(inner, clock):
+    # Given: A cached provider in front of a slow upstream
+    provider = CachedMarketDataProvider(inner, QuoteCache(clock=clock), price_ttl=30)
+
+    # When: The same code is requested twice
+    first = provider.fetch_price("005930")
+    second = provider.fetch_price("005930")
+
+    # Then: Upstream is hit once and the second call is a cache hit
+    assert first == second == 70000.0
+    inner.fetch_price.assert_called_once_with("005930")
+    assert provider.stats()["hits"] == 1
+    assert provider.stats()["misses"] == 1
+
+def test_should_expire_price_and_info_on_separate_ttls(inner, clock):
+    # Given: Short price TTL, long info TTL, both warmed
+    provider = CachedMarketDataProvider(inner, QuoteCache(clock=clock), price_ttl=10, info_ttl=100)
+    provider.fetch_price("005930")
+    provider.fetch_asset_info("005930")
+
+    # When: Time passes beyond the price TTL only
+    clock.now += 11
+    provider.fetch_price("005930")
+    provider.fetch_asset_info("005930")
+
+    # Then: Price is refetched but info is still cached
+    assert inner.fetch_price.call_count == 2
+    assert inner.fetch_asset_info.call_count == 1
+
+def test_should_evict_least_recently_used_entry(inner, clock):
+    # Given: A cache with room for two entries
+    provider = CachedMarketDataProvider(inner, QuoteCache(maxsize=2, clock=clock))
+    provider.fetch_price("A")
+    provider.fetch_price("B")
+    provider.fetch_price("A")  # A becomes most recently used
+
+    # When: A third code is cached
+    provider.fetch_price("C")
+
+    # Then: B was evicted, A survives
+    provider.fetch_price("A")
+    provider.fetch_price("B")
+    assert [c.args[0] for c in inner.fetch_price.call_args_list] == ["A", "B", "C", "B"]
+    assert provider.stats()["evictions"] >= 1
+
+def test_should_negative_cache_unresolved_codes_on_own_ttl(inner, clock):
+    # Given: Upstream cannot resolve the code
+    inner.fetch_price.return_value = None
+    provider = CachedMarketDataProvider(inner, QuoteCache(clock=clock), price_ttl=30, negative_ttl=300)
+
+    # When: Looking it up twice within the negative TTL
+    provider.fetch_price("NOPE")
+    second = provider.fetch_price("NOPE")
+
+    # Then: Upstream was asked once and the miss was served from cache
+    assert second is None
+    assert inner.fetch_price.call_count == 1
+    assert provider.stats()["negative_hits"] == 1
+
+    # When: The negative TTL elapses
+    clock.now += 301
+    provider.fetch_price("NOPE")
+
+    # Then: Upstream is retried
+    assert inner.fetch_price.call_count == 2
+
+@pytest.mark.parametrize("code", ["", "5930", "삼성전자", "AAPL US", "../etc/passwd", "A" * 13])
+def test_should_reject_malformed_codes_without_upstream_call(inner, clock, code):
+    # Given: A cached provider
+    provider = CachedMarketDataProvider(inner, QuoteCache(clock=clock))
+
+    # When/Then: Malformed codes resolve to None locally
+    assert provider.fetch_price(code) is None
+    assert provider.fetch_asset_info(code) is None
+    inner.fetch_price.assert_not_called()
+    inner.fetch_asset_info.assert_not_called()
+
+def test_should_return_copies_of_cached_info(inner, clock):
+    # Given: A warmed info entry
+    provider = CachedMarketDataProvider(inner, QuoteCache(clock=clock))
+    provider.fetch_asset_info("005930")
+
+    # When: A caller mutates the returned dict
+    provider.fetch_asset_info("005930")["category"] = "주식"
+
+    # Then: The cached value is unaffected
+    assert "category" not in provider.fetch_asset_info("005930")
+
+def test_should_invalidate_single_code_or_everything(inner, clock):
+    # Given: Two codes cached for both price and info
+    provider = CachedMarketDataProvider(inner, QuoteCache(clock=clock))
+    for code in ("A", "B"):
+        provider.fetch_price(code)
+        provider.fetch_asset_info(code)
+
+    # When/Then: Invalidating one code drops only its entries
+    assert provider.invalidate("A") == 2
+    assert provider.stats()["size"] == 2
+    # When/Then: Invalidating without a code clears the cache
+    assert provider.invalidate() == 2
+    assert provider.stats()["size"] == 0
+
+def test_should_not_negative_cache_an_upstream_failure(inner, clock):
+    # Given: The first lookup times out upstream, the second succeeds
+    inner.fetch_price.side_effect = [MarketDataUnavailableException("timeout"), 70000.0]
+    provider = CachedMarketDataProvider(inner, QuoteCache(clock=clock), negative_ttl=300)
+
+    # When: The code is looked up again right away
+    first = provider.fetch_price("005930")
+    second = provider.fetch_price("005930")
+
+    # Then: The failure reads as None but was not remembered
+    assert first is None
+    assert second == 70000.0
+    assert inner.fetch_price.call_count == 2
+    assert provider.stats()["negative_hits"] == 0
+
+def test_should_not_negative_cache_info_while_upstream_is_down(inner, clock):
+    # Given: Breaker open on the first lookup
+    inner.fetch_asset_info.side_effect = [MarketDataUnavailableException("breaker open"), {"name": "삼성전자"}]
+    provider = CachedMarketDataProvider(inner, QuoteCache(clock=clock))
+
+    # When/Then
+    assert provider.fetch_asset_info("005930") is None
+    assert provider.fetch_asset_info("005930") == {"name": "삼성전자"}
@@ -0,0 +1,272 @@
+import pytest
+from datetime import date
+from unittest.mock import MagicMock
+from src.snowball.adapters.external.cache import CachedMarketDataProvider
+from src.snowball.adapters.external.history import PriceHistory, PriceHistoryStore
+from src.snowball.adapters.external.market_data import RealMarketDataProvider
+from src.snowball.adapters.external.resilience import (
+    BreakerState, CircuitBreaker, TokenBucket, UpstreamGuard
+)
+from src.snowball.adapters.external.transport import HttpTransport
+from src.snowball.domain.exceptions import MarketDataUnavailableException
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def test_breaker_should_open_after_consecutive_failures(clock):
+    # Given: A breaker tripping after 3 failures
+    breaker = CircuitBreaker("naver", failure_threshold=3, reset_timeout=30, clock=clock)
+
+    # When: Three calls fail in a row
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+
+    # Then: Further calls are refused
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.allow()
+    assert breaker.snapshot()["rejected"] == 1
+
+def test_breaker_should_reset_failure_count_on_success(clock):
+    # Given: Two failures, then a success
+    breaker = CircuitBreaker("naver", failure_threshold=3, clock=clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+
+    # When: Another failure happens
+    breaker.record_failure()
+
+    # Then: The circuit stays closed (failures are consecutive only)
+    assert breaker.state is BreakerState.CLOSED
+
+def test_breaker_should_probe_after_reset_timeout(clock):
+    # Given: An open breaker
+    breaker = CircuitBreaker("naver", failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+
+    # When: The reset timeout elapses
+    clock.now += 30
+
+    # Then: Exactly one probe passes in half-open state
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # When/Then: A failed probe re-opens, a successful one closes
+    breaker.record_failure()
+    assert breaker.state is BreakerState.OPEN
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED
+
+def test_token_bucket_should_allow_burst_then_pace(clock):
+    # Given: 2 tokens/sec with a burst of 2
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+    # When/Then: The burst is free, the next token needs half a second
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve(max_wait=0.1) is None
+    assert bucket.reserve(max_wait=1.0) == pytest.approx(0.5)
+
+    # When/Then: Refill over time
+    clock.now += 10
+    assert bucket.reserve() == 0.0
+    assert bucket.snapshot()["throttled"] == 1
+
+def test_provider_should_skip_naver_while_breaker_open():
+    # Given: Naver's breaker is open and FDR history has a close
+    breaker = CircuitBreaker("naver", failure_threshold=1)
+    breaker.record_failure()
+    transport = MagicMock(spec=HttpTransport)
+    history = MagicMock(spec=PriceHistory)
+    history.latest_close.return_value = 70500.0
+    provider = RealMarketDataProvider(
+        transport=transport, history=history,
+        naver=UpstreamGuard(breaker, TokenBucket(rate=100, capacity=100)),
+    )
+
+    # When
+    price = provider.fetch_price("005930")
+
+    # Then: No Naver request, straight to the fallback
+    assert price == 70500.0
+    transport.get.assert_not_called()
+
+def test_provider_should_trip_breaker_on_server_errors():
+    # Given: Naver answers 503
+    transport = MagicMock(spec=HttpTransport)
+    transport.get.return_value = MagicMock(status_code=503)
+    guard = UpstreamGuard(CircuitBreaker("naver", failure_threshold=2), TokenBucket(rate=100, capacity=100))
+    provider = RealMarketDataProvider(transport=transport, history=MagicMock(spec=PriceHistory), naver=guard)
+
+    # When: Three lookups are made
+    for _ in range(3):
+        provider.scrape_naver_finance("005930")
+
+    # Then: The third never reached Naver
+    assert transport.get.call_count == 2
+    assert guard.snapshot()["state"] == "open"
+
+def test_history_should_serve_stored_close_while_fdr_breaker_open(tmp_path):
+    # Given: Stored history and an open FDR breaker
+    store = PriceHistoryStore(tmp_path)
+    store.append("AAPL", [(date(2026, 4, 9), 190.0)])
+    breaker = CircuitBreaker("fdr", failure_threshold=1)
+    breaker.record_failure()
+    reader = MagicMock()
+    history = PriceHistory(store, refresh_interval=0, reader=reader, breaker=breaker)
+
+    # When/Then: The stored close is returned without calling FDR
+    assert history.latest_close("AAPL") == 190.0
+    reader.assert_not_called()
+
+def test_provider_should_raise_when_naver_is_skipped_and_history_has_nothing():
+    # Given: Naver's breaker is open and FDR has no close for the code
+    breaker = CircuitBreaker("naver", failure_threshold=1)
+    breaker.record_failure()
+    history = MagicMock(spec=PriceHistory)
+    history.latest_close.return_value = None
+    provider = RealMarketDataProvider(
+        transport=MagicMock(spec=HttpTransport), history=history,
+        naver=UpstreamGuard(breaker, TokenBucket(rate=100, capacity=100)),
+    )
+
+    # When/Then: Not "unknown code", but "could not ask"
+    with pytest.raises(MarketDataUnavailableException):
+        provider.fetch_price("005930")
+    with pytest.raises(MarketDataUnavailableException):
+        provider.fetch_asset_info("005930")
+
+def test_provider_should_return_none_when_every_source_says_unknown():
+    # Given: Naver answers 404 and FDR has no data
+    transport = MagicMock(spec=HttpTransport)
+    transport.get.return_value = MagicMock(status_code=404)
+    history = MagicMock(spec=PriceHistory)
+    history.latest_close.return_value = None
+    provider = RealMarketDataProvider(transport=transport, history=history)
+
+    # When/Then
+    assert provider.fetch_price("999999") is None
+
+def test_history_should_raise_when_sync_fails_with_nothing_stored(tmp_path):
+    # Given: No stored bars and an FDR outage
+    def broken_reader(code, start):
+        raise ConnectionError("down")
+
+    history = PriceHistory(PriceHistoryStore(tmp_path), refresh_interval=0, reader=broken_reader)
+
+    # When/Then
+    with pytest.raises(MarketDataUnavailableException):
+        history.latest_close("AAPL")
+    assert history.sync("AAPL") == 0
+
+def test_cached_stack_should_retry_after_an_upstream_timeout(tmp_path):
+    # Given: Cache over the real provider; Naver times out once, then answers
+    transport = MagicMock(spec=HttpTransport)
+    transport.get.side_effect = [
+        TimeoutError("read timeout"),
+        MagicMock(
+            status_code=200,
+            text='<div class="wrap_company"><h2><a>삼성전자</a></h2></div>'
+                 '<p class="no_today"><em><span class="blind">71,500</span></em></p>',
+        ),
+    ]
+    history = MagicMock(spec=PriceHistory)
+    history.latest_close.return_value = None
+    provider = CachedMarketDataProvider(RealMarketDataProvider(transport=transport, history=history))
+
+    # When/Then: The timeout is not remembered as an unknown code
+    assert provider.fetch_price("005930") is None
+    assert provider.fetch_price("005930") == 71500.0
+
+def test_guard_should_not_spend_tokens_on_calls_the_breaker_refuses(clock):
+    # Given: An open breaker and a one-token bucket
+    breaker = CircuitBreaker("naver", failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    guard = UpstreamGuard(breaker, TokenBucket(rate=0.001, capacity=1, clock=clock), max_wait=0)
+
+    # When: Several calls are refused while open
+    for _ in range(5):
+        assert guard.admit() is None
+
+    # Then: The token is still there for the half-open probe
+    clock.now += 30
+    assert guard.admit() == 0.0
+    assert guard.limiter.snapshot()["throttled"] == 0
+
+def test_guard_should_release_probe_slot_when_rate_limited(clock):
+    # Given: A half-open breaker and an empty bucket
+    breaker = CircuitBreaker("naver", failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 30
+    bucket = TokenBucket(rate=1, capacity=1, clock=clock)
+    bucket.reserve()
+    guard = UpstreamGuard(breaker, bucket, max_wait=0)
+
+    # When: The probe is throttled, then the bucket refills
+    assert guard.admit() is None
+    clock.now += 1
+
+    # Then: The probe slot was not lost
+    assert guard.admit() == 0.0
+
+def test_cancelled_probe_should_release_its_half_open_slot(clock):
+    # Given: A half-open Naver breaker and a request that never returns
+    import asyncio
+    import httpx
+    from src.snowball.adapters.external.async_market_data import AsyncRealMarketDataProvider
+
+    breaker = CircuitBreaker("naver", failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 30
+    guard = UpstreamGuard(breaker, TokenBucket(rate=100, capacity=100))
+
+    async def hang(request):
+        await asyncio.sleep(3600)
+
+    async def scenario():
+        provider = AsyncRealMarketDataProvider(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(hang)),
+            history=MagicMock(spec=PriceHistory), naver=guard,
+        )
+        task = asyncio.create_task(provider.scrape_naver_finance("005930"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # When: The probe is cancelled mid-flight
+    asyncio.run(scenario())
+
+    # Then: The breaker is still half-open with a free probe slot
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert breaker.allow()
+
+def test_interrupted_history_sync_should_release_probe_slot(tmp_path, clock):
+    # Given: A half-open FDR breaker and a reader interrupted mid-download
+    breaker = CircuitBreaker("fdr", failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 30
+
+    def interrupted(code, start):
+        raise KeyboardInterrupt
+
+    history = PriceHistory(PriceHistoryStore(tmp_path), reader=interrupted, breaker=breaker)
+
+    # When
+    with pytest.raises(KeyboardInterrupt):
+        history.sync("AAPL")
+
+    # Then
+    assert breaker.allow()
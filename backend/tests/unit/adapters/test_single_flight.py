@@ -0,0 +1,87 @@
+import threading
+import time
+from unittest.mock import MagicMock
+from src.snowball.adapters.external.singleflight import SingleFlight, SingleFlightMarketDataProvider
+from src.snowball.domain.ports import MarketDataProvider
+
+def _run_concurrently(n, target):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads
+
+def test_should_coalesce_concurrent_calls_for_same_key():
+    # Given: An upstream call that blocks until released
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(timeout=5)
+        return 70000.0
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("005930", fetch)))
+    leader.start()
+    while flights.stats()["in_flight"] == 0:
+        time.sleep(0.001)
+
+    # When: Nine more callers ask for the same key while it is in flight
+    followers = _run_concurrently(9, lambda: results.append(flights.do("005930", fetch)))
+    while flights.stats()["coalesced"] < 9:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(timeout=5)
+
+    # Then: Upstream ran once and every caller got its result
+    assert len(calls) == 1
+    assert results == [70000.0] * 10
+    assert flights.stats() == {"in_flight": 0, "executions": 1, "coalesced": 9}
+
+def test_should_share_exception_with_waiters_and_allow_retry():
+    # Given: A failing in-flight call with one waiter
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def broken():
+        release.wait(timeout=5)
+        raise ConnectionError("naver down")
+
+    errors = []
+
+    def call():
+        try:
+            flights.do("k", broken)
+        except ConnectionError as e:
+            errors.append(e)
+
+    threads = _run_concurrently(1, call)
+    while flights.stats()["in_flight"] == 0:
+        time.sleep(0.001)
+    threads += _run_concurrently(1, call)
+    while flights.stats()["coalesced"] < 1:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(timeout=5)
+
+    # Then: Both callers saw the error
+    assert len(errors) == 2
+    # And: The key is free again for the next attempt
+    assert flights.do("k", lambda: "ok") == "ok"
+
+def test_provider_should_hand_each_caller_its_own_info_dict():
+    # Given: A coalescing provider
+    inner = MagicMock(spec=MarketDataProvider)
+    inner.fetch_asset_info.return_value = {"name": "삼성전자", "price": 70000.0}
+    provider = SingleFlightMarketDataProvider(inner)
+
+    # When: The result is mutated by one caller
+    first = provider.fetch_asset_info("005930")
+    first["category"] = "주식"
+
+    # Then: The upstream object is untouched
+    assert "category" not in inner.fetch_asset_info.return_value
+    assert provider.fetch_price("005930") is inner.fetch_price.return_value
@@ -0,0 +1,224 @@
+import time
+import pandas as pd
+from unittest.mock import MagicMock
+from src.snowball.adapters.external.history import PriceHistory
+from src.snowball.adapters.external.market_data import RealMarketDataProvider
+from src.snowball.adapters.external.symbols import LocalSymbolMaster, SymbolIndex, SymbolSnapshot
+from src.snowball.adapters.external.transport import HttpTransport
+from src.snowball.domain.entities import Symbol
+from src.snowball.domain.ports import SymbolMaster
+
+SYMBOLS = [
+    Symbol("005930", "삼성전자", "KRX"),
+    Symbol("005935", "삼성전자우", "KRX"),
+    Symbol("069500", "KODEX 200", "ETF/KR"),
+    Symbol("305080", "TIGER 미국채10년선물", "ETF/KR"),
+    Symbol("AAPL", "Apple Inc", "NASDAQ"),
+    Symbol("AAL", "American Airlines Group Inc", "NASDAQ"),
+]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def _listings(frames):
+    def loader(market):
+        frame = frames[market]
+        if isinstance(frame, Exception):
+            raise frame
+        return frame
+    return loader
+
+def test_index_should_rank_code_matches_before_name_matches():
+    # Given
+    index = SymbolIndex(SYMBOLS)
+
+    # When/Then: Exact/prefix code first, then names, then later words of a name
+    assert [s.code for s in index.search("aa")] == ["AAL", "AAPL"]
+    assert [s.code for s in index.search("삼성")] == ["005930", "005935"]
+    assert [s.code for s in index.search("미국채")] == ["305080"]
+    assert [s.code for s in index.search("0059")] == ["005930", "005935"]
+
+def test_index_should_ignore_case_and_whitespace():
+    # Given
+    index = SymbolIndex(SYMBOLS)
+
+    # When/Then
+    assert [s.code for s in index.search("kodex2")] == ["069500"]
+    assert [s.code for s in index.search("KODEX 200")] == ["069500"]
+    assert [s.code for s in index.search("apple  inc")] == ["AAPL"]
+
+def test_index_should_honour_limit_and_deduplicate():
+    # Given: "A" matches AAL/AAPL by code and by name
+    index = SymbolIndex(SYMBOLS)
+
+    # When/Then
+    assert [s.code for s in index.search("a", limit=1)] == ["AAL"]
+    assert [s.code for s in index.search("a")] == ["AAL", "AAPL"]
+    assert index.search("   ") == []
+    assert index.search("zzz") == []
+
+def test_index_should_resolve_exact_code_case_insensitively():
+    index = SymbolIndex(SYMBOLS)
+    assert index.resolve("aapl").name == "Apple Inc"
+    assert index.resolve("005930").name == "삼성전자"
+    assert index.resolve("MSFT") is None
+
+def test_refresh_should_snapshot_listings_from_both_column_layouts(tmp_path):
+    # Given: KRX listing uses 'Code', overseas listings use 'Symbol'
+    loader = _listings({
+        "KRX": pd.DataFrame({"Code": ["005930"], "Name": ["삼성전자"], "Market": ["KOSPI"]}),
+        "NASDAQ": pd.DataFrame({"Symbol": ["AAPL", None], "Name": ["Apple  Inc", "Nameless"]}),
+    })
+    master = LocalSymbolMaster(SymbolSnapshot(tmp_path / "symbols.tsv"), listings=("KRX", "NASDAQ"), loader=loader)
+
+    # When
+    count = master.refresh()
+
+    # Then: Written to disk and served from memory
+    assert count == 2
+    assert SymbolSnapshot(tmp_path / "symbols.tsv").read() == [
+        Symbol("005930", "삼성전자", "KRX"), Symbol("AAPL", "Apple Inc", "NASDAQ"),
+    ]
+    assert master.resolve("AAPL").market == "NASDAQ"
+    assert not master.is_stale()
+
+def test_refresh_should_keep_previous_rows_for_failed_listing(tmp_path):
+    # Given: A snapshot from an earlier refresh
+    snapshot = SymbolSnapshot(tmp_path / "symbols.tsv")
+    snapshot.write([Symbol("AAPL", "Apple Inc", "NASDAQ"), Symbol("000000", "Old", "KRX")])
+    loader = _listings({
+        "KRX": pd.DataFrame({"Code": ["005930"], "Name": ["삼성전자"]}),
+        "NASDAQ": ConnectionError("listing unavailable"),
+    })
+    master = LocalSymbolMaster(snapshot, listings=("KRX", "NASDAQ"), loader=loader)
+
+    # When
+    master.refresh()
+
+    # Then: KRX replaced, NASDAQ carried over
+    assert master.resolve("000000") is None
+    assert master.resolve("005930") is not None
+    assert master.resolve("AAPL") is not None
+
+def test_should_pick_up_snapshot_written_by_another_process(tmp_path):
+    # Given: A serving master that loaded an empty snapshot
+    clock = FakeClock()
+    path = tmp_path / "symbols.tsv"
+    pending = []
+    master = LocalSymbolMaster(SymbolSnapshot(path), reload_check=60, clock=clock, spawn=pending.append)
+    assert master.search("삼성") == []
+
+    # When: A batch job writes the snapshot, and the reload check interval passes
+    SymbolSnapshot(path).write(SYMBOLS)
+    assert master.search("삼성") == []
+    clock.now += 60
+
+    # Then: The due lookup is served from the current index and schedules one rebuild
+    assert master.search("삼성") == []
+    assert master.search("삼성") == []
+    assert len(pending) == 1
+
+    # When: The background rebuild runs
+    pending.pop()()
+
+    # Then: The new index is swapped in
+    assert [s.code for s in master.search("삼성")] == ["005930", "005935"]
+
+def test_should_rebuild_index_off_the_calling_thread(tmp_path):
+    # Given: A stale serving master with the default background reload
+    clock = FakeClock()
+    path = tmp_path / "symbols.tsv"
+    master = LocalSymbolMaster(SymbolSnapshot(path), reload_check=60, clock=clock)
+    SymbolSnapshot(path).write(SYMBOLS)
+    clock.now += 60
+
+    # When: A lookup triggers the reload
+    master.search("삼성")
+
+    # Then: The index is eventually swapped in by the background thread
+    deadline = time.monotonic() + 5
+    while not master.search("삼성") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [s.code for s in master.search("삼성")] == ["005930", "005935"]
+
+def test_should_not_read_snapshot_until_first_lookup(tmp_path):
+    # Given: A snapshot on disk
+    snapshot = SymbolSnapshot(tmp_path / "symbols.tsv")
+    snapshot.write(SYMBOLS)
+    snapshot.read = MagicMock(side_effect=snapshot.read)
+    pending = []
+
+    # When: A master is built, as every market data provider does
+    master = LocalSymbolMaster(snapshot, spawn=pending.append)
+
+    # Then: Nothing is read or scheduled until something is looked up
+    snapshot.read.assert_not_called()
+    assert master.resolve("AAPL").name == "Apple Inc"
+    snapshot.read.assert_called_once()
+    assert pending == []
+
+def test_auto_refresh_should_download_stale_snapshot_in_background(tmp_path):
+    # Given: A day-old snapshot and a serving master that refreshes itself
+    clock = FakeClock()
+    snapshot = SymbolSnapshot(tmp_path / "symbols.tsv")
+    snapshot.write([Symbol("000000", "Old", "KRX")])
+    clock.now = snapshot.modified_at() + 24 * 3600
+    loader = MagicMock(side_effect=_listings({"KRX": pd.DataFrame({"Code": ["005930"], "Name": ["삼성전자"]})}))
+    pending = []
+    master = LocalSymbolMaster(
+        snapshot, listings=("KRX",), loader=loader, clock=clock, spawn=pending.append, auto_refresh=True,
+    )
+
+    # When: The first lookup is served from the old snapshot and schedules a refresh
+    assert master.resolve("000000") is not None
+    assert len(pending) == 1
+    pending.pop()()
+
+    # Then: The listings were downloaded and swapped in
+    loader.assert_called_once_with("KRX")
+    assert master.resolve("005930").name == "삼성전자"
+    assert master.stats()["stale"] is False
+
+def test_auto_refresh_should_wait_before_retrying_failed_download(tmp_path):
+    # Given: No snapshot, and listings that cannot be downloaded
+    clock = FakeClock()
+    loader = MagicMock(side_effect=ConnectionError("listing unavailable"))
+    pending = []
+    master = LocalSymbolMaster(
+        SymbolSnapshot(tmp_path / "symbols.tsv"), listings=("KRX",), loader=loader, clock=clock,
+        reload_check=60, spawn=pending.append, auto_refresh=True, refresh_retry=3600,
+    )
+    master.search("삼성")
+    pending.pop()()
+
+    # When: The next reload check comes due before the retry interval
+    clock.now += 60
+    master.search("삼성")
+    pending.pop()()
+
+    # Then: Only the first attempt downloaded
+    assert loader.call_count == 1
+
+    # When: The retry interval passes
+    clock.now += 3600
+    master.search("삼성")
+    pending.pop()()
+
+    # Then: Downloaded again
+    assert loader.call_count == 2
+
+def test_fdr_fallback_should_resolve_name_from_symbol_master():
+    # Given: An overseas code known to the symbol master
+    history = MagicMock(spec=PriceHistory)
+    history.latest_close.return_value = 190.0
+    symbols = MagicMock(spec=SymbolMaster)
+    symbols.resolve.side_effect = SymbolIndex(SYMBOLS).resolve
+    provider = RealMarketDataProvider(transport=MagicMock(spec=HttpTransport), history=history, symbols=symbols)
+
+    # When/Then: Listed name, or the code itself for unlisted symbols
+    assert provider.fetch_asset_info("AAPL") == {"name": "Apple Inc", "price": 190.0}
+    assert provider.fetch_asset_info("QQQM") == {"name": "QQQM", "price": 190.0}
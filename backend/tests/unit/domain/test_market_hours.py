@@ -0,0 +1,43 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from src.snowball.domain.market_hours import KRX_HOURS, US_HOURS, market_of
+
+def _utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+@pytest.mark.parametrize("now,expected", [
+    (_utc(2026, 4, 10, 1, 0), True),     # Fri 10:00 KST
+    (_utc(2026, 4, 9, 23, 59), False),   # Fri 08:59 KST
+    (_utc(2026, 4, 10, 6, 30), False),   # Fri 15:30 KST, close is exclusive
+    (_utc(2026, 4, 11, 1, 0), False),    # Sat 10:00 KST
+])
+def test_krx_session(now, expected):
+    assert KRX_HOURS.is_open(now) is expected
+
+def test_us_session_should_follow_daylight_saving():
+    # Given: 14:00 UTC is 10:00 EDT in April but 09:00 EST in January
+    # When/Then
+    assert US_HOURS.is_open(_utc(2026, 4, 10, 14, 0))
+    assert not US_HOURS.is_open(_utc(2026, 1, 9, 14, 0))
+
+def test_grace_should_extend_session_past_close():
+    # Given: 15:40 KST, ten minutes after the close
+    now = _utc(2026, 4, 10, 6, 40)
+
+    # When/Then
+    assert not KRX_HOURS.is_open(now)
+    assert KRX_HOURS.is_open(now, grace=timedelta(minutes=20))
+
+def test_next_open_should_skip_weekend():
+    # Given: Friday evening in Seoul
+    now = _utc(2026, 4, 10, 10, 0)
+
+    # When
+    opens = KRX_HOURS.next_open(now)
+
+    # Then: Monday 09:00 KST
+    assert opens == _utc(2026, 4, 13, 0, 0)
+
+@pytest.mark.parametrize("code,market", [("005930", "KRX"), ("AAPL", "US"), ("BRK.B", "US")])
+def test_market_of(code, market):
+    assert market_of(code) == market
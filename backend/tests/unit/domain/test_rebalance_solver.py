@@ -0,0 +1,141 @@
+import itertools
+import random
+import time
+import pytest
+from src.snowball.domain.rebalance import solve_whole_share_trades
+
+def tracking_error(prices, quantities, targets, trades):
+    return sum((p * (q + t) - target) ** 2 for p, q, target, t in zip(prices, quantities, targets, trades))
+
+def test_leftover_cash_buys_the_share_that_helps_most():
+    # Given: 1000 cash, two assets at 300 with 500 targets. Flooring buys 1 + 1 and leaves 400 idle
+    prices, quantities, targets = [300.0, 300.0], [0.0, 0.0], [500.0, 500.0]
+
+    # When
+    trades = solve_whole_share_trades(prices, quantities, targets, cash=1000.0)
+
+    # Then: One extra share fits and reduces the error; a second does not fit
+    assert sorted(trades) == [1, 2]
+    assert tracking_error(prices, quantities, targets, trades) < tracking_error(prices, quantities, targets, [1, 1])
+
+def test_buys_never_exceed_cash_plus_sale_proceeds():
+    # Given: No cash. Selling A yields 100, but per-asset rounding would buy 2 B and 2 C (160)
+    prices, quantities, targets = [100.0, 40.0, 40.0], [3.0, 0.0, 0.0], [120.0, 90.0, 90.0]
+
+    # When
+    trades = solve_whole_share_trades(prices, quantities, targets, cash=0.0)
+
+    # Then
+    assert sum(p * t for p, t in zip(prices, trades)) <= 0
+    assert trades[0] < 0
+
+def test_targets_are_lowered_when_weights_exceed_the_budget():
+    # Given: Targets sum to more than the account is worth
+    trades = solve_whole_share_trades([10.0, 10.0], [0.0, 0.0], [800.0, 400.0], cash=1000.0)
+
+    # Then: Both are lowered by the same 100, fully spending the cash
+    assert trades == [70, 30]
+
+def test_small_trades_are_skipped():
+    # Given: B is 30 below target, under the 50 minimum
+    trades = solve_whole_share_trades(
+        [10.0, 10.0], [0.0, 47.0], [500.0, 500.0], cash=530.0, min_trade_value=50.0
+    )
+
+    # Then
+    assert trades == [50, 0]
+
+def test_small_sale_is_kept_when_its_proceeds_fund_the_buys():
+    # Given: Rounding leaves a 1-share sale of B (40, below the minimum) that helps pay for A
+    trades = solve_whole_share_trades(
+        [25.0, 40.0], [0.0, 3.0], [90.0, 70.0], cash=40.0, min_trade_value=50.0
+    )
+
+    # Then: Dropping it would overdraw the account, so it stays
+    assert trades == [3, -1]
+
+def test_unpriced_assets_and_fractional_remainders_stay_put():
+    # Given: A has no price; B holds 2.5 shares and should be emptied
+    trades = solve_whole_share_trades([0.0, 100.0, 50.0], [5.0, 2.5, 0.0], [100.0, 0.0, 250.0], cash=0.0)
+
+    # Then: Only whole shares of B are sold; A is untouched
+    assert trades == [0, -2, 4]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_accounts_are_feasible(seed):
+    # Given
+    rng = random.Random(seed)
+    n = rng.randint(1, 40)
+    prices = [rng.choice([0.0, rng.uniform(1, 1000)]) for _ in range(n)]
+    quantities = [rng.choice([0.0, float(rng.randint(0, 100)), rng.uniform(0, 10)]) for _ in range(n)]
+    cash = rng.uniform(0, 10000)
+    total = cash + sum(p * q for p, q in zip(prices, quantities))
+    weights = [rng.random() for _ in range(n)]
+    targets = [total * w / sum(weights) for w in weights]
+
+    # When
+    trades = solve_whole_share_trades(prices, quantities, targets, cash, min_trade_value=rng.choice([0.0, 100.0]))
+
+    # Then: Whole shares, no short positions, cash never negative
+    assert all(isinstance(t, int) for t in trades)
+    assert all(q + t >= 0 for q, t in zip(quantities, trades))
+    assert cash - sum(p * t for p, t in zip(prices, trades)) >= -1e-6
+    assert all(t == 0 for p, t in zip(prices, trades) if p <= 0)
+
+def test_sales_are_rounded_to_the_nearest_share():
+    # Given: B is 2.12 shares over its target. Flooring the sale would sell 3
+    prices, quantities, targets = [18.0, 59.0, 7.0], [0.0, 4.0, 0.0], [110.04, 111.12, 191.84]
+
+    # When
+    trades = solve_whole_share_trades(prices, quantities, targets, cash=177.0)
+
+    # Then
+    assert trades == [6, -2, 26]
+
+def best_whole_share_trades(prices, quantities, targets, cash):
+    budget = cash + sum(p * q for p, q in zip(prices, quantities))
+    counts = itertools.product(*(range(int(budget // p) + 1) for p in prices))
+    feasible = (c for c in counts if sum(p * s for p, s in zip(prices, c)) <= budget)
+    best = min(feasible, key=lambda c: tracking_error(prices, [0.0] * len(prices), targets, c))
+    return [s - q for s, q in zip(best, quantities)]
+
+@pytest.mark.parametrize("seed", range(50))
+def test_small_accounts_match_exhaustive_search(seed):
+    # Given
+    rng = random.Random(seed)
+    n = rng.randint(1, 3)
+    prices = [float(rng.randint(5, 60)) for _ in range(n)]
+    quantities = [float(rng.randint(0, 5)) for _ in range(n)]
+    cash = float(rng.randint(0, 200))
+    total = cash + sum(p * q for p, q in zip(prices, quantities))
+    weights = [rng.random() for _ in range(n)]
+    targets = [total * w / sum(weights) for w in weights]
+
+    # When
+    trades = solve_whole_share_trades(prices, quantities, targets, cash)
+
+    # Then
+    best = best_whole_share_trades(prices, quantities, targets, cash)
+    assert tracking_error(prices, quantities, targets, trades) == pytest.approx(
+        tracking_error(prices, quantities, targets, best)
+    )
+
+def test_five_thousand_positions_solve_interactively():
+    # Given: Share prices spread over five orders of magnitude, so cheap assets need many shares
+    rng = random.Random(0)
+    n = 5000
+    prices = [rng.uniform(1, 1000) * rng.choice([1, 100]) for _ in range(n)]
+    quantities = [float(rng.randint(0, 200)) for _ in range(n)]
+    cash = rng.uniform(0, 1e6)
+    total = cash + sum(p * q for p, q in zip(prices, quantities))
+    weights = [rng.random() for _ in range(n)]
+    targets = [total * w / sum(weights) for w in weights]
+
+    # When
+    started = time.perf_counter()
+    trades = solve_whole_share_trades(prices, quantities, targets, cash)
+    elapsed = time.perf_counter() - started
+
+    # Then
+    assert elapsed < 1.0
+    assert cash - sum(p * t for p, t in zip(prices, trades)) >= -1e-6
@@ -1,5 +1,5 @@
 import pytest
-from src.snowball.domain.services import infer_category
+from src.snowball.domain.services import CategoryClassifier, infer_category, is_valid_code
 
 @pytest.mark.parametrize("name,code,expected", [
     ("삼성전자", "005930", "주식"),
@@ -33,3 +33,59 @@ def test_infer_category_edge_cases(name, code, expected):
 
     # Then: Matches expected behavior
     assert result == expected
+
+@pytest.mark.parametrize("code,expected", [
+    ("005930", True),     # KRX
+    ("AAPL", True),       # US
+    ("BRK.B", True),      # share class
+    ("USD/KRW", True),    # FDR FX symbol
+    ("", False),
+    ("5930", False),      # numeric but not 6 digits
+    ("0059300", False),
+    ("삼성전자", False),   # name typed instead of code
+    ("AAPL US", False),
+    (".AAPL", False),
+    ("ABCDEFGHIJKLM", False),  # too long
+])
+def test_is_valid_code(code, expected):
+    # Given: A user-supplied code
+    # When: Validated locally
+    # Then: Obviously malformed codes are rejected
+    assert is_valid_code(code) is expected
+
+def test_classifier_should_accept_custom_keyword_tables():
+    # Given: A custom table with its own precedence and default
+    classifier = CategoryClassifier(
+        keywords=(("리츠", ("리츠", "REIT")), ("채권", ("bond",))),
+        default="기타",
+    )
+
+    # When/Then: Keywords are case-insensitive and precedence follows table order
+    assert classifier.classify("Vanguard Real Estate REIT", "VNQ") == "리츠"
+    assert classifier.classify("REIT Bond Mix", "") == "리츠"
+    assert classifier.classify("Total Bond Market", "BND") == "채권"
+    assert classifier.classify("삼성전자", "005930") == "기타"
+
+def test_classifier_should_honour_precedence_for_overlapping_keywords():
+    # Given: A lower-precedence keyword that starts before, and overlaps, a higher one
+    classifier = CategoryClassifier(keywords=(("high", ("ABC",)), ("low", ("XAB",))))
+
+    # When/Then: The overlapping high-precedence match is still found
+    assert classifier.classify("XABC", "") == "high"
+    assert classifier.classify("XAB", "") == "low"
+
+def test_classifier_should_memoize_per_name_and_code():
+    # Given
+    classifier = CategoryClassifier()
+
+    # When: The same pair is classified repeatedly
+    for _ in range(3):
+        classifier.classify("KODEX 골드선물(H)", "132030")
+    classifier.classify("KODEX 골드선물(H)", "OTHER")
+
+    # Then: Computed once per distinct (name, code)
+    info = classifier.classify.cache_info()
+    assert (info.hits, info.misses) == (2, 2)
+
+def test_classifier_without_keywords_should_use_default():
+    assert CategoryClassifier(keywords=(("채권", ()),)).classify("국고채", "") == "주식"
@@ -0,0 +1,21 @@
+from sqlalchemy import inspect, text
+from sqlmodel import create_engine
+from sqlmodel.pool import StaticPool
+from src.snowball.infrastructure.db import add_missing_version_columns
+
+def test_add_missing_version_columns_upgrades_existing_tables():
+    # Given: Tables created before the version column existed
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE account (id INTEGER PRIMARY KEY, name VARCHAR, cash FLOAT)"))
+        conn.execute(text("CREATE TABLE asset (id INTEGER PRIMARY KEY, name VARCHAR)"))
+        conn.execute(text("INSERT INTO account (id, name, cash) VALUES (1, 'old', 0)"))
+
+    # When: Run twice — the upgrade is idempotent
+    add_missing_version_columns(engine)
+    add_missing_version_columns(engine)
+
+    # Then
+    assert "version" in {c["name"] for c in inspect(engine).get_columns("asset")}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version FROM account WHERE id = 1")).scalar_one() == 1
@@ -0,0 +1,94 @@
+import random
+import threading
+from datetime import datetime, timedelta, timezone
+from src.snowball.domain.entities import PriceUpdateResult
+from src.snowball.infrastructure.refresh_daemon import PriceRefreshDaemon, RefreshSchedule
+
+KRX_OPEN = datetime(2026, 4, 10, 1, 0, tzinfo=timezone.utc)      # Fri 10:00 KST, US closed
+ALL_CLOSED = datetime(2026, 4, 11, 1, 0, tzinfo=timezone.utc)    # Sat
+
+def _result() -> PriceUpdateResult:
+    return PriceUpdateResult(updated_count=1, code_count=1, failed_codes=[], fetch_seconds=0.0, total_seconds=0.0)
+
+def test_schedule_should_tick_fast_while_a_market_is_open():
+    # Given
+    schedule = RefreshSchedule(open_interval=60, jitter=0)
+
+    # When/Then
+    assert schedule.open_markets(KRX_OPEN) == ["KRX"]
+    assert schedule.next_delay(KRX_OPEN) == 60
+
+def test_schedule_should_sleep_until_next_open_when_closed():
+    # Given: Saturday; the next open is Monday 09:00 KST, 47 hours away
+    schedule = RefreshSchedule(jitter=0, max_sleep=1e9)
+
+    # When/Then
+    assert schedule.open_markets(ALL_CLOSED) == []
+    assert schedule.next_delay(ALL_CLOSED) == timedelta(hours=47).total_seconds()
+    assert RefreshSchedule(jitter=0, max_sleep=3600).next_delay(ALL_CLOSED) == 3600
+
+def test_schedule_should_jitter_within_bounds():
+    # Given
+    schedule = RefreshSchedule(open_interval=60, jitter=0.1, rng=random.Random(1))
+
+    # When
+    delays = {schedule.next_delay(KRX_OPEN) for _ in range(50)}
+
+    # Then: Spread out, never outside +/-10%
+    assert len(delays) > 1
+    assert all(54 <= d <= 66 for d in delays)
+
+def test_startup_delay_should_stay_within_the_jitter_band():
+    # Given
+    schedule = RefreshSchedule(open_interval=60, jitter=0.1, rng=random.Random(1))
+
+    # When
+    delays = {schedule.startup_delay() for _ in range(50)}
+
+    # Then: Spread over 2 * 10% of the interval, and no delay at all without jitter
+    assert len(delays) > 1
+    assert all(0 <= d <= 12 for d in delays)
+    assert RefreshSchedule(open_interval=60, jitter=0).startup_delay() == 0.0
+
+def test_daemon_should_tick_with_open_markets_and_survive_failures():
+    # Given: A tick that fails once, then succeeds; stop after the third tick
+    calls = []
+    daemon = None
+
+    def tick(markets):
+        calls.append(markets)
+        if len(calls) == 1:
+            raise RuntimeError("db down")
+        if len(calls) == 3:
+            daemon.stop()
+        return _result()
+
+    logs = []
+    daemon = PriceRefreshDaemon(
+        tick, RefreshSchedule(open_interval=0.001, jitter=0), clock=lambda: KRX_OPEN, log=logs.append
+    )
+
+    # When
+    daemon.run()
+
+    # Then
+    assert calls == [["KRX"]] * 3
+    assert any("tick failed" in line for line in logs)
+    assert logs[-1] == "Price refresh daemon stopped"
+
+def test_daemon_should_not_tick_while_markets_are_closed_and_stop_promptly():
+    # Given: A closed market, so the daemon sleeps for up to an hour
+    tick_calls = []
+    daemon = PriceRefreshDaemon(
+        tick_calls.append, RefreshSchedule(jitter=0), clock=lambda: ALL_CLOSED, log=lambda _: None
+    )
+    runner = threading.Thread(target=daemon.run)
+    runner.start()
+
+    # When: Shutdown is requested mid-sleep
+    daemon.stop()
+    runner.join(timeout=2)
+
+    # Then: The sleep is interrupted and nothing was fetched
+    assert not runner.is_alive()
+    assert tick_calls == []
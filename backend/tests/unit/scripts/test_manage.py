@@ -93,7 +93,7 @@ def test_update_prices_reports_updated_count(db_engine):
     with patch("scripts.manage.engine", db_engine), \
          patch("scripts.manage.RealMarketDataProvider") as mock_provider_cls:
         mock_provider = mock_provider_cls.return_value
-        mock_provider.fetch_price.return_value = 75000.0
+        mock_provider.fetch_prices.return_value = {"005930": 75000.0}
 
         result = runner.invoke(app, ["update-prices"])
 
@@ -108,3 +108,100 @@ def test_update_prices_no_assets_with_code(db_engine):
 
     assert result.exit_code == 0
     assert "0" in result.output
+
+
+def test_update_prices_stale_after_skips_recently_refreshed_codes(db_engine):
+    from src.snowball.adapters.db.models import AccountModel, AssetModel
+
+    with Session(db_engine) as session:
+        user = UserModel(email="stale@test.com", password_hash="h")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        account = AccountModel(name="계좌", cash=0.0, user_id=user.id)
+        session.add(account)
+        session.commit()
+        session.refresh(account)
+        session.add(AssetModel(account_id=account.id, name="삼성전자", code="005930", current_price=70000.0, quantity=10.0))
+        session.commit()
+
+    with patch("scripts.manage.engine", db_engine), \
+         patch("scripts.manage.RealMarketDataProvider") as mock_provider_cls:
+        mock_provider = mock_provider_cls.return_value
+        mock_provider.fetch_prices.return_value = {"005930": 75000.0}
+
+        first = runner.invoke(app, ["update-prices", "--stale-after", "5"])
+        second = runner.invoke(app, ["update-prices", "--stale-after", "5"])
+
+    assert first.exit_code == 0 and second.exit_code == 0
+    # The second run finds nothing stale and makes no upstream call
+    mock_provider.fetch_prices.assert_called_once_with(["005930"])
+    assert "종목 0개" in second.output
+
+def test_update_prices_rejects_max_codes_without_stale_after(db_engine):
+    with patch("scripts.manage.engine", db_engine), \
+         patch("scripts.manage.RealMarketDataProvider") as mock_provider_cls:
+        result = runner.invoke(app, ["update-prices", "--max-codes", "10"])
+
+    # A cap on a full refresh would be silently ignored
+    assert result.exit_code != 0
+    assert "--stale-after" in result.output
+    mock_provider_cls.return_value.fetch_prices.assert_not_called()
+
+def test_refresh_symbols_skips_fresh_snapshot():
+    with patch("scripts.manage.LocalSymbolMaster") as mock_master_cls:
+        mock_master = mock_master_cls.return_value
+        mock_master.is_stale.return_value = False
+        mock_master.reload.return_value = 3
+
+        result = runner.invoke(app, ["refresh-symbols"])
+
+    assert result.exit_code == 0
+    assert "3" in result.output
+    mock_master.refresh.assert_not_called()
+
+
+def test_refresh_symbols_force_downloads_listings():
+    with patch("scripts.manage.LocalSymbolMaster") as mock_master_cls:
+        mock_master = mock_master_cls.return_value
+        mock_master.is_stale.return_value = False
+        mock_master.refresh.return_value = 12000
+
+        result = runner.invoke(app, ["refresh-symbols", "--force"])
+
+    assert result.exit_code == 0
+    mock_master.refresh.assert_called_once()
+    assert "12000" in result.output
+
+
+def test_refresh_daemon_ticks_only_open_market_codes(db_engine):
+    from src.snowball.adapters.db.models import AccountModel, AssetModel
+
+    with Session(db_engine) as session:
+        user = UserModel(email="daemon@test.com", password_hash="h")
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        account = AccountModel(name="계좌", cash=0.0, user_id=user.id)
+        session.add(account)
+        session.commit()
+        session.refresh(account)
+        session.add(AssetModel(account_id=account.id, name="삼성전자", code="005930", quantity=1.0))
+        session.add(AssetModel(account_id=account.id, name="Apple", code="AAPL", quantity=1.0))
+        session.commit()
+
+    with patch("scripts.manage.engine", db_engine), \
+         patch("scripts.manage.RealMarketDataProvider") as mock_provider_cls, \
+         patch("scripts.manage.PriceRefreshDaemon") as mock_daemon_cls:
+        mock_provider = mock_provider_cls.return_value
+        mock_provider.fetch_prices.return_value = {"005930": 75000.0}
+
+        result = runner.invoke(app, ["refresh-daemon", "--interval", "30"])
+        tick = mock_daemon_cls.call_args.args[0]
+        tick_result = tick(["KRX"])
+
+    assert result.exit_code == 0
+    mock_daemon_cls.return_value.run.assert_called_once()
+    mock_provider.close.assert_called_once()
+    mock_provider.fetch_prices.assert_called_once_with(["005930"])
+    assert tick_result.updated_count == 1
@@ -1,8 +1,9 @@
+import random
 import pytest
 from unittest.mock import MagicMock
-from src.snowball.use_cases.portfolio import CalculatePortfolioUseCase
+from src.snowball.use_cases.portfolio import BatchCalculatePortfolioUseCase, CalculatePortfolioUseCase
 from uuid import uuid4
-from src.snowball.domain.entities import Account, Asset, AssetCalculationResult, PortfolioCalculationResult, UserId
+from src.snowball.domain.entities import Account, Asset, AssetCalculationResult, CalculationMode, PortfolioCalculationResult, UserId
 from src.snowball.domain.exceptions import EntityNotFoundException
 
 def test_calculate_portfolio_happy_path():
@@ -107,3 +108,85 @@ def test_calculate_portfolio_negative_cash():
     item = result.assets[0]
     assert item.action_quantity == 0
     assert item.action == "HOLD"
+
+def make_random_accounts(seed: int, count: int, shuffled: bool = False) -> list:
+    rng = random.Random(seed)
+    accounts = []
+    for i in range(count):
+        account = Account(id=i + 1, name=f"Acc {i}", user_id=UserId(uuid4()), cash=rng.choice([0, rng.uniform(0, 1e7)]))
+        # Unsaved accounts (no asset ids) are ordered by name
+        saved = rng.random() < 0.9
+        for j in range(rng.randint(0, 8)):
+            account.assets.append(Asset(
+                id=i * 100 + j + 1 if saved else None,
+                account_id=account.id, name=f"Asset {j}",
+                current_price=rng.choice([0.0, rng.uniform(1, 500000)]),
+                quantity=rng.choice([0.0, float(rng.randint(1, 1000)), rng.uniform(0, 50)]),
+                avg_price=rng.choice([0.0, rng.uniform(1, 500000)]),
+                target_weight=rng.choice([0.0, rng.uniform(0, 60)]),
+            ))
+        if shuffled:
+            rng.shuffle(account.assets)
+        accounts.append(account)
+    return accounts
+
+@pytest.mark.parametrize("shuffled", [False, True])
+def test_batch_calculation_matches_scalar_path(shuffled):
+    # Given: Many accounts incl. empty ones, zero prices, zero principal and no cash
+    accounts = make_random_accounts(seed=7, count=200, shuffled=shuffled)
+
+    # When
+    batch = BatchCalculatePortfolioUseCase().execute(accounts)
+
+    # Then: Every field is exactly what the scalar use case returns
+    scalar = CalculatePortfolioUseCase()
+    assert batch == [scalar.execute(account) for account in accounts]
+    item = next(a for result in batch for a in result.assets)
+    assert type(item.action_quantity) is int and type(item.current_value) is float
+
+def test_batch_rows_are_built_on_first_read():
+    # Given
+    accounts = make_random_accounts(seed=3, count=5)
+
+    # When
+    result = BatchCalculatePortfolioUseCase().execute(accounts)[0]
+
+    # Then: The row count is known up front; reading returns the same objects every time
+    assert len(result.assets) == len(accounts[0].assets)
+    assert list(result.assets) == CalculatePortfolioUseCase().execute(accounts[0]).assets
+    assert result.assets[0] is next(iter(result.assets))
+
+def test_batch_calculation_of_no_accounts():
+    assert BatchCalculatePortfolioUseCase().execute([]) == []
+
+def test_optimized_mode_spends_the_rounding_residue():
+    # Given: Per-asset rounding buys 1 + 1 at 300 and leaves 400 of the 1000 cash idle
+    account = Account(id=1, name="Acc", user_id=UserId(uuid4()), cash=1000, assets=[
+        Asset(id=1, account_id=1, name="A", current_price=300, target_weight=50.0),
+        Asset(id=2, account_id=1, name="B", current_price=300, target_weight=50.0),
+    ])
+
+    # When
+    per_asset = CalculatePortfolioUseCase().execute(account)
+    optimized = CalculatePortfolioUseCase(CalculationMode.OPTIMIZED).execute(account)
+
+    # Then: Only the action columns differ
+    assert [a.action_quantity for a in per_asset.assets] == [1, 1]
+    assert sorted(a.action_quantity for a in optimized.assets) == [1, 2]
+    assert all(a.action == "BUY" for a in optimized.assets)
+    assert [a.target_value for a in optimized.assets] == [a.target_value for a in per_asset.assets]
+
+def test_batch_optimized_mode_matches_scalar_path():
+    # Given
+    accounts = make_random_accounts(seed=11, count=50, shuffled=True)
+
+    # When
+    batch = BatchCalculatePortfolioUseCase(CalculationMode.OPTIMIZED, min_trade_value=1000).execute(accounts)
+
+    # Then
+    scalar = CalculatePortfolioUseCase(CalculationMode.OPTIMIZED, min_trade_value=1000)
+    assert batch == [scalar.execute(account) for account in accounts]
+
+def test_negative_min_trade_value_is_rejected():
+    with pytest.raises(ValueError):
+        CalculatePortfolioUseCase(CalculationMode.OPTIMIZED, min_trade_value=-1)
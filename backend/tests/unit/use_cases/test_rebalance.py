@@ -0,0 +1,136 @@
+from unittest.mock import MagicMock, call
+from uuid import uuid4
+from src.snowball.use_cases.rebalance import RebalanceAccountUseCase, fund_buys, plan_legs
+from src.snowball.use_cases.portfolio import CalculatePortfolioUseCase
+from src.snowball.domain.ports import AccountRepository, AssetRepository, MarketDataProvider, UnitOfWork
+from src.snowball.domain.entities import Account, Asset, UserId
+
+def make_account() -> Account:
+    # 현금 1000 + B 1000 = 2000, A/B 각 50% 목표
+    return Account(id=1, name="Acc", user_id=UserId(uuid4()), cash=1000, assets=[
+        Asset(id=1, account_id=1, name="A", code="AAA", current_price=100, quantity=0, target_weight=50),
+        Asset(id=2, account_id=1, name="B", current_price=100, quantity=10, target_weight=50),
+    ])
+
+def make_uow(account: Account) -> MagicMock:
+    uow = MagicMock(spec=UnitOfWork)
+    uow.accounts = MagicMock(spec=AccountRepository)
+    uow.assets = MagicMock(spec=AssetRepository)
+    uow.accounts.get_account_for_user.return_value = account
+    uow.accounts.get.return_value = account
+    uow.accounts.adjust_cash.side_effect = lambda account_id, amount: account.cash + amount
+    uow.assets.apply_trade.side_effect = lambda asset_id, qty, price: account.assets[asset_id - 1]
+    return uow
+
+def test_plan_legs_skips_hold_rows():
+    # Given
+    plan = CalculatePortfolioUseCase().execute(make_account())
+
+    # When
+    legs = plan_legs(plan)
+
+    # Then: Only A is bought, priced at its valuation price
+    assert [(l.asset_id, l.action_quantity, l.price) for l in legs] == [(1, 10, 100)]
+
+def test_dry_run_plans_at_fresh_prices_without_writing():
+    # Given: A now trades at 200
+    account = make_account()
+    uow = make_uow(account)
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {"AAA": 200.0}
+
+    # When
+    plan = RebalanceAccountUseCase(uow, market_data).execute(1, account.user_id, dry_run=True)
+
+    # Then: Plan uses the snapshot price; nothing persisted or committed
+    market_data.fetch_prices.assert_called_once_with(["AAA"])
+    a = next(item for item in plan.assets if item.asset.id == 1)
+    assert (a.action, a.action_quantity, a.asset.current_price) == ("BUY", 5, 200.0)
+    assert account.assets[0].current_price == 100
+    uow.assets.update_prices.assert_not_called()
+    uow.accounts.adjust_cash.assert_not_called()
+    uow.commit.assert_not_called()
+
+def test_rebalance_applies_plan_at_snapshot_prices_in_one_commit():
+    # Given
+    account = make_account()
+    uow = make_uow(account)
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {"AAA": 200.0}
+
+    # When
+    RebalanceAccountUseCase(uow, market_data).execute(1, account.user_id)
+
+    # Then: Only this account's asset is repriced, and the plan executed at the same price
+    uow.assets.update_prices.assert_not_called()
+    uow.assets.set_current_prices.assert_called_once_with({1: 200.0})
+    uow.accounts.adjust_cash.assert_called_once_with(1, -1000.0)
+    uow.assets.apply_trade.assert_called_once_with(1, 5, 200.0)
+    uow.commit.assert_called_once()
+
+def test_rebalance_balanced_account_writes_nothing():
+    # Given: Already on target
+    account = make_account()
+    account.assets[0].quantity = 10
+    account.cash = 0
+    uow = make_uow(account)
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {}
+
+    # When
+    result = RebalanceAccountUseCase(uow, market_data).execute(1, account.user_id)
+
+    # Then
+    assert all(item.action == "HOLD" for item in result.assets)
+    uow.accounts.adjust_cash.assert_not_called()
+    uow.assets.set_current_prices.assert_not_called()
+
+def make_overweight_account() -> Account:
+    # 현금 0, A 1000 보유. 목표 합계가 120%라 자산별 계획은 매도 대금(400)보다 많이(600) 산다
+    return Account(id=1, name="Acc", user_id=UserId(uuid4()), cash=0, assets=[
+        Asset(id=1, account_id=1, name="A", current_price=100, quantity=10, target_weight=60),
+        Asset(id=2, account_id=1, name="B", current_price=100, quantity=0, target_weight=60),
+    ])
+
+def test_fund_buys_caps_buys_to_cash_plus_sale_proceeds():
+    # Given
+    plan = CalculatePortfolioUseCase().execute(make_overweight_account())
+
+    # When
+    funded = fund_buys(plan)
+
+    # Then: B's buy shrinks from 6 to the 4 shares A's sale pays for; sells come first
+    assert {i.asset.name: (i.action, i.action_quantity) for i in funded.assets} == {"A": ("SELL", -4), "B": ("BUY", 4)}
+    assert [(l.asset_id, l.action_quantity) for l in plan_legs(funded)] == [(1, -4), (2, 4)]
+    assert fund_buys(funded) is funded
+
+def test_rebalance_sells_fund_the_buys():
+    # Given
+    account = make_overweight_account()
+    uow = make_uow(account)
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {}
+
+    # When
+    RebalanceAccountUseCase(uow, market_data).execute(1, account.user_id)
+
+    # Then: The sale proceeds pay for the buy exactly, sell leg applied first
+    uow.accounts.adjust_cash.assert_called_once_with(1, 0.0)
+    assert uow.assets.apply_trade.call_args_list == [call(1, -4, 100), call(2, 4, 100)]
+    uow.commit.assert_called_once()
+
+def test_prices_are_fetched_after_the_read_transaction_ends():
+    # Given
+    account = make_account()
+    uow = make_uow(account)
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {"AAA": 200.0}
+    calls = MagicMock()
+    calls.attach_mock(uow.rollback, "rollback")
+    calls.attach_mock(market_data.fetch_prices, "fetch_prices")
+
+    # When
+    RebalanceAccountUseCase(uow, market_data).execute(1, account.user_id, dry_run=True)
+
+    # Then: No transaction stays open across the network call
+    assert calls.mock_calls == [call.rollback(), call.fetch_prices(["AAA"])]
@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import MagicMock
+from src.snowball.use_cases.retry import retry_on_conflict
+from src.snowball.domain.ports import UnitOfWork
+from src.snowball.domain.exceptions import InvalidActionException, VersionConflictException
+
+def test_retry_on_conflict_commits_successful_operation():
+    # Given
+    uow = MagicMock(spec=UnitOfWork)
+
+    # When
+    result = retry_on_conflict(uow, lambda: 42)
+
+    # Then
+    assert result == 42
+    uow.commit.assert_called_once()
+    uow.rollback.assert_not_called()
+
+def test_retry_on_conflict_reruns_after_version_conflict():
+    # Given: The first attempt loses a version race
+    uow = MagicMock(spec=UnitOfWork)
+    operation = MagicMock(side_effect=[VersionConflictException("stale"), "done"])
+
+    # When
+    result = retry_on_conflict(uow, operation)
+
+    # Then
+    assert result == "done"
+    assert operation.call_count == 2
+    uow.rollback.assert_called_once()
+    uow.commit.assert_called_once()
+
+def test_retry_on_conflict_gives_up_after_max_attempts():
+    # Given
+    uow = MagicMock(spec=UnitOfWork)
+    operation = MagicMock(side_effect=VersionConflictException("stale"))
+
+    # When / Then
+    with pytest.raises(VersionConflictException):
+        retry_on_conflict(uow, operation, max_attempts=3)
+    assert operation.call_count == 3
+    uow.commit.assert_not_called()
+
+def test_retry_on_conflict_does_not_retry_other_errors():
+    # Given
+    uow = MagicMock(spec=UnitOfWork)
+    operation = MagicMock(side_effect=InvalidActionException("no"))
+
+    # When / Then
+    with pytest.raises(InvalidActionException):
+        retry_on_conflict(uow, operation)
+    operation.assert_called_once()
+    uow.rollback.assert_called_once()
@@ -1,113 +1,237 @@
 import pytest
 from unittest.mock import MagicMock
-from src.snowball.use_cases.trade import ExecuteTradeUseCase
-from src.snowball.domain.ports import AssetRepository, AccountRepository
+from src.snowball.use_cases.trade import ExecuteTradeBatchUseCase, ExecuteTradeUseCase
+from src.snowball.domain.ports import AssetRepository, AccountRepository, UnitOfWork
 from uuid import uuid4
-from src.snowball.domain.entities import Account, Asset, UserId
-from src.snowball.domain.exceptions import EntityNotFoundException, InsufficientFundsException, InvalidActionException
+from src.snowball.domain.entities import Account, Asset, TradeLeg, UserId
+from src.snowball.domain.exceptions import (
+    ConcurrencyConflictException, EntityNotFoundException, InsufficientFundsException, InvalidActionException,
+    PermissionDeniedException
+)
+
+def make_uow(account: Account, asset: Asset) -> MagicMock:
+    uow = MagicMock(spec=UnitOfWork)
+    uow.assets = MagicMock(spec=AssetRepository)
+    uow.accounts = MagicMock(spec=AccountRepository)
+    uow.assets.get_asset_for_user.return_value = asset
+    uow.accounts.get.return_value = account
+    return uow
 
 def test_execute_trade_buy_happy_path():
     # Given: Account with cash and asset in DB
-    mock_asset_repo = MagicMock(spec=AssetRepository)
-    mock_account_repo = MagicMock(spec=AccountRepository)
-
-    account = Account(id=1, name="Test Acc", user_id=UserId(uuid4()), cash=20000)
+    account = Account(id=1, name="Test Acc", user_id=UserId(uuid4()), cash=10000)
     asset = Asset(
         id=1, account_id=1, name="Stock", code="S",
-        target_weight=50.0, current_price=10000, quantity=0, avg_price=0
+        target_weight=50.0, current_price=10000, quantity=1, avg_price=10000
     )
+    account.assets = [asset]
+    uow = make_uow(account, asset)
+    uow.accounts.adjust_cash.return_value = 10000.0
+    uow.assets.apply_trade.return_value = asset
 
-    mock_asset_repo.get.return_value = asset
-    mock_account_repo.get.return_value = account
-
-    use_case = ExecuteTradeUseCase(mock_asset_repo, mock_account_repo)
+    use_case = ExecuteTradeUseCase(uow)
 
     # When: Buy 1 unit @ 10000
-    result = use_case.execute(asset_id=1, action_quantity=1, price=10000)
+    result = use_case.execute(asset_id=1, action_quantity=1, price=10000, user_id=account.user_id)
 
-    # Then: Cash decreased, Quantity increased, Avg price updated
-    assert account.cash == 10000.0
-    assert asset.quantity == 1
-    assert asset.avg_price == 10000.0
-
-    # And: Repositories saved changes
-    mock_asset_repo.save.assert_called_with(asset)
-    mock_account_repo.save.assert_called_with(account)
+    # Then: Cash withdrawn and holding updated by conditional updates, committed once
+    uow.accounts.adjust_cash.assert_called_once_with(1, -10000)
+    uow.assets.apply_trade.assert_called_once_with(1, 1, 10000)
+    uow.commit.assert_called_once()
+    assert result.account is account
 
 def test_execute_trade_sell_happy_path():
     # Given: Account holding asset
-    mock_asset_repo = MagicMock(spec=AssetRepository)
-    mock_account_repo = MagicMock(spec=AccountRepository)
-
     account = Account(id=1, name="Test Acc", user_id=UserId(uuid4()), cash=0)
     asset = Asset(
         id=1, account_id=1, name="Stock", code="S",
         target_weight=50.0, current_price=10000, quantity=2, avg_price=10000
     )
+    uow = make_uow(account, asset)
+    uow.accounts.adjust_cash.return_value = 12000.0
+    uow.assets.apply_trade.return_value = asset
 
-    mock_asset_repo.get.return_value = asset
-    mock_account_repo.get.return_value = account
-
-    use_case = ExecuteTradeUseCase(mock_asset_repo, mock_account_repo)
+    use_case = ExecuteTradeUseCase(uow)
 
     # When: Sell 1 unit @ 12000 (Profit)
-    result = use_case.execute(asset_id=1, action_quantity=-1, price=12000)
-
-    # Then: Cash increased, Quantity decreased, Avg price unchanged
-    assert account.cash == 12000.0
-    assert asset.quantity == 1
-    assert asset.avg_price == 10000.0
+    use_case.execute(asset_id=1, action_quantity=-1, price=12000, user_id=account.user_id)
 
-    # And: Repositories saved changes
-    mock_asset_repo.save.assert_called_with(asset)
-    mock_account_repo.save.assert_called_with(account)
+    # Then: Cash deposited, holding reduced
+    uow.accounts.adjust_cash.assert_called_once_with(1, 12000)
+    uow.assets.apply_trade.assert_called_once_with(1, -1, 12000)
+    uow.commit.assert_called_once()
 
 def test_execute_trade_insufficient_funds():
-    # Given: Poor account
-    mock_asset_repo = MagicMock(spec=AssetRepository)
-    mock_account_repo = MagicMock(spec=AccountRepository)
-
+    # Given: Poor account — the conditional cash update matches no row
     account = Account(id=1, name="Poor Acc", user_id=UserId(uuid4()), cash=5000)
     asset = Asset(id=1, account_id=1, name="Stock", quantity=0, avg_price=0)
+    uow = make_uow(account, asset)
+    uow.accounts.adjust_cash.return_value = None
 
-    mock_asset_repo.get.return_value = asset
-    mock_account_repo.get.return_value = account
-
-    use_case = ExecuteTradeUseCase(mock_asset_repo, mock_account_repo)
+    use_case = ExecuteTradeUseCase(uow)
 
     # When: Buying more than cash allows
-    # Then: raises InsufficientFundsException
-    with pytest.raises(InsufficientFundsException):
-        use_case.execute(asset_id=1, action_quantity=1, price=10000)
+    # Then: raises InsufficientFundsException, holding untouched, rolled back
+    with pytest.raises(InsufficientFundsException, match="Have 5000"):
+        use_case.execute(asset_id=1, action_quantity=1, price=10000, user_id=account.user_id)
+    uow.assets.apply_trade.assert_not_called()
+    uow.rollback.assert_called_once()
+    uow.commit.assert_not_called()
 
 def test_execute_trade_insufficient_quantity():
     # Given: Account with 1 unit
-    mock_asset_repo = MagicMock(spec=AssetRepository)
-    mock_account_repo = MagicMock(spec=AccountRepository)
-
     account = Account(id=1, name="Acc", user_id=UserId(uuid4()), cash=0)
     asset = Asset(id=1, account_id=1, name="Stock", quantity=1)
+    uow = make_uow(account, asset)
 
-    mock_asset_repo.get.return_value = asset
-    mock_account_repo.get.return_value = account
-
-    use_case = ExecuteTradeUseCase(mock_asset_repo, mock_account_repo)
+    use_case = ExecuteTradeUseCase(uow)
 
     # When: Selling 2 units
-    # Then: raises InvalidActionException
+    # Then: raises InvalidActionException before any write
     with pytest.raises(InvalidActionException):
-        use_case.execute(asset_id=1, action_quantity=-2, price=10000)
+        use_case.execute(asset_id=1, action_quantity=-2, price=10000, user_id=account.user_id)
+    uow.accounts.adjust_cash.assert_not_called()
+
+def test_execute_trade_quantity_sold_concurrently_rolls_back_cash():
+    # Given: Holding looked sufficient, but the conditional update finds it already sold
+    account = Account(id=1, name="Acc", user_id=UserId(uuid4()), cash=0)
+    asset = Asset(id=1, account_id=1, name="Stock", quantity=1)
+    uow = make_uow(account, asset)
+    uow.accounts.adjust_cash.return_value = 10000.0
+    uow.assets.apply_trade.return_value = None
+
+    use_case = ExecuteTradeUseCase(uow)
+
+    # When / Then: the cash deposit is rolled back with the rest of the trade
+    with pytest.raises(InvalidActionException):
+        use_case.execute(asset_id=1, action_quantity=-1, price=10000, user_id=account.user_id)
+    uow.rollback.assert_called_once()
+    uow.commit.assert_not_called()
+
+def test_execute_trade_retries_on_conflict():
+    # Given: The first commit hits a concurrent transaction
+    account = Account(id=1, name="Acc", user_id=UserId(uuid4()), cash=10000)
+    asset = Asset(id=1, account_id=1, name="Stock", quantity=0)
+    uow = make_uow(account, asset)
+    uow.accounts.adjust_cash.return_value = 0.0
+    uow.assets.apply_trade.return_value = asset
+    uow.commit.side_effect = [ConcurrencyConflictException("database is locked"), None]
+
+    use_case = ExecuteTradeUseCase(uow)
+
+    # When
+    use_case.execute(asset_id=1, action_quantity=1, price=10000, user_id=account.user_id)
+
+    # Then: rolled back once and re-run from a fresh read
+    assert uow.commit.call_count == 2
+    uow.rollback.assert_called_once()
+    assert uow.assets.get_asset_for_user.call_count == 2
+
+def test_execute_trade_gives_up_after_max_attempts():
+    # Given: Every attempt conflicts
+    account = Account(id=1, name="Acc", user_id=UserId(uuid4()), cash=10000)
+    asset = Asset(id=1, account_id=1, name="Stock", quantity=0)
+    uow = make_uow(account, asset)
+    uow.accounts.adjust_cash.side_effect = ConcurrencyConflictException("database is locked")
+
+    use_case = ExecuteTradeUseCase(uow, max_attempts=2)
+
+    # When / Then
+    with pytest.raises(ConcurrencyConflictException):
+        use_case.execute(asset_id=1, action_quantity=1, price=10000, user_id=account.user_id)
+    assert uow.rollback.call_count == 2
 
 def test_execute_trade_asset_not_found():
     # Given: Asset does not exist
-    mock_asset_repo = MagicMock(spec=AssetRepository)
-    mock_account_repo = MagicMock(spec=AccountRepository)
+    uow = MagicMock(spec=UnitOfWork)
+    uow.assets = MagicMock(spec=AssetRepository)
+    uow.accounts = MagicMock(spec=AccountRepository)
+    uow.assets.get_asset_for_user.side_effect = EntityNotFoundException("Asset with id 999 not found")
 
-    mock_asset_repo.get.return_value = None
-
-    use_case = ExecuteTradeUseCase(mock_asset_repo, mock_account_repo)
+    use_case = ExecuteTradeUseCase(uow)
 
     # When: Executing trade
     # Then: raises EntityNotFoundException
     with pytest.raises(EntityNotFoundException):
-        use_case.execute(asset_id=999, action_quantity=1, price=100)
+        use_case.execute(asset_id=999, action_quantity=1, price=100, user_id=UserId(uuid4()))
+
+def test_execute_trade_other_users_asset_is_forbidden():
+    # Given: Asset owned by someone else
+    uow = MagicMock(spec=UnitOfWork)
+    uow.assets = MagicMock(spec=AssetRepository)
+    uow.accounts = MagicMock(spec=AccountRepository)
+    uow.assets.get_asset_for_user.side_effect = PermissionDeniedException("Asset 1 belongs to another user")
+
+    use_case = ExecuteTradeUseCase(uow)
+
+    # When: Executing trade
+    # Then: raises PermissionDeniedException and nothing is written
+    with pytest.raises(PermissionDeniedException):
+        use_case.execute(asset_id=1, action_quantity=1, price=100, user_id=UserId(uuid4()))
+    uow.accounts.adjust_cash.assert_not_called()
+    uow.assets.apply_trade.assert_not_called()
+
+def make_batch_uow(account: Account) -> MagicMock:
+    uow = MagicMock(spec=UnitOfWork)
+    uow.assets = MagicMock(spec=AssetRepository)
+    uow.accounts = MagicMock(spec=AccountRepository)
+    uow.accounts.get_account_for_user.return_value = account
+    uow.accounts.get.return_value = account
+    uow.accounts.adjust_cash.side_effect = lambda account_id, amount: account.cash + amount
+    uow.assets.apply_trade.side_effect = lambda asset_id, qty, price: Asset(id=asset_id, account_id=1, name="x")
+    return uow
+
+def test_execute_trade_batch_sale_proceeds_fund_buys():
+    # Given: No cash, but a holding to sell
+    user_id = UserId(uuid4())
+    account = Account(id=1, name="Acc", user_id=user_id, cash=0, assets=[
+        Asset(id=1, account_id=1, name="A", quantity=10, current_price=100),
+        Asset(id=2, account_id=1, name="B", quantity=0, current_price=50),
+    ])
+    uow = make_batch_uow(account)
+
+    # When: Sell 5 A @ 100 and buy 10 B @ 50 in one batch
+    legs = [TradeLeg(asset_id=1, action_quantity=-5, price=100), TradeLeg(asset_id=2, action_quantity=10, price=50)]
+    ExecuteTradeBatchUseCase(uow).execute(1, legs, user_id)
+
+    # Then: One net cash update, one update per leg, one commit
+    uow.accounts.adjust_cash.assert_called_once_with(1, 0.0)
+    assert uow.assets.apply_trade.call_count == 2
+    uow.commit.assert_called_once()
+
+def test_execute_trade_batch_validates_cash_across_all_legs():
+    # Given: Cash covers each buy alone but not both
+    user_id = UserId(uuid4())
+    account = Account(id=1, name="Acc", user_id=user_id, cash=1000, assets=[
+        Asset(id=1, account_id=1, name="A", quantity=0),
+        Asset(id=2, account_id=1, name="B", quantity=0),
+    ])
+    uow = make_batch_uow(account)
+    legs = [TradeLeg(asset_id=1, action_quantity=8, price=100), TradeLeg(asset_id=2, action_quantity=8, price=100)]
+
+    # When / Then: Rejected before any write
+    with pytest.raises(InsufficientFundsException):
+        ExecuteTradeBatchUseCase(uow).execute(1, legs, user_id)
+    uow.accounts.adjust_cash.assert_not_called()
+    uow.assets.apply_trade.assert_not_called()
+
+def test_execute_trade_batch_rejects_asset_outside_account():
+    # Given
+    user_id = UserId(uuid4())
+    account = Account(id=1, name="Acc", user_id=user_id, cash=1000, assets=[Asset(id=1, account_id=1, name="A")])
+    uow = make_batch_uow(account)
+
+    # When / Then
+    with pytest.raises(EntityNotFoundException):
+        ExecuteTradeBatchUseCase(uow).execute(1, [TradeLeg(asset_id=99, action_quantity=1, price=1)], user_id)
+    uow.accounts.adjust_cash.assert_not_called()
+
+def test_execute_trade_batch_rejects_duplicate_assets():
+    # Given
+    uow = make_batch_uow(Account(id=1, name="Acc", user_id=UserId(uuid4())))
+    legs = [TradeLeg(asset_id=1, action_quantity=1, price=1), TradeLeg(asset_id=1, action_quantity=1, price=1)]
+
+    # When / Then
+    with pytest.raises(InvalidActionException):
+        ExecuteTradeBatchUseCase(uow).execute(1, legs, UserId(uuid4()))
+    uow.accounts.get_account_for_user.assert_not_called()
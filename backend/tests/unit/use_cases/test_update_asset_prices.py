@@ -0,0 +1,134 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import ANY, MagicMock
+from src.snowball.use_cases.assets import UpdateAssetPricesUseCase
+from src.snowball.domain.ports import AssetRepository, MarketDataProvider
+
+def test_should_fetch_each_distinct_code_once_in_one_batch():
+    # Given: Three holdings of the same ticker and one of another
+    asset_repo = MagicMock(spec=AssetRepository)
+    asset_repo.iter_ids_and_codes.return_value = iter([(1, "005930"), (2, "005930"), (3, "005930"), (4, "AAPL")])
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {"005930": 75000.0, "AAPL": 190.0}
+    asset_repo.update_prices.return_value = 4
+
+    use_case = UpdateAssetPricesUseCase(asset_repo, market_data)
+
+    # When: Refreshing prices
+    result = use_case.execute()
+
+    # Then: Only the (id, code) projection was read, never full assets
+    asset_repo.iter_ids_and_codes.assert_called_once_with(1000)
+    asset_repo.list_all_with_code.assert_not_called()
+
+    # Then: One batch fetch with distinct codes, one bulk write instead of per-asset saves
+    market_data.fetch_prices.assert_called_once_with(["005930", "AAPL"])
+    market_data.fetch_price.assert_not_called()
+    asset_repo.update_prices.assert_called_once_with({"005930": 75000.0, "AAPL": 190.0}, updated_at=ANY)
+    asset_repo.save.assert_not_called()
+    assert result.updated_count == 4
+    assert result.code_count == 2
+
+def test_should_report_codes_missing_from_partial_batch():
+    # Given: The batch only resolved one of three codes
+    asset_repo = MagicMock(spec=AssetRepository)
+    asset_repo.iter_ids_and_codes.return_value = iter([(1, "OK"), (2, "NONE"), (3, "SLOW")])
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {"OK": 10.0}
+    asset_repo.update_prices.return_value = 1
+
+    # When
+    result = UpdateAssetPricesUseCase(asset_repo, market_data).execute()
+
+    # Then: Only the resolved code is written, the rest are reported
+    asset_repo.update_prices.assert_called_once_with({"OK": 10.0}, updated_at=ANY)
+    assert result.updated_count == 1
+    assert result.failed_codes == ["NONE", "SLOW"]
+    assert result.total_seconds >= result.fetch_seconds >= 0
+
+def test_should_skip_upstream_when_no_assets_have_codes():
+    # Given: Nothing to refresh
+    asset_repo = MagicMock(spec=AssetRepository)
+    asset_repo.iter_ids_and_codes.return_value = iter([])
+    market_data = MagicMock(spec=MarketDataProvider)
+
+    # When
+    result = UpdateAssetPricesUseCase(asset_repo, market_data).execute()
+
+    # Then
+    market_data.fetch_prices.assert_not_called()
+    asset_repo.update_prices.assert_not_called()
+    assert result.updated_count == 0
+
+def test_should_reject_non_positive_chunk_size():
+    # Given/When/Then: A zero-row scan chunk is a configuration error
+    with pytest.raises(ValueError):
+        UpdateAssetPricesUseCase(MagicMock(spec=AssetRepository), MagicMock(spec=MarketDataProvider), chunk_size=0)
+
+def test_incremental_refresh_should_fetch_only_stale_codes():
+    # Given: The repository knows which codes are stale, by held value
+    now = datetime(2026, 4, 10, 9, 0)
+    asset_repo = MagicMock(spec=AssetRepository)
+    asset_repo.list_stale_codes.return_value = ["005930", "AAPL"]
+    asset_repo.update_prices.return_value = 3
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {"005930": 75000.0, "AAPL": 190.0}
+
+    use_case = UpdateAssetPricesUseCase(asset_repo, market_data, clock=lambda: now)
+
+    # When: Refreshing codes older than 5 minutes, at most 50 per run
+    result = use_case.execute(max_age=timedelta(minutes=5), max_codes=50)
+
+    # Then: No full scan; only the stale codes are fetched and stamped with the fetch time
+    asset_repo.iter_ids_and_codes.assert_not_called()
+    asset_repo.list_stale_codes.assert_called_once_with(datetime(2026, 4, 10, 8, 55), limit=50)
+    market_data.fetch_prices.assert_called_once_with(["005930", "AAPL"])
+    asset_repo.update_prices.assert_called_once_with(market_data.fetch_prices.return_value, updated_at=now)
+    asset_repo.record_attempts.assert_called_once_with(["005930", "AAPL"], attempted_at=now)
+    assert result.code_count == 2
+
+def test_incremental_refresh_should_record_attempts_of_failed_codes():
+    # Given: One of the stale codes cannot be fetched
+    now = datetime(2026, 4, 10, 9, 0)
+    asset_repo = MagicMock(spec=AssetRepository)
+    asset_repo.list_stale_codes.return_value = ["BROKEN", "AAPL"]
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {"AAPL": 190.0}
+
+    # When
+    result = UpdateAssetPricesUseCase(asset_repo, market_data, clock=lambda: now).execute(
+        max_age=timedelta(minutes=5), max_codes=2
+    )
+
+    # Then: The failed code is stamped as attempted too, so the next run rotates it back
+    asset_repo.record_attempts.assert_called_once_with(["BROKEN", "AAPL"], attempted_at=now)
+    assert result.failed_codes == ["BROKEN"]
+
+def test_incremental_refresh_should_be_a_no_op_when_everything_is_fresh():
+    # Given
+    asset_repo = MagicMock(spec=AssetRepository)
+    asset_repo.list_stale_codes.return_value = []
+    market_data = MagicMock(spec=MarketDataProvider)
+
+    # When
+    result = UpdateAssetPricesUseCase(asset_repo, market_data).execute(max_age=timedelta(minutes=5))
+
+    # Then
+    market_data.fetch_prices.assert_not_called()
+    asset_repo.update_prices.assert_not_called()
+    assert result.code_count == 0
+
+def test_incremental_refresh_should_apply_code_filter_before_cap():
+    # Given: Stale codes across markets, highest value first
+    asset_repo = MagicMock(spec=AssetRepository)
+    asset_repo.list_stale_codes.return_value = ["AAPL", "005930", "MSFT", "000660", "069500"]
+    market_data = MagicMock(spec=MarketDataProvider)
+    market_data.fetch_prices.return_value = {}
+
+    # When: Only KRX is open, two codes per run
+    UpdateAssetPricesUseCase(asset_repo, market_data).execute(
+        max_age=timedelta(minutes=1), max_codes=2, code_filter=str.isdigit
+    )
+
+    # Then: The cap applies to the filtered, still value-ordered list
+    market_data.fetch_prices.assert_called_once_with(["005930", "000660"])